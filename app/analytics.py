@@ -0,0 +1,143 @@
+"""How long applications dwell in each status, and how long companies take to respond.
+
+One query walks every application's status log in timestamp order with
+window functions: ``LEAD`` gives the moment each status was left (its dwell
+time), ``MIN(...) OVER`` the moment the application was applied for, and
+``ROW_NUMBER`` its position in the log. Python only buckets the resulting
+intervals and takes percentiles. Only finished stays count towards dwell
+times; the status an application is in now has no end yet.
+
+A response is the first move to a status only the company can cause
+(``RESPONSE_STATUSES``) after the application was sent. Real applications
+read ``status_history``. Demo applications read ``demo_status_history``;
+generated ones have no log, so their ``status_change_date`` stands in for a
+single change away from ``created_at``.
+
+Results are cached per data generation of their source (see app/generations.py).
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import String, case, func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app import generations, statuses
+from app.database import SessionLocal
+from app.demo_models import DemoApplication, DemoStatusHistory
+from app.models import Application, Company, StatusHistory
+
+APPLIED_STATUSES = ("Applied", "Applied / No Longer Listed")
+RESPONSE_STATUSES = ("Interviewing", "Offer", "Rejected", "Declined Offer", "Accepted")
+REAL, DEMO = generations.APPLICATIONS, generations.DEMO
+
+@dataclass
+class StatusDwell:
+    status: str
+    count: int
+    median_days: Optional[float]
+    p90_days: Optional[float]
+
+@dataclass
+class CompanyResponse:
+    company: str
+    applications: int
+    responded: int
+    median_days: Optional[float]
+    p90_days: Optional[float]
+
+@dataclass
+class ResponseTimes:
+    dwell: List[StatusDwell]
+    first_response: CompanyResponse  # every company together
+    companies: List[CompanyResponse]
+
+def _percentiles(days: Sequence[float]):
+    if not days:
+        return None, None
+    median, p90 = np.percentile(np.asarray(days, dtype=float), [50, 90])
+    return round(float(median), 2), round(float(p90), 2)
+
+def _events(source: str):
+    """``(application_id, company, status, timestamp, seq)`` rows of every status log entry."""
+    if source == REAL:
+        return (
+            select(StatusHistory.application_id, func.coalesce(Company.name, Application.company).label("company"),
+                   StatusHistory.status, StatusHistory.timestamp, StatusHistory.id.label("seq"))
+            .join(Application, Application.id == StatusHistory.application_id)
+            .outerjoin(Company, Company.id == Application.company_id)
+        )
+    logged = select(DemoStatusHistory.application_id).where(DemoStatusHistory.application_id.is_not(None))
+    unlogged = DemoApplication.id.not_in(logged)
+    return union_all(
+        select(DemoStatusHistory.application_id, DemoApplication.company, DemoStatusHistory.status,
+               DemoStatusHistory.timestamp, DemoStatusHistory.id.label("seq"))
+        .join(DemoApplication, DemoApplication.id == DemoStatusHistory.application_id),
+        # Generated applications: whatever they were before status_change_date, then their status
+        select(DemoApplication.id, DemoApplication.company, literal(None, String), DemoApplication.created_at, literal(0))
+        .where(unlogged, DemoApplication.status_change_date.is_not(None)),
+        select(DemoApplication.id, DemoApplication.company, DemoApplication.status,
+               func.coalesce(DemoApplication.status_change_date, DemoApplication.created_at), literal(1))
+        .where(unlogged),
+    )
+
+def _intervals(db: Session, source: str):
+    events = _events(source).subquery()
+    per_application = {"partition_by": events.c.application_id}
+    in_order = {**per_application, "order_by": (events.c.timestamp, events.c.seq)}
+    applied_at = func.coalesce(
+        func.min(case((events.c.status.in_(APPLIED_STATUSES), events.c.timestamp))).over(**per_application),
+        func.min(events.c.timestamp).over(**per_application),
+    )
+    query = (
+        select(
+            events.c.application_id,
+            events.c.company,
+            events.c.status,
+            (func.julianday(func.lead(events.c.timestamp).over(**in_order)) - func.julianday(events.c.timestamp)).label("dwell_days"),
+            (func.julianday(events.c.timestamp) - func.julianday(applied_at)).label("since_applied"),
+            func.row_number().over(**in_order).label("position"),
+        )
+        .where(events.c.timestamp.is_not(None))
+        .order_by(events.c.application_id, "position")
+    )
+    return db.execute(query).all()
+
+@lru_cache(maxsize=8)
+def _compute(source: str, generation: int) -> ResponseTimes:
+    dwell = defaultdict(list)
+    applied = defaultdict(set)
+    first_response = {}
+    with SessionLocal() as db:
+        rows = _intervals(db, source)
+    for row in rows:
+        if row.status is not None and row.dwell_days is not None:
+            dwell[row.status].append(row.dwell_days)
+        if row.status in APPLIED_STATUSES or row.status in RESPONSE_STATUSES:
+            applied[row.company].add(row.application_id)
+        if (row.position > 1 and row.status in RESPONSE_STATUSES and row.since_applied >= 0
+                and row.application_id not in first_response):
+            first_response[row.application_id] = (row.company, row.since_applied)
+
+    def summary(company: str, applications: int, days: List[float]) -> CompanyResponse:
+        return CompanyResponse(company, applications, len(days), *_percentiles(days))
+
+    response_days = defaultdict(list)
+    for company, days in first_response.values():
+        response_days[company].append(days)
+    companies = [summary(company, len(ids), response_days[company]) for company, ids in applied.items()]
+    companies.sort(key=lambda item: (-item.responded, -item.applications, item.company))
+    order = {status.name: status.sort_order for status in statuses.by_id().values()}
+    return ResponseTimes(
+        dwell=[StatusDwell(status, len(days), *_percentiles(days))
+               for status, days in sorted(dwell.items(), key=lambda item: (order.get(item[0], 10_000), item[0]))],
+        first_response=summary("All companies", sum(len(ids) for ids in applied.values()),
+                               [days for _, days in first_response.values()]),
+        companies=companies,
+    )
+
+def response_times(source: str = REAL) -> ResponseTimes:
+    """Dwell-time distribution per status and time to first response per company."""
+    return _compute(source, generations.current(source))
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app import analytics, history, schemas
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+@router.get("/funnel", response_model=schemas.Funnel)
+def funnel(db: Session = Depends(get_db)):
+    """Applications that reached each stage (Applied -> Interviewing -> Offer -> Accepted) and stage conversion rates."""
+    return schemas.Funnel(stages=history.funnel(db.connection()))
+
+@router.get("/response-times", response_model=schemas.ResponseTimes)
+def response_times():
+    """Median and p90 days spent in each status, and days to a first response per company."""
+    return analytics.response_times()
@@ -0,0 +1,144 @@
+"""In-memory prefix index for typeahead on application fields.
+
+Each field (``company``, ``role``) keeps the distinct values with how many
+applications use them, keyed case-insensitively in a sorted list. A lookup
+is two bisects and a scan of the matching slice, with no database access.
+
+The index is built from the database on first use and then kept current:
+
+- ORM inserts, updates and deletes are counted by mapper events and applied
+  when the session commits (dropped on rollback)
+- bulk writes, which have no rows to follow, bump the applications
+  generation (see app/generations.py); ``invalidate`` is subscribed to it, and
+  the index is rebuilt on the next lookup
+"""
+import heapq
+import logging
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from app import generations
+from app.database import engine
+from app.models import Application
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("company", "role")
+DEFAULT_LIMIT = 10
+_PENDING_KEY = "autocomplete_deltas"
+
+def _key(value: str) -> str:
+    return " ".join(value.split()).casefold()
+
+class PrefixIndex:
+    """Distinct values with usage counts, searchable by case-insensitive prefix."""
+
+    def __init__(self):
+        self._keys: List[str] = []
+        self._display: Dict[str, str] = {}
+        self._counts: Dict[str, int] = {}
+
+    def add(self, value: Optional[str], count: int = 1):
+        if not value or not value.strip():
+            return
+        key = _key(value)
+        current = self._counts.get(key, 0) + count
+        if current <= 0:
+            if key in self._counts:
+                del self._counts[key], self._display[key]
+                self._keys.pop(bisect_left(self._keys, key))
+            return
+        if key not in self._counts:
+            insort(self._keys, key)
+            self._display[key] = " ".join(value.split())
+        self._counts[key] = current
+
+    def remove(self, value: Optional[str], count: int = 1):
+        self.add(value, -count)
+
+    def search(self, prefix: str, limit: int = DEFAULT_LIMIT) -> List[Tuple[str, int]]:
+        """Up to ``limit`` (value, count) pairs starting with ``prefix``, most used first."""
+        prefix = _key(prefix)
+        start = bisect_left(self._keys, prefix)
+        end = bisect_left(self._keys, prefix + "\U0010ffff", lo=start)
+        matches = heapq.nsmallest(limit, self._keys[start:end], key=lambda key: (-self._counts[key], key))
+        return [(self._display[key], self._counts[key]) for key in matches]
+
+    def __len__(self):
+        return len(self._keys)
+
+_lock = threading.Lock()
+_indexes: Optional[Dict[str, PrefixIndex]] = None
+
+def _build() -> Dict[str, PrefixIndex]:
+    indexes = {}
+    with engine.connect() as conn:
+        for field in FIELDS:
+            column = getattr(Application, field)
+            index = PrefixIndex()
+            for value, count in conn.execute(select(column, func.count()).group_by(column)):
+                index.add(value, count)
+            indexes[field] = index
+    logger.info("Built autocomplete index: %s", {field: len(index) for field, index in indexes.items()})
+    return indexes
+
+def suggest(field: str, prefix: str, limit: int = DEFAULT_LIMIT) -> List[Tuple[str, int]]:
+    global _indexes
+    if field not in FIELDS:
+        raise ValueError(f"Unknown autocomplete field: {field}")
+    with _lock:
+        if _indexes is None:
+            _indexes = _build()
+        return _indexes[field].search(prefix, limit)
+
+def invalidate():
+    global _indexes
+    with _lock:
+        _indexes = None
+
+generations.subscribe(generations.APPLICATIONS, invalidate)
+
+def _record(session: Optional[Session], deltas: Counter):
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, Counter()).update(deltas)
+
+@event.listens_for(Application, "after_insert")
+def _after_insert(mapper, connection, target):
+    _record(inspect(target).session, Counter({(field, getattr(target, field)): 1 for field in FIELDS}))
+
+@event.listens_for(Application, "after_delete")
+def _after_delete(mapper, connection, target):
+    _record(inspect(target).session, Counter({(field, getattr(target, field)): -1 for field in FIELDS}))
+
+@event.listens_for(Application, "after_update")
+def _after_update(mapper, connection, target):
+    deltas = Counter()
+    state = inspect(target)
+    for field in FIELDS:
+        history = state.attrs[field].history
+        if history.has_changes():
+            for value in history.deleted:
+                deltas[(field, value)] -= 1
+            for value in history.added:
+                deltas[(field, value)] += 1
+    _record(state.session, deltas)
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session):
+    deltas = session.info.pop(_PENDING_KEY, None)
+    if not deltas:
+        return
+    with _lock:
+        if _indexes is None:
+            return  # built from the database on the next lookup
+        for (field, value), count in deltas.items():
+            _indexes[field].add(value, count)
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,16 @@
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app import autocomplete, schemas
+
+router = APIRouter(tags=["autocomplete"])
+
+@router.get("/autocomplete", response_model=List[schemas.Suggestion])
+def suggest(field: str, prefix: str = "", limit: int = Query(autocomplete.DEFAULT_LIMIT, ge=1, le=100)):
+    """Existing company or role values starting with ``prefix``, most used first (served from memory)."""
+    try:
+        matches = autocomplete.suggest(field, prefix, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return [schemas.Suggestion(value=value, count=count) for value, count in matches]
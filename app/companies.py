@@ -0,0 +1,79 @@
+"""Company entities shared by applications.
+
+Each application keeps the company name as typed and also a ``company_id``
+into ``companies``. Names that differ only in case, punctuation or a legal
+suffix ("Acme, Inc." / "ACME" / "Acme LLC") resolve to the same row through
+the unique ``normalized_name`` index. The first spelling seen becomes the
+display name.
+
+Resolution happens inside the caller's transaction:
+
+- ORM writes, through mapper events registered in app/models.py
+- the spreadsheet import, in bulk through ``resolve_ids``
+"""
+import re
+import unicodedata
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import column, select, table, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+
+# Lightweight table construct, so this module does not import app.models (which imports it)
+_companies = table("companies", column("id"), column("name"), column("normalized_name"))
+LOOKUP_BATCH = 500
+
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "llc", "llp", "lp", "ltd", "limited", "corp", "corporation",
+    "co", "company", "plc", "gmbh", "ag", "sa", "bv", "nv", "pty", "pte", "srl", "oy", "ab",
+}
+
+_APOSTROPHES = re.compile(r"['’`]")
+_NON_WORD = re.compile(r"[^\w]+")
+
+def normalize_company_name(name: Optional[str]) -> Optional[str]:
+    """Casefold, drop punctuation and trailing legal suffixes: "Macy’s, Inc." -> "macys"."""
+    if not name:
+        return None
+    folded = unicodedata.normalize("NFKC", name).casefold()
+    words = _NON_WORD.sub(" ", _APOSTROPHES.sub("", folded)).split()
+    if not words:
+        return None
+    stripped = list(words)
+    while len(stripped) > 1 and stripped[-1] in LEGAL_SUFFIXES:
+        stripped.pop()
+    return " ".join(stripped)
+
+def resolve_ids(conn: Connection, names: Iterable[str]) -> Dict[str, int]:
+    """Map each company name to its company id, creating missing companies."""
+    normalized = {}
+    for name in names:
+        key = normalize_company_name(name)
+        if key:
+            normalized.setdefault(key, name.strip())
+    if not normalized:
+        return {}
+    conn.execute(
+        sqlite_insert(_companies).on_conflict_do_nothing(index_elements=["normalized_name"]),
+        [{"name": name, "normalized_name": key} for key, name in normalized.items()],
+    )
+    ids = {}
+    keys = list(normalized)
+    for start in range(0, len(keys), LOOKUP_BATCH):
+        batch = keys[start:start + LOOKUP_BATCH]
+        query = select(_companies.c.normalized_name, _companies.c.id).where(_companies.c.normalized_name.in_(batch))
+        ids.update(conn.execute(query).all())
+    return {name: ids[key] for name in names if (key := normalize_company_name(name)) in ids}
+
+def resolve_id(conn: Connection, name: Optional[str]) -> Optional[int]:
+    return resolve_ids(conn, [name]).get(name) if name else None
+
+def backfill_company_ids(conn: Connection, table: str = "applications"):
+    """Create companies for existing rows and set their ``company_id``."""
+    names = [row[0] for row in conn.execute(text(f"SELECT DISTINCT company FROM {table} WHERE company IS NOT NULL"))]
+    ids = resolve_ids(conn, names)
+    if ids:
+        conn.execute(
+            text(f"UPDATE {table} SET company_id = :company_id WHERE company = :company"),
+            [{"company_id": company_id, "company": name} for name, company_id in ids.items()],
+        )
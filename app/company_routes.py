@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.database import get_db
+from app import companies, models, schemas, statuses
+
+router = APIRouter(prefix="/companies", tags=["companies"])
+
+def _application_counts(db: Session):
+    return (
+        db.query(models.Application.company_id, func.count().label("applications"))
+        .group_by(models.Application.company_id)
+        .subquery()
+    )
+
+@router.get("/", response_model=List[schemas.CompanySummary])
+def list_companies(q: Optional[str] = None, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    """Companies with their application counts, most applications first."""
+    counts = _application_counts(db)
+    query = db.query(models.Company, counts.c.applications).join(counts, counts.c.company_id == models.Company.id)
+    if q:
+        normalized = companies.normalize_company_name(q) or q
+        query = query.filter(
+            models.Company.name.ilike(f"%{q}%") | models.Company.normalized_name.contains(normalized, autoescape=True)
+        )
+    rows = query.order_by(counts.c.applications.desc(), models.Company.name).offset(skip).limit(limit).all()
+    return [schemas.CompanySummary(id=company.id, name=company.name, applications=count) for company, count in rows]
+
+@router.get("/{company_id}", response_model=schemas.CompanyDetail)
+def read_company(company_id: int, db: Session = Depends(get_db)):
+    """A company and its applications counted by status."""
+    company = db.get(models.Company, company_id)
+    if company is None:
+        raise HTTPException(status_code=404, detail="Company not found")
+    rows = (
+        db.query(models.Application.status_id, func.count())
+        .filter(models.Application.company_id == company_id)
+        .group_by(models.Application.status_id)
+        .all()
+    )
+    known = statuses.by_id()
+    by_status = {known[status_id].name if status_id in known else "Unknown": count for status_id, count in rows}
+    return schemas.CompanyDetail(
+        id=company.id,
+        name=company.name,
+        applications=sum(by_status.values()),
+        by_status=by_status,
+    )
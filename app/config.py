@@ -0,0 +1,44 @@
+import os
+
+# Runtime settings, overridable through environment variables.
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+DATABASE_URL = os.getenv("JOBTRACKER_DATABASE_URL", "sqlite:///./jobtracker.db")
+
+# Opt-in per-request profiling (see app/profiling.py)
+PROFILING_ENABLED = _env_bool("JOBTRACKER_PROFILING")
+PROFILE_HEADER = os.getenv("JOBTRACKER_PROFILE_HEADER", "X-Profile")
+PROFILE_TOKEN = os.getenv("JOBTRACKER_PROFILE_TOKEN")  # If set, the header value must match
+PROFILES_DIR = os.getenv("JOBTRACKER_PROFILES_DIR", "profiles")
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("JOBTRACKER_PROFILE_SAMPLE_INTERVAL", "0.005"))
+
+# Uploaded resumes and cover letters (see app/uploads.py)
+UPLOAD_FOLDER = os.getenv("JOBTRACKER_UPLOAD_FOLDER", "uploads")
+MAX_UPLOAD_SIZE_MB = float(os.getenv("JOBTRACKER_MAX_UPLOAD_SIZE_MB", "5"))
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Orphaned upload collection (see app/upload_gc.py)
+UPLOAD_GC_GRACE_HOURS = float(os.getenv("JOBTRACKER_UPLOAD_GC_GRACE_HOURS", "24"))
+UPLOAD_GC_INTERVAL_MINUTES = float(os.getenv("JOBTRACKER_UPLOAD_GC_INTERVAL_MINUTES", "0"))  # 0 disables the background run
+UPLOAD_GC_QUARANTINE = _env_bool("JOBTRACKER_UPLOAD_GC_QUARANTINE")
+
+# Background text extraction of uploads (see app/extraction.py)
+EXTRACTION_WORKERS = int(os.getenv("JOBTRACKER_EXTRACTION_WORKERS", "2"))
+EXTRACTION_MAX_CHARS = 1_000_000
+
+# Background job queue (see app/jobs.py)
+JOB_WORKERS = int(os.getenv("JOBTRACKER_JOB_WORKERS", "2"))
+JOB_POLL_INTERVAL = float(os.getenv("JOBTRACKER_JOB_POLL_INTERVAL", "1.0"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOBTRACKER_JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOBTRACKER_JOB_RETRY_BASE_SECONDS", "5"))
+
+# Spreadsheet imports (see app/import_routes.py)
+IMPORT_FOLDER = os.getenv("JOBTRACKER_IMPORT_FOLDER", "imports")
+MAX_IMPORT_SIZE_MB = float(os.getenv("JOBTRACKER_MAX_IMPORT_SIZE_MB", "50"))
+IMPORT_MAX_ERRORS = 1000  # per-row errors kept in the report
+IMPORT_KEY = os.getenv("JOBTRACKER_IMPORT_KEY") or None  # default natural key, e.g. "order_number"
@@ -0,0 +1,28 @@
+"""Run the test suite against a throwaway copy of the database.
+
+The settings are read from the environment when app.config is first
+imported, so they are set here, before any test module imports the app.
+The committed jobtracker.db and the uploads/ and imports/ folders are
+never written by tests.
+"""
+import os
+import shutil
+import tempfile
+
+_workdir = tempfile.mkdtemp(prefix="jobtracker-tests-")
+if os.path.exists("jobtracker.db"):
+    shutil.copyfile("jobtracker.db", os.path.join(_workdir, "jobtracker.db"))
+os.environ["JOBTRACKER_DATABASE_URL"] = f"sqlite:///{os.path.join(_workdir, 'jobtracker.db')}"
+for name, folder in [("JOBTRACKER_UPLOAD_FOLDER", "uploads"), ("JOBTRACKER_IMPORT_FOLDER", "imports"),
+                     ("JOBTRACKER_PROFILES_DIR", "profiles")]:
+    os.environ[name] = os.path.join(_workdir, folder)
+    os.makedirs(os.environ[name])
+
+# Bring the copy up to date even when the selected tests never import app.main
+from app import migrations  # noqa: E402
+from app.database import engine  # noqa: E402
+
+migrations.upgrade(engine)
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_workdir, ignore_errors=True)
@@ -1,68 +1,114 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, asc, desc
-from app import models, schemas
+from sqlalchemy import or_, asc, desc, false, select
+from app import models, schemas, documents, extraction, statuses, companies
+from app.uploads import StoredUpload
+from app.urls import canonicalize_url
 from datetime import datetime
-from typing import Optional
-import os
+from typing import Dict, Optional
+import logging
 
-UPLOAD_FOLDER = "uploads"
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)  # Ensure the upload folder exists
+logger = logging.getLogger(__name__)
 
-def create_application(db: Session, application: schemas.ApplicationCreate):
+def create_application(db: Session, application: schemas.ApplicationCreate,
+                       uploads: Optional[Dict[str, Optional[StoredUpload]]] = None):
+    """Insert an application and link its ``kind -> upload`` documents in one transaction."""
     db_application = models.Application(**application.dict())
     db.add(db_application)
+    if uploads:
+        db.flush()
+        documents.attach_uploads(db, documents.APPLICATIONS, db_application.id, **uploads)
     db.commit()
     db.refresh(db_application)
     return db_application
 
-def get_filtered_applications(
+def filtered_applications_query(
     db: Session,
     search: str = None,
+    document_search: str = None,
     status: str = None,
+    company_id: int = None,
+    url: str = None,
     follow_up_required: bool = None,
     missing_date: bool = None,
+    salary_min: int = None,
+    salary_max: int = None,
     sort_by: str = "created_at",
     sort_order: str = "asc",
-    skip: int = 0,
-    limit: int = 10,
 ):
+    """Filtered, sorted (but not paginated) applications query shared by the list and export endpoints."""
     query = db.query(models.Application)
     if search:
+        # Company names are matched once in the small companies table, then joined by integer id
+        company_match = models.Company.name.ilike(f"%{search}%")
+        normalized = companies.normalize_company_name(search)
+        if normalized:
+            company_match = company_match | models.Company.normalized_name.contains(normalized, autoescape=True)
         query = query.filter(
-            models.Application.company.ilike(f"%{search}%") |
+            models.Application.company_id.in_(select(models.Company.id).where(company_match)) |
             models.Application.role.ilike(f"%{search}%")
         )
+    if company_id is not None:
+        query = query.filter(models.Application.company_id == company_id)
+    if url:
+        # Exact match on the indexed canonical form, so tracking parameters and www. do not matter
+        canonical = canonicalize_url(url)
+        query = query.filter(models.Application.canonical_url == canonical if canonical else false())
+    if document_search:
+        if not extraction.fts_query(document_search):
+            # No word to look for (e.g. only punctuation): nothing matches
+            query = query.filter(false())
+        else:
+            matching_files = select(extraction.search_stored_names_query(document_search).subquery().c.stored_name)
+            query = query.filter(or_(
+                models.Application.resume_file.in_(matching_files),
+                models.Application.cover_letter_file.in_(matching_files),
+            ))
     if status:
-        query = query.filter(models.Application.status == status)
+        # Compare on the indexed integer id; an unknown name matches nothing
+        status_id = statuses.id_for(status)
+        query = query.filter(models.Application.status_id == status_id if status_id is not None else false())
     if follow_up_required is not None:
         query = query.filter(models.Application.follow_up_required == follow_up_required)
     if missing_date:
         query = query.filter(models.Application.application_date == None)
-    if sort_by and hasattr(models.Application, sort_by):
+    if salary_min is not None:
+        query = query.filter(models.Application.salary_min >= salary_min)
+    if salary_max is not None:
+        query = query.filter(models.Application.salary_max <= salary_max)
+    if sort_by == "salary":
+        # Numeric order on the parsed range; rows without a salary go last either way
+        direction = desc if sort_order == "desc" else asc
+        query = query.order_by(
+            models.Application.salary_min.is_(None),
+            direction(models.Application.salary_min),
+            direction(models.Application.salary_max),
+        )
+    elif sort_by and hasattr(models.Application, sort_by):
         sort_column = getattr(models.Application, sort_by)
         if sort_order == "desc":
             sort_column = desc(sort_column)
         else:
             sort_column = asc(sort_column)
         query = query.order_by(sort_column)
-    query = query.offset(skip).limit(limit)
-    return query.all()
+    return query
+
+def get_filtered_applications(db: Session, skip: int = 0, limit: int = 10, **filters):
+    return filtered_applications_query(db, **filters).offset(skip).limit(limit).all()
 
 def get_application(db: Session, application_id: int):
     return db.query(models.Application).filter(models.Application.id == application_id).first()
 
-def update_application(db: Session, application_id: int, application_update: schemas.ApplicationUpdate):
-    """Update an application with new data. Handles empty fields by converting them to NULL."""
+def update_application(db: Session, application_id: int, application_update: schemas.ApplicationUpdate,
+                       uploads: Optional[Dict[str, Optional[StoredUpload]]] = None):
+    """Update an application with new data. Handles empty fields by converting them to NULL.
+    New ``kind -> upload`` documents are linked in the same transaction."""
     try:
-        print(f"Updating application {application_id} with data: {application_update}")
-        
         db_application = db.query(models.Application).filter(models.Application.id == application_id).first()
         if not db_application:
             return None
             
         # Convert the update data to dict, excluding unset values
         update_data = application_update.dict(exclude_unset=True)
-        print(f"Update data after conversion: {update_data}")
         
         # Handle special fields
         if 'follow_up_required' in update_data:
@@ -86,7 +132,7 @@ def update_application(db: Session, application_id: int, application_update: sch
         # Add updated timestamp
         update_data['updated_at'] = datetime.now()
         
-        print(f"Final update data before applying: {update_data}")
+        logger.debug("Updating application %s with fields %s", application_id, sorted(update_data))
         
         # Update fields and track changes
         changes = []
@@ -112,32 +158,19 @@ def update_application(db: Session, application_id: int, application_update: sch
             
             # Check for actual changes
             if old_value != value:
-                changes.append(f"{key}: {old_value} -> {value}")
-                # Log extra details for debugging string/None transitions
-                print(f"Field {key} changing: type(old)={type(old_value)}, type(new)={type(value)}, "
-                      f"old={repr(old_value)}, new={repr(value)}")
+                changes.append((key, old_value, value))
                 setattr(db_application, key, value)
         
-        if changes:
-            print(f"Changes made to application {application_id}:")
-            for change in changes:
-                print(f"  {change}")
-        else:
-            print(f"No changes detected for application {application_id}")
+        logger.debug("Application %s changes: %r", application_id, changes)
         
+        if uploads:
+            documents.attach_uploads(db, documents.APPLICATIONS, application_id, **uploads)
+
         # Force the session to recognize the changes and commit
         db.flush()
         db.commit()
         db.refresh(db_application)  # Refresh to ensure we have the latest state
         
-        # Refresh and verify
-        db.refresh(db_application)
-        print(f"Updated application state: {db_application.__dict__}")
-        
-        return db_application
-            
-        db.commit()
-        db.refresh(db_application)
         return db_application
     except Exception as e:
         db.rollback()
@@ -146,6 +179,7 @@ def update_application(db: Session, application_id: int, application_update: sch
 def delete_application(db: Session, application_id: int):
     db_application = db.query(models.Application).filter(models.Application.id == application_id).first()
     if db_application:
+        documents.release(db, documents.APPLICATIONS, application_id)
         db.delete(db_application)
         db.commit()
     return db_application
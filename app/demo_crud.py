@@ -1,10 +1,10 @@
 from sqlalchemy.orm import Session
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from app.demo_models import DemoApplication
-import os
-from uuid import uuid4
+from app.demo_models import DemoApplication, DemoStatusHistory
 import logging
+from app import documents, uploads
+from app.uploads import StoredUpload
 
 logger = logging.getLogger(__name__)
 
@@ -16,52 +16,51 @@ def get_demo_applications(db: Session, skip: int = 0, limit: int = 100):
 def get_demo_application(db: Session, app_id: int):
     return db.query(DemoApplication).filter(DemoApplication.id == app_id).first()
 
-# Create a new application
-def create_demo_application(db: Session, application_data: Dict[str, Any]):
+# Create a new application, linking its uploaded documents in the same transaction
+def create_demo_application(db: Session, application_data: Dict[str, Any],
+                            uploads: Optional[Dict[str, Optional[StoredUpload]]] = None):
     db_app = DemoApplication(**application_data)
+    db_app.status_history.append(DemoStatusHistory(status=db_app.status, timestamp=db_app.created_at or datetime.now()))
     db.add(db_app)
+    if uploads:
+        db.flush()
+        documents.attach_uploads(db, documents.DEMO_APPLICATIONS, db_app.id, **uploads)
     db.commit()
     db.refresh(db_app)
-    logger.info(f"Created demo application: {db_app.id} - {db_app.company} - {db_app.role}")
+    logger.info("Created demo application: %s - %s - %s", db_app.id, db_app.company, db_app.role)
     return db_app
 
-# Update an existing application
-def update_demo_application(db: Session, app_id: int, application_data: Dict[str, Any]):
+# Update an existing application, linking new uploaded documents in the same transaction
+def update_demo_application(db: Session, app_id: int, application_data: Dict[str, Any],
+                            uploads: Optional[Dict[str, Optional[StoredUpload]]] = None):
     db_app = db.query(DemoApplication).filter(DemoApplication.id == app_id).first()
     if db_app:
+        old_status = db_app.status
         for key, value in application_data.items():
             setattr(db_app, key, value)
+        if db_app.status != old_status:
+            db_app.status_history.append(DemoStatusHistory(status=db_app.status, timestamp=datetime.now()))
+        if uploads:
+            documents.attach_uploads(db, documents.DEMO_APPLICATIONS, app_id, **uploads)
         db.commit()
         db.refresh(db_app)
-        logger.info(f"Updated demo application: {db_app.id} - {db_app.company} - {db_app.role}")
+        logger.info("Updated demo application: %s - %s - %s", db_app.id, db_app.company, db_app.role)
     return db_app
 
 # Delete an application
 def delete_demo_application(db: Session, app_id: int):
     db_app = db.query(DemoApplication).filter(DemoApplication.id == app_id).first()
     if db_app:
+        documents.release(db, documents.DEMO_APPLICATIONS, app_id)
         db.delete(db_app)
         db.commit()
-        logger.info(f"Deleted demo application: {app_id}")
+        logger.info("Deleted demo application: %s", app_id)
     return db_app
 
 # Handle file upload for demo applications
-def save_demo_upload_file(file, file_type: str) -> str:
+async def save_demo_upload_file(file, file_type: str) -> Optional[uploads.StoredUpload]:
     if not file:
         return None
-    
-    filename = file.filename
-    # Generate unique filename
-    unique_filename = f"{uuid4().hex}_{filename}"
-    upload_folder = "uploads"
-    
-    # Ensure folder exists
-    os.makedirs(upload_folder, exist_ok=True)
-    
-    # Save file
-    file_path = os.path.join(upload_folder, unique_filename)
-    with open(file_path, "wb") as f:
-        f.write(file.file.read())
-    
-    logger.info(f"Saved demo {file_type} file: {unique_filename}")
-    return unique_filename
+    stored = await uploads.save_upload(file)
+    logger.info("Saved demo %s file: %s", file_type, stored.stored_name)
+    return stored
@@ -1,18 +1,24 @@
 import random
 from datetime import datetime, timedelta
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 from app.demo_models import DemoApplication
 from app.database import SessionLocal, engine
 import app.demo_models as demo_models
+from app import documents, generations, jobs, models
 import logging
 
 logger = logging.getLogger(__name__)
 
 # Create tables if they don't exist
 def initialize_demo_db():
-    # Force recreate the demo tables
-    demo_models.DemoApplication.__table__.drop(engine, checkfirst=True)
-    demo_models.DemoStatusHistory.__table__.drop(engine, checkfirst=True)
+    # Force recreate the demo tables, releasing their documents first so recycled ids start unlinked
+    with engine.begin() as conn:
+        if inspect(conn).has_table(models.ApplicationDocument.__tablename__):
+            documents.release_all(conn, documents.DEMO_APPLICATIONS)
+        demo_models.DemoApplication.__table__.drop(conn, checkfirst=True)
+        demo_models.DemoStatusHistory.__table__.drop(conn, checkfirst=True)
+    generations.bump(generations.DEMO)
     
     # Create tables
     demo_models.Base.metadata.create_all(bind=engine)
@@ -79,7 +85,7 @@ def generate_demo_data(db: Session, count=50):
         # Add all applications to the database
         db.add_all(demo_apps)
         db.commit()
-        logger.info(f"Generated {count} demo applications")
+        logger.info("Generated %s demo applications", count)
     else:
         logger.info("Demo data already exists, skipping generation")
 
@@ -91,3 +97,17 @@ def initialize_demo_data():
         generate_demo_data(db)
     finally:
         db.close()
+
+@jobs.handler("regenerate_demo_data")
+def regenerate_demo_data_job(payload: dict, progress: jobs.JobProgress) -> dict:
+    count = payload.get("count", 50)
+    progress.update(0, count, "Recreating demo tables", force=True)
+    db = SessionLocal()
+    try:
+        initialize_demo_db()
+        generate_demo_data(db, count)
+        total = db.query(DemoApplication).count()
+    finally:
+        db.close()
+    progress.update(total, count, "Done", force=True)
+    return {"generated": total}
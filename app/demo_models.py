@@ -1,7 +1,8 @@
 from sqlalchemy import Boolean, Column, Integer, String, DateTime, Date, ForeignKey, func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
 
+from app import statuses
 from app.database import Base
 
 class DemoApplication(Base):
@@ -26,10 +27,17 @@ class DemoApplication(Base):
     updated_at = Column(DateTime, default=datetime.now)
     status_change_date = Column(DateTime, nullable=True)
     order_number = Column(Integer, nullable=True)
-    
+    status_id = Column(Integer, ForeignKey('statuses.id'), nullable=True, index=True)
+
     # Relationship to status history
     status_history = relationship("DemoStatusHistory", back_populates="application")
 
+    @validates("status")
+    def _resolve_status(self, key, value):
+        status = statuses.resolve(value)
+        self.status_id = status.id
+        return status.name
+
 class DemoStatusHistory(Base):
     __tablename__ = "demo_status_history"
     __table_args__ = {'extend_existing': True}
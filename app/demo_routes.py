@@ -1,12 +1,12 @@
-# Import JSON for debugging
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Body
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
-from datetime import datetime, date
+from datetime import datetime
 from app.database import get_db
-from app import demo_crud, demo_models, schemas
+from app import analytics, demo_crud, demo_models, extraction, jobs, schemas, statuses
+from app import demo_data  # noqa: F401 - imported for its side effect: registers the regenerate_demo_data job handler
 import logging
-import json
 
 router = APIRouter(prefix="/demo", tags=["demo"])
 logger = logging.getLogger(__name__)
@@ -15,7 +15,7 @@ logger = logging.getLogger(__name__)
 @router.get("/applications/", response_model=List[schemas.Application])
 def read_demo_applications(db: Session = Depends(get_db)):
     applications = demo_crud.get_demo_applications(db)
-    logger.info(f"Fetched {len(applications)} demo applications")
+    logger.info("Fetched %s demo applications", len(applications))
     return applications
 
 # Get single application
@@ -45,30 +45,24 @@ async def create_demo_application(
     db: Session = Depends(get_db)
 ):
     try:
-        logger.info(f"Received demo form data: company={company}, role={role}, status={status}, application_date={application_date}")
+        logger.debug("Received demo form data: company=%s, role=%s, status=%s, application_date=%s", company, role, status, application_date)
         
         # Validate required fields
         if not company or not company.strip():
             company = "Untitled Company"
-            logger.warning(f"Empty company name provided, using default: {company}")
+            logger.warning("Empty company name provided, using default: %s", company)
             
         if not role or not role.strip():
             role = "Untitled Role"
-            logger.warning(f"Empty role provided, using default: {role}")
+            logger.warning("Empty role provided, using default: %s", role)
             
         if not status or not status.strip():
             status = "Not Yet Applied"
-            logger.warning(f"Empty status provided, using default: {status}")
+            logger.warning("Empty status provided, using default: %s", status)
         
         # Process file uploads
-        resume_filename = None
-        cover_letter_filename = None
-        
-        if resume_file:
-            resume_filename = demo_crud.save_demo_upload_file(resume_file, "resume")
-        
-        if cover_letter_file:
-            cover_letter_filename = demo_crud.save_demo_upload_file(cover_letter_file, "cover_letter")
+        resume_upload = await demo_crud.save_demo_upload_file(resume_file, "resume")
+        cover_letter_upload = await demo_crud.save_demo_upload_file(cover_letter_file, "cover_letter")
         
         # Create application data
         application_data = {
@@ -82,8 +76,8 @@ async def create_demo_application(
             "cons": cons,
             "salary": salary,
             "follow_up_required": follow_up_required,
-            "resume_file": resume_filename,
-            "cover_letter_file": cover_letter_filename,
+            "resume_file": resume_upload.stored_name if resume_upload else None,
+            "cover_letter_file": cover_letter_upload.stored_name if cover_letter_upload else None,
             "created_at": datetime.now(),
             "updated_at": datetime.now(),
             "status_change_date": datetime.now()
@@ -93,21 +87,28 @@ async def create_demo_application(
         if application_date and application_date.strip():
             try:
                 application_data["application_date"] = datetime.strptime(application_date, "%Y-%m-%d").date()
-                logger.info(f"Parsed application_date: {application_data['application_date']}")
+                logger.debug("Parsed application_date: %s", application_data['application_date'])
             except ValueError as e:
-                logger.error(f"Error parsing application_date '{application_date}': {str(e)}")
+                logger.error("Error parsing application_date '%s': %s", application_date, e)
                 # Set to None if we can't parse it
                 application_data["application_date"] = None
         else:
             application_data["application_date"] = None
         
-        return demo_crud.create_demo_application(db, application_data)
+        db_app = demo_crud.create_demo_application(
+            db, application_data, uploads={"resume": resume_upload, "cover_letter": cover_letter_upload},
+        )
+        extraction.schedule(db, resume_upload, cover_letter_upload)
+        return db_app
+    except ValueError as ve:
+        logger.warning("Validation error creating demo application: %s", ve)
+        raise HTTPException(status_code=422, detail=str(ve))
     except Exception as e:
-        logger.error(f"Error creating application: {str(e)}")
+        logger.error("Error creating application: %s", e)
         logger.exception("Detailed error:")
         raise
     
-    logger.info(f"Creating demo application: {company} - {role}")
+    logger.info("Creating demo application: %s - %s", company, role)
     return demo_crud.create_demo_application(db, application_data)
 
 # Update application - support both PUT and PATCH
@@ -136,14 +137,10 @@ async def update_demo_application(
         raise HTTPException(status_code=404, detail="Application not found")
     
     # Process file uploads
-    resume_filename = db_app.resume_file
-    cover_letter_filename = db_app.cover_letter_file
-    
-    if resume_file:
-        resume_filename = demo_crud.save_demo_upload_file(resume_file, "resume")
-    
-    if cover_letter_file:
-        cover_letter_filename = demo_crud.save_demo_upload_file(cover_letter_file, "cover_letter")
+    resume_upload = await demo_crud.save_demo_upload_file(resume_file, "resume")
+    cover_letter_upload = await demo_crud.save_demo_upload_file(cover_letter_file, "cover_letter")
+    resume_filename = resume_upload.stored_name if resume_upload else db_app.resume_file
+    cover_letter_filename = cover_letter_upload.stored_name if cover_letter_upload else db_app.cover_letter_file
     
     # Create update data with only provided fields
     update_data = {}
@@ -168,9 +165,9 @@ async def update_demo_application(
         if application_date.strip():
             try:
                 update_data["application_date"] = datetime.strptime(application_date, "%Y-%m-%d").date()
-                logger.info(f"Parsed update application_date: {update_data['application_date']}")
+                logger.debug("Parsed update application_date: %s", update_data['application_date'])
             except ValueError as e:
-                logger.error(f"Error parsing update application_date '{application_date}': {str(e)}")
+                logger.error("Error parsing update application_date '%s': %s", application_date, e)
                 # Keep as None if we can't parse it
         else:
             # Empty string becomes None
@@ -185,8 +182,16 @@ async def update_demo_application(
     if status and status != db_app.status:
         update_data["status_change_date"] = datetime.now()
     
-    logger.info(f"Updating demo application: {app_id}")
-    return demo_crud.update_demo_application(db, app_id, update_data)
+    logger.info("Updating demo application: %s", app_id)
+    try:
+        updated_app = demo_crud.update_demo_application(
+            db, app_id, update_data, uploads={"resume": resume_upload, "cover_letter": cover_letter_upload},
+        )
+    except ValueError as ve:
+        logger.warning("Validation error updating demo application %s: %s", app_id, ve)
+        raise HTTPException(status_code=422, detail=str(ve))
+    extraction.schedule(db, resume_upload, cover_letter_upload)
+    return updated_app
 
 # Debug endpoint for JSON submission (for testing)
 @router.post("/applications/debug/", response_model=schemas.Application)
@@ -194,7 +199,7 @@ async def create_demo_application_json(
     application: Dict[str, Any] = Body(...),
     db: Session = Depends(get_db)
 ):
-    logger.info(f"Debug JSON application creation: {application}")
+    logger.debug("Debug JSON application creation: %s", application)
     
     # Create application data with required fields
     application_data = {
@@ -247,39 +252,21 @@ def get_demo_visualizations(db: Session = Depends(get_db)):
               "July", "August", "September", "October", "November", "December"]
     month_counts = [0] * 12
     
-    # Count applications by status
-    status_counts = {}
-    
     for app in applications:
         if app.application_date:
             month_idx = app.application_date.month - 1
             month_counts[month_idx] += 1
-        
-        if app.status:
-            if app.status in status_counts:
-                status_counts[app.status] += 1
-            else:
-                status_counts[app.status] = 1
     
-    # Prepare data for charts
-    status_labels = list(status_counts.keys())
-    status_data = list(status_counts.values())
-    
-    # Colors for status distribution
-    status_colors = {
-        "Not Yet Applied": "#FFFFFF",        # White
-        "Applied": "#FFCE56",                # Yellow
-        "Interviewing": "#FF9F40",           # Orange
-        "Offer": "#4BC0C0",                  # Green
-        "Rejected": "#FF6384",               # Red
-        "No Longer Listed": "#9E9E9E",       # Gray
-        "Decided not to apply": "#8D6E63",   # Brown
-        "Declined Offer": "#000000",         # Black
-        "Accepted": "#FF5722",               # Dark Orange
-        "Applied / No Longer Listed": "#E0E0E0" # Light Gray
-    }
-    
-    status_background_colors = [status_colors.get(status, "#9966FF") for status in status_labels]
+    # Count applications by status id, in dictionary order, with the dictionary colors
+    status_counts = dict(
+        db.query(demo_models.DemoApplication.status_id, func.count())
+        .group_by(demo_models.DemoApplication.status_id)
+        .all()
+    )
+    status_entries = [status for status in statuses.load() if status_counts.get(status.id)]
+    status_labels = [status.name for status in status_entries]
+    status_data = [status_counts[status.id] for status in status_entries]
+    status_background_colors = [status.color for status in status_entries]
     
     # Only return months from March to June
     relevant_months = months[2:7]  # March to July (0-based, so 2-6)
@@ -318,6 +305,11 @@ def get_demo_visualizations(db: Session = Depends(get_db)):
         }
     }
 
+# Dwell times and response latency of the demo applications
+@router.get("/analytics/response-times", response_model=schemas.ResponseTimes)
+def get_demo_response_times():
+    return analytics.response_times(analytics.DEMO)
+
 # File upload endpoints
 @router.post("/applications/{app_id}/files/{file_type}", response_model=schemas.Application)
 async def upload_demo_file(
@@ -339,13 +331,20 @@ async def upload_demo_file(
         )
     
     # Save the file
-    filename = demo_crud.save_demo_upload_file(file, file_type)
+    stored = await demo_crud.save_demo_upload_file(file, file_type)
     
     # Update application with file reference
     update_data = {
-        f"{file_type}_file": filename,
+        f"{file_type}_file": stored.stored_name,
         "updated_at": datetime.now()
     }
     
-    logger.info(f"Uploading {file_type} for demo application: {app_id}")
-    return demo_crud.update_demo_application(db, app_id, update_data)
+    logger.info("Uploading %s for demo application: %s", file_type, app_id)
+    updated_app = demo_crud.update_demo_application(db, app_id, update_data, uploads={file_type: stored})
+    extraction.schedule(db, stored)
+    return updated_app
+
+# Regenerate the demo dataset in the background
+@router.post("/reset", response_model=schemas.JobStatus, status_code=202)
+def reset_demo_data(count: int = 50, db: Session = Depends(get_db)):
+    return jobs.enqueue(db, "regenerate_demo_data", {"count": count}, max_attempts=1)
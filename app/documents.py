@@ -0,0 +1,94 @@
+"""Reference-counted links between applications and content-addressed upload blobs.
+
+``documents`` has one row per distinct blob (see app/uploads.py) with a
+``ref_count``. ``application_documents`` records which application slot (resume
+or cover letter, real or demo) points at which blob, along with the filename
+the user uploaded. Blobs whose count drops to zero stay on disk until they are
+cleaned up separately; deleting them here would race with a concurrent upload
+of the same content.
+"""
+from typing import Optional
+
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app import models
+from app.uploads import StoredUpload
+
+APPLICATIONS = "applications"
+DEMO_APPLICATIONS = "demo_applications"
+
+def _acquire(db: Session, upload: StoredUpload) -> int:
+    """Insert the blob row if new, bump its count, and return its id."""
+    db.execute(
+        insert(models.Document)
+        .values(
+            sha256=upload.sha256,
+            stored_name=upload.stored_name,
+            size=upload.size,
+            mime_type=upload.mime_type,
+            ref_count=0,
+        )
+        .on_conflict_do_nothing(index_elements=["sha256"])
+    )
+    db.execute(
+        update(models.Document)
+        .where(models.Document.sha256 == upload.sha256)
+        .values(ref_count=models.Document.ref_count + 1)
+    )
+    return db.query(models.Document.id).filter(models.Document.sha256 == upload.sha256).scalar()
+
+def release(db: Session, application_table: str, application_id: int, kind: Optional[str] = None):
+    """Drop an application's document links (one slot, or all of them) and decrement the blobs. Does not commit."""
+    query = db.query(models.ApplicationDocument).filter(
+        models.ApplicationDocument.application_table == application_table,
+        models.ApplicationDocument.application_id == application_id,
+    )
+    if kind is not None:
+        query = query.filter(models.ApplicationDocument.kind == kind)
+    for link in query.all():
+        db.execute(
+            update(models.Document)
+            .where(models.Document.id == link.document_id)
+            .values(ref_count=models.Document.ref_count - 1)
+        )
+        db.delete(link)
+
+def attach(db: Session, application_table: str, application_id: int, kind: str, upload: StoredUpload):
+    """Point an application's ``kind`` slot at ``upload``, replacing any previous link. Does not commit."""
+    release(db, application_table, application_id, kind)
+    db.flush()
+    db.add(models.ApplicationDocument(
+        document_id=_acquire(db, upload),
+        application_table=application_table,
+        application_id=application_id,
+        kind=kind,
+        original_filename=upload.original_filename,
+    ))
+
+def attach_uploads(db: Session, application_table: str, application_id: int, **uploads: Optional[StoredUpload]):
+    """Link each non-empty ``kind=upload`` pair to the application. Does not commit, so the links are
+    written in the same transaction as the application itself."""
+    for kind, upload in uploads.items():
+        if upload is not None:
+            attach(db, application_table, application_id, kind, upload)
+
+def release_all(conn: Connection, application_table: str):
+    """Drop every document link of ``application_table`` and decrement the blobs, e.g. before the
+    table itself is dropped. Does not commit."""
+    Link = models.ApplicationDocument
+    counts = conn.execute(
+        select(Link.document_id, func.count())
+        .where(Link.application_table == application_table)
+        .group_by(Link.document_id)
+    ).all()
+    if counts:
+        conn.execute(
+            update(models.Document)
+            .where(models.Document.id == bindparam("document_id"))
+            .values(ref_count=models.Document.ref_count - bindparam("links")),
+            [{"document_id": document_id, "links": links} for document_id, links in counts],
+        )
+    conn.execute(delete(Link).where(Link.application_table == application_table))
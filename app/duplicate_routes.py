@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List
+from app.database import get_db
+from app import crud, duplicates, schemas
+
+router = APIRouter(tags=["duplicates"])
+
+@router.get("/applications/{app_id}/duplicates", response_model=List[schemas.DuplicateMatch])
+def list_duplicates(
+    app_id: int,
+    threshold: float = Query(duplicates.THRESHOLD, ge=0, le=1),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Other applications that are probably the same job, most similar first."""
+    application = crud.get_application(db, application_id=app_id)
+    if application is None:
+        raise HTTPException(status_code=404, detail="Application not found")
+    return duplicates.find_duplicates(
+        db.connection(), application.company, application.role, application.url,
+        exclude_id=application.id, threshold=threshold, limit=limit,
+    )
@@ -0,0 +1,194 @@
+"""Fuzzy detection of applications that were entered twice.
+
+Each application is described by the character trigrams of its normalized
+company name and of its role, plus its canonical posting URL. Comparing a
+new application with every stored one would be a pairwise scan, so the
+trigram sets are condensed into a MinHash signature which is cut into
+``BANDS`` bands (locality-sensitive hashing). Every band, and the canonical
+URL, becomes one integer blocking key in ``application_signatures``, which
+is indexed on the key. Only applications sharing at least one key are
+candidates; each candidate is then scored exactly:
+
+- the same canonical URL scores 1.0
+- otherwise the score is the mean trigram Jaccard similarity of company and role
+
+Signatures are kept current by mapper events for ORM writes and by
+``index_rows`` for the spreadsheet import's bulk writes.
+"""
+import hashlib
+import logging
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import delete, event, insert, inspect, select
+from sqlalchemy.engine import Connection
+
+from app.companies import normalize_company_name
+from app.models import Application, ApplicationSignature
+from app.urls import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+BANDS = 10
+ROWS_PER_BAND = 3
+THRESHOLD = 0.75
+MAX_CANDIDATES = 200
+BATCH = 500
+
+# One random 64-bit mask per MinHash "permutation" (h XOR mask); fixed so stored keys stay valid
+_MASKS = np.random.default_rng(44).integers(
+    0, np.iinfo(np.uint64).max, size=BANDS * ROWS_PER_BAND, dtype=np.uint64, endpoint=True,
+)
+_NON_WORD = re.compile(r"[^\w]+")
+
+@dataclass(frozen=True)
+class Features:
+    company: FrozenSet[str]
+    role: FrozenSet[str]
+    url: Optional[str]
+
+@dataclass
+class DuplicateMatch:
+    id: int
+    company: str
+    role: str
+    url: Optional[str]
+    score: float
+
+def trigrams(text: str) -> FrozenSet[str]:
+    if not text:
+        return frozenset()
+    padded = f"  {text} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+def features(company: Optional[str], role: Optional[str], url: Optional[str]) -> Features:
+    role_text = " ".join(_NON_WORD.sub(" ", role.casefold()).split()) if isinstance(role, str) else ""
+    return Features(
+        company=trigrams(normalize_company_name(company) if isinstance(company, str) else ""),
+        role=trigrams(role_text),
+        url=canonicalize_url(url) if isinstance(url, str) else None,
+    )
+
+def _hash64(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "big")
+
+def _signed(value: int) -> int:
+    # SQLite integers are signed 64-bit
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+def signature_keys(item: Features) -> List[int]:
+    """The blocking keys of an application: one per MinHash band, plus its canonical URL."""
+    keys = []
+    shingles = [f"c{gram}" for gram in item.company] + [f"r{gram}" for gram in item.role]
+    if shingles:
+        hashes = np.array([_hash64(shingle) for shingle in shingles], dtype=np.uint64)
+        minhash = np.bitwise_xor.outer(_MASKS, hashes).min(axis=1).tolist()
+        for band in range(BANDS):
+            values = minhash[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+            keys.append(_signed(_hash64(f"{band}:{values}")))
+    if item.url:
+        keys.append(_signed(_hash64(f"url:{item.url}")))
+    return keys
+
+def _jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+def similarity(a: Features, b: Features) -> float:
+    if a.url and a.url == b.url:
+        return 1.0
+    return round((_jaccard(a.company, b.company) + _jaccard(a.role, b.role)) / 2, 3)
+
+def _batches(values: Sequence, size: int = BATCH):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+def find_duplicates_many(
+    conn: Connection,
+    rows: Sequence[Tuple[Optional[str], Optional[str], Optional[str]]],
+    exclude_ids: Optional[Sequence[Optional[int]]] = None,
+    threshold: float = THRESHOLD,
+    limit: int = 10,
+) -> List[List[DuplicateMatch]]:
+    """Likely duplicates among stored applications for each (company, role, url), best first."""
+    items = [features(*row) for row in rows]
+    row_keys = [signature_keys(item) for item in items]
+    owners: Dict[int, List[int]] = defaultdict(list)
+    for keys in _batches(sorted({key for keys in row_keys for key in keys})):
+        query = select(ApplicationSignature.key, ApplicationSignature.application_id).where(ApplicationSignature.key.in_(keys))
+        for key, application_id in conn.execute(query):
+            owners[key].append(application_id)
+
+    candidates = []
+    for index, keys in enumerate(row_keys):
+        shared = Counter(application_id for key in keys for application_id in owners.get(key, ()))
+        if exclude_ids is not None and exclude_ids[index] is not None:
+            shared.pop(exclude_ids[index], None)
+        candidates.append([application_id for application_id, _ in shared.most_common(MAX_CANDIDATES)])
+
+    stored = {}
+    for ids in _batches(sorted({application_id for ids in candidates for application_id in ids})):
+        query = select(Application.id, Application.company, Application.role, Application.url).where(Application.id.in_(ids))
+        for row in conn.execute(query):
+            stored[row.id] = row
+
+    results = []
+    for item, ids in zip(items, candidates):
+        matches = []
+        for application_id in ids:
+            row = stored.get(application_id)
+            if row is None:
+                continue
+            score = similarity(item, features(row.company, row.role, row.url))
+            if score >= threshold:
+                matches.append(DuplicateMatch(row.id, row.company, row.role, row.url, score))
+        matches.sort(key=lambda match: (-match.score, match.id))
+        results.append(matches[:limit])
+    return results
+
+def find_duplicates(conn: Connection, company: Optional[str], role: Optional[str], url: Optional[str],
+                    exclude_id: Optional[int] = None, **kwargs) -> List[DuplicateMatch]:
+    return find_duplicates_many(conn, [(company, role, url)], [exclude_id], **kwargs)[0]
+
+def index_rows(conn: Connection, rows: Iterable[Tuple[int, Optional[str], Optional[str], Optional[str]]]):
+    """(Re)write the signature keys of ``(id, company, role, url)`` rows."""
+    rows = list(rows)
+    for ids in _batches([row[0] for row in rows]):
+        conn.execute(delete(ApplicationSignature).where(ApplicationSignature.application_id.in_(ids)))
+    params = [
+        {"application_id": application_id, "key": key}
+        for application_id, company, role, url in rows
+        for key in signature_keys(features(company, role, url))
+    ]
+    if params:
+        conn.execute(insert(ApplicationSignature), params)
+
+def backfill_signatures(conn: Connection):
+    """Compute signatures for every stored application."""
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(Application.id, Application.company, Application.role, Application.url)
+            .where(Application.id > last_id).order_by(Application.id).limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        index_rows(conn, [tuple(row) for row in rows])
+        last_id = rows[-1].id
+    logger.info("Backfilled duplicate-detection signatures up to application %d", last_id)
+
+@event.listens_for(Application, "after_insert")
+def _index_on_insert(mapper, connection, target):
+    index_rows(connection, [(target.id, target.company, target.role, target.url)])
+
+@event.listens_for(Application, "after_update")
+def _index_on_update(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in ("company", "role", "url")):
+        index_rows(connection, [(target.id, target.company, target.role, target.url)])
+
+@event.listens_for(Application, "before_delete")
+def _unindex_on_delete(mapper, connection, target):
+    connection.execute(delete(ApplicationSignature).where(ApplicationSignature.application_id == target.id))
@@ -0,0 +1,100 @@
+import os
+import tempfile
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+
+from app import exports
+
+router = APIRouter(prefix="/applications", tags=["exports"])
+
+def list_filters(
+    search: str = None,
+    status: str = None,
+    company_id: Optional[int] = None,
+    url: Optional[str] = None,
+    follow_up_required: bool = None,
+    missing_date: bool = None,
+    salary_min: Optional[int] = None,
+    salary_max: Optional[int] = None,
+    sort_by: str = "created_at",
+    sort_order: str = "asc",
+    document_search: str = None,
+) -> dict:
+    """The filters of GET /applications/, as keyword arguments for crud.filtered_applications_query."""
+    return {
+        "search": search,
+        "document_search": document_search,
+        "status": status,
+        "company_id": company_id,
+        "url": url,
+        "follow_up_required": follow_up_required,
+        "missing_date": missing_date,
+        "salary_min": salary_min,
+        "salary_max": salary_max,
+        "sort_by": sort_by,
+        "sort_order": sort_order,
+    }
+
+def _temp_file_response(path: str, media_type: str, filename: str) -> FileResponse:
+    return FileResponse(path, media_type=media_type, filename=filename, background=BackgroundTask(os.remove, path))
+
+@router.get("/export.csv")
+def export_applications_csv(filters: dict = Depends(list_filters)):
+    """Stream every application matching the list filters as CSV."""
+    return StreamingResponse(
+        exports.iter_csv(exports.iter_rows(**filters)),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": 'attachment; filename="applications.csv"'},
+    )
+
+def _build_xlsx(path: str, filters: dict):
+    exports.write_xlsx(path, exports.iter_rows(exports.SPREADSHEET_COLUMNS, **filters))
+
+@router.get("/export.xlsx")
+async def export_applications_xlsx(filters: dict = Depends(list_filters)):
+    """Every application matching the list filters, in the spreadsheet importer's layout."""
+    fd, path = tempfile.mkstemp(prefix="export-", suffix=".xlsx")
+    os.close(fd)
+    try:
+        await run_in_threadpool(_build_xlsx, path, filters)
+    except BaseException:
+        os.remove(path)
+        raise
+    return _temp_file_response(
+        path, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "applications.xlsx",
+    )
+
+_SNAPSHOT_MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
+}
+
+async def _snapshot_response(fmt: str, table: str, date_from: Optional[date], date_to: Optional[date]):
+    if exports.pa is None:
+        raise HTTPException(status_code=501, detail="Parquet/Arrow export requires pyarrow on the server")
+    if table not in exports.SNAPSHOT_TABLES:
+        raise HTTPException(status_code=400, detail=f"Unknown table: {table}")
+    # Parquet footers are written last, so build the file on disk and send it when complete
+    fd, path = tempfile.mkstemp(prefix="snapshot-", suffix=f".{fmt}")
+    try:
+        with os.fdopen(fd, "wb") as sink:
+            await run_in_threadpool(exports.write_snapshot, sink, table, fmt, date_from, date_to)
+    except BaseException:
+        os.remove(path)
+        raise
+    return _temp_file_response(path, _SNAPSHOT_MEDIA_TYPES[fmt], f"{table}.{fmt}")
+
+@router.get("/export.parquet")
+async def export_applications_parquet(table: str = "applications", date_from: date = None, date_to: date = None):
+    """Columnar snapshot of a table, optionally limited to a date range."""
+    return await _snapshot_response("parquet", table, date_from, date_to)
+
+@router.get("/export.arrow")
+async def export_applications_arrow(table: str = "applications", date_from: date = None, date_to: date = None):
+    """Arrow IPC (Feather v2) snapshot, which notebooks can memory-map."""
+    return await _snapshot_response("arrow", table, date_from, date_to)
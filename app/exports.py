@@ -0,0 +1,199 @@
+"""Exports of the (filtered) applications list.
+
+Rows are read with ``yield_per`` as plain column tuples rather than ORM
+objects, and written out in small batches, so an export holds only one batch
+in memory however many rows match.
+
+- CSV uses the spreadsheet headers of the importer (see
+  app/upload_spreadsheet.py), so an export can be imported again. Text that
+  a spreadsheet would run as a formula is prefixed with ``'``.
+- Excel (``write_xlsx``) uses exactly the importer's column layout on
+  ``Sheet1``. It is written with openpyxl's write-only workbook, which streams
+  rows to disk instead of keeping cells in memory.
+- Parquet and Arrow IPC snapshots (``write_snapshot``) keep the database column
+  names and types (dates stay dates), one table per file, and need ``pyarrow``.
+  From the shell::
+
+    python -m app.exports applications.parquet --table applications --from 2025-01-01
+"""
+import argparse
+import csv
+import io
+from datetime import date, datetime, time, timedelta
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from sqlalchemy import Boolean, Date, DateTime, Integer, select
+
+from app import crud, models
+from app.database import SessionLocal, engine
+from app.demo_models import DemoApplication, DemoStatusHistory
+from app.upload_spreadsheet import COLUMN_MAP
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = pq = None
+
+YIELD_PER = 1000
+CSV_BATCH_ROWS = 500
+SNAPSHOT_BATCH_ROWS = 50_000
+
+SNAPSHOT_FORMATS = {"parquet", "arrow"}
+# Table name -> (table, column the date range filters on)
+SNAPSHOT_TABLES = {
+    "applications": (models.Application.__table__, models.Application.application_date),
+    "status_history": (models.StatusHistory.__table__, models.StatusHistory.timestamp),
+    "demo_applications": (DemoApplication.__table__, DemoApplication.application_date),
+    "demo_status_history": (DemoStatusHistory.__table__, DemoStatusHistory.timestamp),
+}
+_INTERNAL_COLUMNS = {"import_key", "import_fingerprint"}
+
+EXPORT_COLUMNS = [
+    ("ID", models.Application.id),
+    *[(header, getattr(models.Application, column)) for header, column in COLUMN_MAP.items()],
+    ("Created At", models.Application.created_at),
+    ("Updated At", models.Application.updated_at),
+]
+
+# The importer's layout, nothing else, so a re-import sees the same columns
+SPREADSHEET_COLUMNS = [(header, getattr(models.Application, column)) for header, column in COLUMN_MAP.items()]
+
+def export_headers(columns=EXPORT_COLUMNS) -> List[str]:
+    return [header for header, _ in columns]
+
+def iter_rows(columns=EXPORT_COLUMNS, **filters) -> Iterator[Tuple]:
+    """Stream the applications matching ``filters`` (see crud.filtered_applications_query)."""
+    with SessionLocal() as db:
+        query = crud.filtered_applications_query(db, **filters)
+        query = query.with_entities(*[column for _, column in columns]).yield_per(YIELD_PER)
+        for row in query:
+            yield tuple(row)
+
+# A cell starting with one of these is run as a formula by spreadsheet programs
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        # Text that looks like a formula stays text
+        return "'" + value
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+def iter_csv(rows: Iterator[Tuple]) -> Iterator[str]:
+    """Encode rows as CSV, yielding one chunk of text per batch of rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(export_headers())
+    pending = 0
+    for row in rows:
+        writer.writerow([_csv_value(value) for value in row])
+        pending += 1
+        if pending >= CSV_BATCH_ROWS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue()
+
+def _xlsx_cell(sheet, value):
+    if isinstance(value, str):
+        value = ILLEGAL_CHARACTERS_RE.sub("", value)
+        if value.startswith("="):
+            # Text that looks like a formula stays text
+            cell = WriteOnlyCell(sheet, value)
+            cell.data_type = "s"
+            return cell
+    return value
+
+def write_xlsx(path: str, rows: Iterator[Tuple], sheet_name: str = "Sheet1") -> int:
+    """Write rows in the importer's layout to a new workbook at ``path``. Returns the row count."""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    sheet.append(export_headers(SPREADSHEET_COLUMNS))
+    count = 0
+    for row in rows:
+        sheet.append([_xlsx_cell(sheet, value) for value in row])
+        count += 1
+    workbook.save(path)
+    return count
+
+def _arrow_type(column_type):
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column_type, Date):
+        return pa.date32()
+    return pa.string()
+
+def _date_bound(column, day: date):
+    return datetime.combine(day, time.min) if isinstance(column.type, DateTime) else day
+
+def snapshot_query(table: str, date_from: Optional[date] = None, date_to: Optional[date] = None):
+    """Columns and SELECT for a snapshot of ``table``, limited to ``[date_from, date_to]``."""
+    source, date_column = SNAPSHOT_TABLES[table]
+    columns = [column for column in source.columns if column.name not in _INTERNAL_COLUMNS]
+    query = select(*columns).order_by(source.c.id)
+    if date_from:
+        query = query.where(date_column >= _date_bound(date_column, date_from))
+    if date_to:
+        query = query.where(date_column < _date_bound(date_column, date_to + timedelta(days=1)))
+    return columns, query
+
+def write_snapshot(
+    sink: BinaryIO,
+    table: str = "applications",
+    fmt: str = "parquet",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    batch_size: int = SNAPSHOT_BATCH_ROWS,
+) -> int:
+    """Write ``table`` to ``sink`` as Parquet or Arrow IPC, one record batch per fetch. Returns the row count."""
+    if pa is None:
+        raise RuntimeError("Parquet/Arrow export requires pyarrow (pip install pyarrow)")
+    if fmt not in SNAPSHOT_FORMATS:
+        raise ValueError(f"Unknown snapshot format: {fmt}")
+    columns, query = snapshot_query(table, date_from, date_to)
+    schema = pa.schema([pa.field(column.name, _arrow_type(column.type)) for column in columns])
+    writer = pq.ParquetWriter(sink, schema) if fmt == "parquet" else pa.ipc.new_file(sink, schema)
+    count = 0
+    try:
+        with engine.connect() as conn:
+            result = conn.execution_options(yield_per=batch_size).execute(query)
+            for rows in result.partitions():
+                arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)]
+                batch = pa.RecordBatch.from_arrays(arrays, schema=schema)
+                if fmt == "parquet":
+                    writer.write_table(pa.Table.from_batches([batch]))
+                else:
+                    writer.write_batch(batch)
+                count += len(rows)
+    finally:
+        writer.close()
+    return count
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Write a Parquet or Arrow IPC snapshot of a table.")
+    parser.add_argument("output", help="file to write; the format follows the extension (.parquet or .arrow)")
+    parser.add_argument("--table", choices=sorted(SNAPSHOT_TABLES), default="applications")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="first date to include (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="last date to include (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+    fmt = "arrow" if args.output.endswith((".arrow", ".feather", ".ipc")) else "parquet"
+    with open(args.output, "wb") as sink:
+        count = write_snapshot(sink, args.table, fmt, args.date_from, args.date_to)
+    print(f"Wrote {count} {args.table} rows to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""Background text extraction and full-text search over uploaded documents.
+
+After an upload is stored, ``schedule`` enqueues an ``extract_document`` job
+(see app/jobs.py). The job hands the parsing to a process pool, so it never
+runs on the request path and does not compete with request threads for the
+GIL. The text lands in ``document_texts`` (one row per
+stored filename, so deduplicated uploads are only extracted once); a file
+that cannot be parsed gets an empty row with the reason in ``error``. An FTS5
+index, ``document_text_fts``, is kept in sync by triggers.
+``search_stored_names_query`` turns a query into the set of matching filenames
+for the list endpoint.
+
+PDF text uses ``pypdf`` when it is installed. Otherwise a small fallback reads
+the text-showing operators from the page content streams.
+"""
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+from xml.etree import ElementTree
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app import config, jobs, models
+from app.database import SessionLocal
+from app.uploads import StoredUpload, file_extension
+
+try:
+    import pypdf
+except ImportError:  # optional dependency
+    pypdf = None
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+# --- Extractors (run in worker processes) ---
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+def _extract_docx(path: str) -> str:
+    with zipfile.ZipFile(path) as archive:
+        root = ElementTree.fromstring(archive.read("word/document.xml"))
+    paragraphs = []
+    for paragraph in root.iter(f"{_WORD_NS}p"):
+        paragraphs.append("".join(node.text or "" for node in paragraph.iter(f"{_WORD_NS}t")))
+    return "\n".join(paragraphs)
+
+# RTF destinations that hold metadata rather than document text
+_RTF_SKIP_GROUPS = {"fonttbl", "colortbl", "stylesheet", "info", "pict", "header", "footer", "listtable", "listoverridetable"}
+_RTF_TOKEN = re.compile(r"\\'([0-9a-fA-F]{2})|\\([a-zA-Z]+)(-?\d+)? ?|\\(.)|([{}])|([^\\{}]+)", re.S)
+
+def _extract_rtf(path: str) -> str:
+    with open(path, "r", encoding="latin-1") as f:
+        data = f.read()
+    out = []
+    depth = 0
+    skip_depth = None  # group depth at which a skipped destination started
+    for match in _RTF_TOKEN.finditer(data):
+        hex_char, word, _, symbol, brace, chunk = match.groups()
+        if brace == "{":
+            depth += 1
+            continue
+        if brace == "}":
+            if skip_depth == depth:
+                skip_depth = None
+            depth -= 1
+            continue
+        if skip_depth is not None:
+            continue
+        if symbol == "*" or word in _RTF_SKIP_GROUPS:
+            skip_depth = depth
+        elif word in ("par", "line"):
+            out.append("\n")
+        elif word == "tab":
+            out.append("\t")
+        elif hex_char:
+            out.append(chr(int(hex_char, 16)))
+        elif symbol in ("\\", "{", "}"):
+            out.append(symbol)
+        elif chunk:
+            out.append(chunk.replace("\r", "").replace("\n", ""))
+    return "".join(out)
+
+def _extract_doc(path: str) -> str:
+    # Legacy binary Word: keep runs of readable text (stored as cp1252 or UTF-16LE)
+    with open(path, "rb") as f:
+        data = f.read()
+    runs = re.findall(rb"(?:[\x20-\x7e]\x00){4,}", data)
+    if runs:
+        return "\n".join(run.decode("utf-16-le") for run in runs)
+    return "\n".join(run.decode("cp1252") for run in re.findall(rb"[\x20-\x7e]{4,}", data))
+
+def _extract_pdf_fallback(path: str) -> str:
+    with open(path, "rb") as f:
+        data = f.read()
+    pieces = []
+    for match in re.finditer(rb"stream\r?\n(.*?)\r?\nendstream", data, re.S):
+        stream = match.group(1)
+        try:
+            stream = zlib.decompress(stream)
+        except zlib.error:
+            pass
+        for string in re.findall(rb"\((?:\\.|[^\\)])*\)\s*Tj|\[(?:[^\]])*\]\s*TJ", stream):
+            parts = re.findall(rb"\(((?:\\.|[^\\)])*)\)", string)
+            pieces.append(b"".join(parts).replace(b"\\(", b"(").replace(b"\\)", b")").decode("latin-1"))
+    return " ".join(pieces)
+
+def _extract_pdf(path: str) -> str:
+    if pypdf is None:
+        return _extract_pdf_fallback(path)
+    reader = pypdf.PdfReader(path)
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+def _extract_txt(path: str) -> str:
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read(config.EXTRACTION_MAX_CHARS)
+
+_EXTRACTORS = {
+    "pdf": _extract_pdf,
+    "docx": _extract_docx,
+    "doc": _extract_doc,
+    "rtf": _extract_rtf,
+    "txt": _extract_txt,
+}
+
+def extract_text(path: str) -> str:
+    """Return the plain text of an uploaded file. Runs in a worker process."""
+    extractor = _EXTRACTORS.get(file_extension(path))
+    if extractor is None:
+        return ""
+    content = re.sub(r"[ \t]+", " ", extractor(path))
+    return content[:config.EXTRACTION_MAX_CHARS]
+
+# --- Index ---
+
+def ensure_search_index(engine):
+    """Create the FTS5 index over document_texts and the triggers that keep it current."""
+    statements = [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS document_text_fts USING fts5("
+        "content, content='document_texts', content_rowid='id', tokenize='porter unicode61')",
+        "CREATE TRIGGER IF NOT EXISTS document_texts_ai AFTER INSERT ON document_texts BEGIN "
+        "INSERT INTO document_text_fts(rowid, content) VALUES (new.id, new.content); END",
+        "CREATE TRIGGER IF NOT EXISTS document_texts_ad AFTER DELETE ON document_texts BEGIN "
+        "INSERT INTO document_text_fts(document_text_fts, rowid, content) VALUES ('delete', old.id, old.content); END",
+        "CREATE TRIGGER IF NOT EXISTS document_texts_au AFTER UPDATE ON document_texts BEGIN "
+        "INSERT INTO document_text_fts(document_text_fts, rowid, content) VALUES ('delete', old.id, old.content); "
+        "INSERT INTO document_text_fts(rowid, content) VALUES (new.id, new.content); END",
+    ]
+    with engine.begin() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+
+def fts_query(query: str) -> str:
+    """Quote each term so user input is matched literally (terms are ANDed); "" if there are no terms."""
+    terms = re.findall(r"\w+", query)
+    return " ".join(f'"{term}"' for term in terms)
+
+def is_search_syntax_error(exc: Exception) -> bool:
+    return "fts5" in str(getattr(exc, "orig", exc)).lower()
+
+def search_stored_names_query(query: str):
+    """Textual SELECT of the stored filenames whose text matches ``query``."""
+    return text(
+        "SELECT document_texts.stored_name FROM document_text_fts "
+        "JOIN document_texts ON document_texts.id = document_text_fts.rowid "
+        "WHERE document_text_fts MATCH :document_query"
+    ).bindparams(document_query=fts_query(query)).columns(stored_name=models.DocumentText.stored_name.type)
+
+# --- Scheduling ---
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=config.EXTRACTION_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next ``_get_pool`` starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _extract_in_pool(path: str) -> str:
+    # A worker that dies (out of memory, a crashing parser) breaks the whole pool; start over once
+    for attempt in range(2):
+        pool = _get_pool()
+        try:
+            return pool.submit(extract_text, path).result()
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            if attempt:
+                raise
+            logger.warning("Extraction worker pool broke; restarting it")
+
+def _is_indexed(stored_name: str) -> bool:
+    with SessionLocal() as db:
+        return db.query(models.DocumentText.id).filter(models.DocumentText.stored_name == stored_name).first() is not None
+
+def _store_text(stored_name: str, content: str, error: Optional[str] = None):
+    with SessionLocal() as db:
+        if db.query(models.DocumentText.id).filter(models.DocumentText.stored_name == stored_name).first():
+            return
+        db.add(models.DocumentText(stored_name=stored_name, content=content, error=error))
+        db.commit()
+
+@jobs.handler("extract_document")
+def extract_document_job(payload: dict, progress: jobs.JobProgress) -> dict:
+    """Extract and index one stored file unless it is already indexed."""
+    stored_name = payload["stored_name"]
+    if _is_indexed(stored_name):
+        return {"stored_name": stored_name, "skipped": True}
+    path = os.path.join(config.UPLOAD_FOLDER, stored_name)
+    try:
+        content = _extract_in_pool(path)
+    except BrokenProcessPool:
+        raise  # not the file's fault; the job is retried
+    except Exception as e:
+        # The same file fails the same way next time, so record it instead of retrying
+        logger.warning("Text extraction failed for %s: %s", stored_name, e)
+        _store_text(stored_name, "", str(e))
+        return {"stored_name": stored_name, "error": str(e)}
+    _store_text(stored_name, content)
+    logger.info("Indexed %s (%d chars)", stored_name, len(content))
+    return {"stored_name": stored_name, "chars": len(content)}
+
+def schedule(db: Session, *uploads: Optional[StoredUpload]) -> List[models.BackgroundJob]:
+    """Queue extraction jobs for the given uploads without waiting for them."""
+    return [
+        jobs.enqueue(db, "extract_document", {"stored_name": upload.stored_name})
+        for upload in uploads
+        if upload is not None
+    ]
+
+def shutdown():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Depends
+
+from app import facets, schemas
+from app.export_routes import list_filters
+
+router = APIRouter(tags=["applications"])
+
+@router.get("/applications/facets", response_model=schemas.Facets)
+def application_facets(filters: dict = Depends(list_filters)):
+    """Total and counts by status, follow-up and missing date for the GET /applications/ filters."""
+    return facets.facet_counts(**filters)
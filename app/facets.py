@@ -0,0 +1,86 @@
+"""Facet counts for the applications filter sidebar.
+
+One grouped query counts the filtered applications per
+``(status_id, follow_up_required, application_date IS NULL)`` cell; the
+total and every facet are summed from those few cells in Python. Each facet
+ignores its own filter but applies the others, so the status dropdown still
+shows the counts of the statuses that are not selected.
+
+Results are cached per data generation of the applications and of the
+extracted document texts, which the ``document_search`` filter reads (see
+app/generations.py).
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Tuple
+
+from sqlalchemy import func
+
+from app import crud, generations, statuses
+from app.database import SessionLocal
+from app.models import Application
+
+FACET_FILTERS = ("status", "follow_up_required", "missing_date")
+
+@dataclass
+class FacetCounts:
+    total: int = 0
+    status: Dict[str, int] = field(default_factory=dict)
+    follow_up_required: Dict[str, int] = field(default_factory=dict)
+    missing_date: Dict[str, int] = field(default_factory=dict)
+
+def _cells(**filters) -> Counter:
+    missing = Application.application_date.is_(None)
+    with SessionLocal() as db:
+        query = (
+            crud.filtered_applications_query(db, sort_by=None, **filters)
+            .with_entities(Application.status_id, Application.follow_up_required, missing, func.count())
+            .group_by(Application.status_id, Application.follow_up_required, missing)
+        )
+        return Counter({(status_id, bool(follow_up), bool(no_date)): count for status_id, follow_up, no_date, count in query})
+
+@lru_cache(maxsize=256)
+def _compute(generation: Tuple[int, int], filter_items: Tuple) -> FacetCounts:
+    filters = dict(filter_items)
+    # An unknown status name matches nothing, as in the list endpoint
+    status_id = statuses.id_for(filters["status"]) or -1 if filters["status"] else None
+    follow_up = filters["follow_up_required"]
+    missing_only = bool(filters["missing_date"])
+    cells = _cells(**{name: value for name, value in filters.items() if name not in FACET_FILTERS})
+
+    def matches(cell, skip: str) -> bool:
+        cell_status, cell_follow_up, cell_missing = cell
+        return (
+            (skip == "status" or not filters["status"] or cell_status == status_id)
+            and (skip == "follow_up_required" or follow_up is None or cell_follow_up == follow_up)
+            and (skip == "missing_date" or not missing_only or cell_missing)
+        )
+
+    names = statuses.by_id()
+    result = FacetCounts()
+    status_counts, follow_up_counts, missing_counts = Counter(), Counter(), Counter()
+    for cell, count in cells.items():
+        cell_status, cell_follow_up, cell_missing = cell
+        if matches(cell, skip=""):
+            result.total += count
+        if matches(cell, skip="status"):
+            status_counts[names[cell_status].name if cell_status in names else "Unknown"] += count
+        if matches(cell, skip="follow_up_required"):
+            follow_up_counts[str(cell_follow_up).lower()] += count
+        if matches(cell, skip="missing_date"):
+            missing_counts[str(cell_missing).lower()] += count
+    order = {status.name: status.sort_order for status in names.values()}
+    result.status = dict(sorted(status_counts.items(), key=lambda item: (order.get(item[0], 10_000), item[0])))
+    result.follow_up_required = {key: follow_up_counts[key] for key in ("true", "false")}
+    result.missing_date = {key: missing_counts[key] for key in ("true", "false")}
+    return result
+
+def facet_counts(**filters) -> FacetCounts:
+    """Total and per-facet counts for the list filters (see crud.filtered_applications_query)."""
+    filters.pop("sort_by", None)
+    filters.pop("sort_order", None)
+    for name in FACET_FILTERS:
+        filters.setdefault(name, None)
+    generation = (generations.current(generations.APPLICATIONS), generations.current(generations.DOCUMENT_TEXTS))
+    return _compute(generation, tuple(sorted(filters.items())))
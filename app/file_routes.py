@@ -0,0 +1,119 @@
+"""Serving of uploaded resumes and cover letters.
+
+Stored filenames never change content (``<sha256>.<ext>`` for new uploads,
+``<uuid>_<name>`` for older ones), so responses are marked immutable and cached
+for a year. The ETag is derived from the name rather than from mtime, and
+Last-Modified is when the blob was first stored (its ``documents`` row, or the
+file's mtime for files without one), so neither changes when the same content
+is uploaded again. Byte-range
+requests are answered with 206 so PDF viewers can fetch pages incrementally.
+If-None-Match / If-Modified-Since are answered with 304. When the ASGI server
+advertises the ``http.response.zerocopy`` or ``http.response.pathsend``
+extension, the file body is handed to the server instead of being read in
+Python. Downloads are named after the file the user uploaded (the latest
+``application_documents`` link to the blob), not after the stored name.
+"""
+import os
+from datetime import timezone
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse, Response
+from sqlalchemy.orm import Session
+from starlette.types import Receive, Scope, Send
+
+from app import config, models
+from app.database import get_db
+
+router = APIRouter(prefix="/uploads", tags=["uploads"])
+
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+class UploadFileResponse(FileResponse):
+    """FileResponse that uses the server's zero-copy extensions when available."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self._extensions = scope.get("extensions") or {}
+        await super().__call__(scope, receive, send)
+
+    async def _handle_simple(self, send: Send, send_header_only: bool) -> None:
+        if send_header_only or not ({"http.response.zerocopy", "http.response.pathsend"} & set(self._extensions)):
+            return await super()._handle_simple(send, send_header_only)
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if "http.response.pathsend" in self._extensions:
+            await send({"type": "http.response.pathsend", "path": os.path.abspath(self.path)})
+        else:
+            with open(self.path, "rb") as file:
+                await send({"type": "http.response.zerocopy", "file": file, "more_body": False})
+
+    async def _handle_single_range(self, send: Send, start: int, end: int, file_size: int, send_header_only: bool) -> None:
+        if send_header_only or "http.response.zerocopy" not in self._extensions:
+            return await super()._handle_single_range(send, start, end, file_size, send_header_only)
+        self.headers["content-range"] = f"bytes {start}-{end - 1}/{file_size}"
+        self.headers["content-length"] = str(end - start)
+        await send({"type": "http.response.start", "status": 206, "headers": self.raw_headers})
+        with open(self.path, "rb") as file:
+            await send({"type": "http.response.zerocopy", "file": file, "offset": start, "count": end - start, "more_body": False})
+
+def _etag_for(filename: str) -> str:
+    # The stem is the content hash (or a uuid for legacy uploads)
+    return f'"{filename.split(".", 1)[0]}"'
+
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag in tags or "*" in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+def _document_info(db: Session, filename: str) -> Tuple[str, Optional[float]]:
+    """The name the blob was last uploaded as and when it was first stored (None if it has no documents row)."""
+    row = (
+        db.query(models.Document.created_at, models.ApplicationDocument.original_filename)
+        .outerjoin(models.ApplicationDocument, models.ApplicationDocument.document_id == models.Document.id)
+        .filter(models.Document.stored_name == filename)
+        .order_by(models.ApplicationDocument.original_filename.is_(None), models.ApplicationDocument.id.desc())
+        .first()
+    )
+    if row is None:
+        return filename, None
+    created_at, original = row
+    stored_at = created_at.replace(tzinfo=timezone.utc).timestamp() if created_at else None
+    return original or filename, stored_at
+
+@router.api_route("/{filename}", methods=["GET", "HEAD"])
+def serve_upload(filename: str, request: Request, download: bool = False, db: Session = Depends(get_db)):
+    """Serve an uploaded file with range, caching and conditional GET support."""
+    if filename != os.path.basename(filename) or filename.startswith("."):
+        raise HTTPException(status_code=404, detail="File not found")
+    path = os.path.join(config.UPLOAD_FOLDER, filename)
+    try:
+        stat_result = os.stat(path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    original_filename, stored_at = _document_info(db, filename)
+    last_modified = stored_at if stored_at is not None else stat_result.st_mtime
+    etag = _etag_for(filename)
+    headers = {
+        "cache-control": CACHE_CONTROL,
+        "etag": etag,
+        "last-modified": formatdate(last_modified, usegmt=True),
+    }
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
+    return UploadFileResponse(
+        path,
+        headers=headers,
+        stat_result=stat_result,
+        filename=original_filename,
+        content_disposition_type="attachment" if download else "inline",
+    )
@@ -0,0 +1,87 @@
+"""Data generations: one counter per data source, advanced by every committed write.
+
+Caches of derived data key their entries by ``current(source)`` (analytics,
+facets) or subscribe to be told when to rebuild (autocomplete, saved views),
+instead of each tracking writes on its own. Sources are the real
+applications with their status log, the demo applications with theirs, and
+the extracted document texts.
+
+- ORM inserts, updates and deletes are noted by mapper events and advance
+  the generation when the session commits (dropped on rollback). Caches that
+  follow those row writes themselves are not notified.
+- Bulk ORM statements (``Query.update``, ``delete(Application)``) and writes
+  that skip the ORM (the spreadsheet import) have no rows to follow, so they
+  ``bump`` the source: the generation advances and subscribers rebuild.
+"""
+import threading
+from collections import Counter, defaultdict
+from typing import Callable, Dict, List
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.demo_models import DemoApplication, DemoStatusHistory
+from app.models import Application, DocumentText, StatusHistory
+
+APPLICATIONS, DEMO, DOCUMENT_TEXTS = "applications", "demo", "document_texts"
+_SOURCE_OF_CLASS = {
+    Application: APPLICATIONS,
+    StatusHistory: APPLICATIONS,
+    DemoApplication: DEMO,
+    DemoStatusHistory: DEMO,
+    DocumentText: DOCUMENT_TEXTS,
+}
+_WRITTEN_KEY = "generations_written"
+_BULK_KEY = "generations_bulk"
+
+_lock = threading.Lock()
+_generations = Counter()
+_subscribers: Dict[str, List[Callable[[], None]]] = defaultdict(list)
+
+def current(source: str) -> int:
+    return _generations[source]
+
+def subscribe(source: str, callback: Callable[[], None]):
+    """Call ``callback`` after every ``bump`` of ``source``."""
+    _subscribers[source].append(callback)
+
+def _advance(sources):
+    with _lock:
+        for source in sources:
+            _generations[source] += 1
+
+def bump(*sources: str):
+    """Record writes to ``sources`` that the ORM events did not see."""
+    _advance(sources)
+    for source in sources:
+        for callback in _subscribers[source]:
+            callback()
+
+def _note(session: Session, key: str, source: str):
+    session.info.setdefault(key, set()).add(source)
+
+def _note_row_write(mapper, connection, target):
+    session = inspect(target).session
+    if session is not None:
+        _note(session, _WRITTEN_KEY, _SOURCE_OF_CLASS[mapper.class_])
+
+for _model in _SOURCE_OF_CLASS:
+    for _event in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event, _note_row_write)
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_bulk_write(orm_execute_state):
+    mapper = orm_execute_state.bind_mapper
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and mapper is not None and mapper.class_ in _SOURCE_OF_CLASS:
+        _note(orm_execute_state.session, _BULK_KEY, _SOURCE_OF_CLASS[mapper.class_])
+
+@event.listens_for(Session, "after_commit")
+def _advance_on_commit(session):
+    bulk = session.info.pop(_BULK_KEY, set())
+    _advance(session.info.pop(_WRITTEN_KEY, set()) - bulk)
+    bump(*bulk)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_on_rollback(session):
+    session.info.pop(_WRITTEN_KEY, None)
+    session.info.pop(_BULK_KEY, None)
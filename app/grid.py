@@ -0,0 +1,227 @@
+"""Server-side filtering and sorting for the MUI DataGrid.
+
+The grid describes its state as a filter model::
+
+    {"items": [{"field": "company", "operator": "contains", "value": "goo"},
+               {"field": "application_date", "operator": "after", "value": "2025-01-01"}],
+     "logicOperator": "and", "quickFilterValues": ["remote"]}
+
+and a sort model ``[{"field": "application_date", "sort": "desc"}, ...]``.
+Both are compiled to SQLAlchemy expressions, so values are always bound
+parameters. Only the columns in ``GRID_COLUMNS`` can be filtered or sorted
+on, each with the operators of its type; anything else is a ValueError.
+
+Sorting puts NULLs last in either direction (SQLite would put them first
+when ascending), so applications without an ``application_date`` never
+crowd the top of the list. The id is the final tie-breaker, which keeps
+pages stable.
+"""
+import json
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Tuple, Union
+
+from sqlalchemy import Boolean, Date, DateTime, Integer, and_, asc, desc, false, func, or_
+
+from app import statuses
+from app.models import Application
+
+GRID_COLUMNS = {
+    name: getattr(Application, name)
+    for name in [
+        "id", "company", "role", "status", "url", "application_date", "met_with", "notes", "pros", "cons",
+        "salary", "salary_min", "salary_max", "follow_up_required", "order_number", "created_at", "updated_at",
+    ]
+}
+QUICK_FILTER_COLUMNS = ["company", "role", "status", "met_with", "notes"]
+LOGIC_OPERATORS = {"and": and_, "or": or_}
+
+def _parse_json(value: Union[str, dict, list, None], default):
+    if value is None or value == "":
+        return default
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid JSON: {exc.msg}")
+    return value
+
+def _kind(column) -> str:
+    column_type = column.type
+    if isinstance(column_type, Boolean):
+        return "boolean"
+    if isinstance(column_type, DateTime):
+        return "datetime"
+    if isinstance(column_type, Date):
+        return "date"
+    if isinstance(column_type, Integer):
+        return "number"
+    return "string"
+
+def _coerce(kind: str, value: Any):
+    if value is None or value == "":
+        return None
+    if isinstance(value, (dict, list)):
+        raise ValueError(f"Invalid {kind} value: {value!r}")
+    try:
+        if kind == "number":
+            return float(value) if "." in str(value) else int(value)
+        if kind in ("date", "datetime"):
+            return date.fromisoformat(str(value)[:10])
+        if kind == "boolean":
+            if isinstance(value, bool):
+                return value
+            return {"true": True, "false": False}[str(value).lower()]
+    except (KeyError, ValueError):
+        raise ValueError(f"Invalid {kind} value: {value!r}")
+    return str(value)
+
+def _day_bounds(column, day: date):
+    if _kind(column) == "datetime":
+        return datetime.combine(day, time.min), datetime.combine(day + timedelta(days=1), time.min)
+    return day, day + timedelta(days=1)
+
+def _string_condition(column, operator: str, value):
+    conditions = {
+        "contains": lambda: column.icontains(value, autoescape=True),
+        "doesNotContain": lambda: or_(column.is_(None), ~column.icontains(value, autoescape=True)),
+        "equals": lambda: func.lower(column) == value.lower(),
+        "doesNotEqual": lambda: or_(column.is_(None), func.lower(column) != value.lower()),
+        "startsWith": lambda: column.istartswith(value, autoescape=True),
+        "endsWith": lambda: column.iendswith(value, autoescape=True),
+    }
+    return conditions[operator]()
+
+def _status_condition(operator: str, value):
+    # Exact status comparisons use the indexed integer id
+    if operator in ("is", "equals", "not", "doesNotEqual"):
+        status_id = statuses.id_for(value)
+        match = Application.status_id == status_id if status_id is not None else false()
+        return match if operator in ("is", "equals") else ~match
+    if operator == "isAnyOf":
+        ids = [status_id for status_id in map(statuses.id_for, value) if status_id is not None]
+        return Application.status_id.in_(ids)
+    return _string_condition(Application.status, operator, value)
+
+def _date_condition(column, operator: str, day: date):
+    start, end = _day_bounds(column, day)
+    conditions = {
+        "is": lambda: and_(column >= start, column < end),
+        "not": lambda: or_(column < start, column >= end),
+        "after": lambda: column >= end,
+        "onOrAfter": lambda: column >= start,
+        "before": lambda: column < start,
+        "onOrBefore": lambda: column < end,
+    }
+    return conditions[operator]()
+
+def _number_condition(column, operator: str, value):
+    conditions = {
+        "=": lambda: column == value,
+        "!=": lambda: or_(column.is_(None), column != value),
+        ">": lambda: column > value,
+        ">=": lambda: column >= value,
+        "<": lambda: column < value,
+        "<=": lambda: column <= value,
+    }
+    return conditions[operator]()
+
+OPERATORS = {
+    "string": {"contains", "doesNotContain", "equals", "doesNotEqual", "startsWith", "endsWith", "isAnyOf"},
+    "date": {"is", "not", "after", "onOrAfter", "before", "onOrBefore"},
+    "number": {"=", "!=", ">", ">=", "<", "<=", "isAnyOf"},
+    "boolean": {"is"},
+}
+OPERATORS["datetime"] = OPERATORS["date"]
+_EMPTINESS = {"isEmpty", "isNotEmpty"}
+
+def item_condition(item: Dict[str, Any]):
+    """The SQL condition of one filter item, or None when the item has no value yet (as in the grid)."""
+    if not isinstance(item, dict):
+        raise ValueError(f"Filter items must be objects, got {item!r}")
+    field = item.get("field")
+    operator = item.get("operator")
+    if not isinstance(field, str) or field not in GRID_COLUMNS:
+        raise ValueError(f"Cannot filter on {field!r}")
+    column = GRID_COLUMNS[field]
+    kind = _kind(column)
+    if not isinstance(operator, str):
+        raise ValueError(f"Invalid operator {operator!r}")
+    if operator in _EMPTINESS:
+        empty = column.is_(None) if kind != "string" else or_(column.is_(None), column == "")
+        return empty if operator == "isEmpty" else ~empty
+    if operator not in OPERATORS[kind] and not (field == "status" and operator in ("is", "not")):
+        raise ValueError(f"Operator {operator!r} is not supported for {field!r}")
+    raw = item.get("value")
+    if operator == "isAnyOf":
+        if raw is not None and not isinstance(raw, list):
+            raise ValueError(f"isAnyOf needs a list of values, got {raw!r}")
+        values = [_coerce(kind, value) for value in (raw or [])]
+        values = [value for value in values if value is not None]
+        if not values:
+            return None
+        return _status_condition(operator, values) if field == "status" else column.in_(values)
+    value = _coerce(kind, raw)
+    if value is None:
+        return None
+    if field == "status":
+        return _status_condition(operator, value)
+    if kind == "string":
+        return _string_condition(column, operator, value)
+    if kind in ("date", "datetime"):
+        return _date_condition(column, operator, value)
+    if kind == "boolean":
+        return column == value
+    return _number_condition(column, operator, value)
+
+def filter_condition(filter_model: Union[str, dict, None]):
+    """Compile a DataGrid filter model into one SQL condition (or None for no filtering)."""
+    model = _parse_json(filter_model, {})
+    if not isinstance(model, dict):
+        raise ValueError("The filter model must be an object")
+    logic = LOGIC_OPERATORS.get(str(model.get("logicOperator", "and")).lower())
+    if logic is None:
+        raise ValueError(f"Unknown logic operator {model.get('logicOperator')!r}")
+    items = model.get("items") or []
+    words = model.get("quickFilterValues") or []
+    if not isinstance(items, list) or not isinstance(words, list):
+        raise ValueError("items and quickFilterValues must be lists")
+    conditions = [condition for condition in map(item_condition, items) if condition is not None]
+    combined = [logic(*conditions)] if conditions else []
+    # Every quick filter word must appear in at least one of the text columns
+    for word in words:
+        if word:
+            combined.append(or_(*[GRID_COLUMNS[name].icontains(str(word), autoescape=True)
+                                  for name in QUICK_FILTER_COLUMNS]))
+    return and_(*combined) if combined else None
+
+def sort_columns(sort_model: Union[str, list, None]) -> List[Tuple[Any, bool]]:
+    """``(column, descending)`` pairs of a DataGrid sort model."""
+    model = _parse_json(sort_model, [])
+    if not isinstance(model, list):
+        raise ValueError("The sort model must be a list")
+    columns = []
+    for entry in model:
+        if not isinstance(entry, dict):
+            raise ValueError(f"Sort entries must be objects, got {entry!r}")
+        field = entry.get("field")
+        if not isinstance(field, str) or field not in GRID_COLUMNS:
+            raise ValueError(f"Cannot sort on {field!r}")
+        direction = entry.get("sort") or "asc"
+        if direction not in ("asc", "desc"):
+            raise ValueError(f"Unknown sort direction {direction!r}")
+        columns.append((GRID_COLUMNS[field], direction == "desc"))
+    return columns
+
+def sort_clauses(sort_model: Union[str, list, None]) -> List:
+    """ORDER BY clauses for a DataGrid sort model, NULLs last, then id."""
+    clauses = []
+    for column, descending in sort_columns(sort_model):
+        clauses += [column.is_(None), desc(column) if descending else asc(column)]
+    return clauses + [asc(Application.id)]
+
+def apply(query, filter_model=None, sort_model=None):
+    """Apply a DataGrid filter and sort model to an applications query."""
+    condition = filter_condition(filter_model)
+    if condition is not None:
+        query = query.filter(condition)
+    return query.order_by(None).order_by(*sort_clauses(sort_model))
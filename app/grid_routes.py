@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app import crud, grid, schemas
+from app.export_routes import list_filters
+
+router = APIRouter(tags=["applications"])
+
+@router.get("/applications/grid", response_model=schemas.GridPage)
+def grid_page(
+    filter_model: str = None,  # DataGrid filter model as JSON
+    sort_model: str = None,  # DataGrid sort model as JSON
+    page: int = Query(0, ge=0),
+    page_size: int = Query(100, ge=1, le=1000),
+    filters: dict = Depends(list_filters),
+    db: Session = Depends(get_db),
+):
+    """One page of applications for a server-side DataGrid, with the total row count."""
+    filters["sort_by"] = None
+    try:
+        query = grid.apply(crud.filtered_applications_query(db, **filters), filter_model, sort_model)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    total = query.order_by(None).count()
+    rows = query.offset(page * page_size).limit(page_size).all()
+    return schemas.GridPage(rows=rows, total=total)
@@ -0,0 +1,186 @@
+"""Status history of applications and the application funnel.
+
+Every status an application takes is appended to ``status_history`` in the
+same transaction as the write: mapper events cover ORM creates and updates
+(``crud.create_application``, ``crud.update_application``), and the
+spreadsheet import calls ``record_changes`` for its bulk writes.
+
+The funnel follows applications through ``FUNNEL_STAGES``. Each application
+stores the furthest stage it ever reached (``funnel_stage``); a status
+past a stage implies the stage (an offer implies an application), so
+"Rejected" counts as Applied and "Declined Offer" as Offer. ``funnel_counts``
+holds one counter per stage and is moved by the same writes — a status
+change bumps the stages newly reached, a delete takes the application back
+out (bulk ORM deletes included) — so reading the funnel never scans
+applications. The log is append-only: a deleted application's history
+stays, and ``applications.id`` is AUTOINCREMENT so its id is never reused.
+Bulk ORM status updates (``Query.update``, ``update(Application)``) are
+logged too, by reading the statuses before and after the statement.
+"""
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, event, insert, inspect, select, text, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app import statuses
+from app.models import Application, FunnelCount, StatusHistory
+
+logger = logging.getLogger(__name__)
+
+FUNNEL_STAGES = ["Applied", "Interviewing", "Offer", "Accepted"]
+# Status name -> funnel stage it implies (1-based); other statuses imply none
+STAGE_OF_STATUS = {
+    "Applied": 1,
+    "Applied / No Longer Listed": 1,
+    "Rejected": 1,
+    "Interviewing": 2,
+    "Offer": 3,
+    "Declined Offer": 3,
+    "Accepted": 4,
+}
+
+# (application id, old status, new status, old funnel stage)
+StatusChange = Tuple[int, Optional[str], str, int]
+
+@dataclass
+class FunnelStage:
+    stage: str
+    reached: int
+    conversion: Optional[float]  # share of the previous stage that reached this one
+
+def stage_for(status: Optional[str]) -> int:
+    return STAGE_OF_STATUS.get(status, 0)
+
+def seed(conn: Connection):
+    """Make sure every funnel stage has a counter row."""
+    conn.execute(
+        text("INSERT INTO funnel_counts (stage, count) VALUES (:stage, 0) ON CONFLICT(stage) DO NOTHING"),
+        [{"stage": stage} for stage in range(1, len(FUNNEL_STAGES) + 1)],
+    )
+
+def _add_to_counts(conn: Connection, deltas: Counter):
+    deltas = {stage: delta for stage, delta in deltas.items() if delta}
+    if deltas:
+        conn.execute(
+            update(FunnelCount).where(FunnelCount.stage == bindparam("stage_"))
+            .values(count=FunnelCount.count + bindparam("delta")),
+            [{"stage_": stage, "delta": delta} for stage, delta in deltas.items()],
+        )
+
+def record_changes(conn: Connection, changes: Iterable[StatusChange], timestamp: Optional[datetime] = None):
+    """Append history for status changes and move the funnel counters."""
+    timestamp = timestamp or datetime.utcnow()
+    rows = []
+    deltas = Counter()
+    for application_id, old_status, new_status, old_stage in changes:
+        if old_status == new_status:
+            continue
+        rows.append({
+            "application_id": application_id,
+            "from_status": old_status,
+            "status": new_status,
+            "status_id": statuses.id_for(new_status),
+            "timestamp": timestamp,
+        })
+        for stage in range(old_stage + 1, stage_for(new_status) + 1):
+            deltas[stage] += 1
+    if rows:
+        conn.execute(insert(StatusHistory), rows)
+    _add_to_counts(conn, deltas)
+
+def forget(conn: Connection, rows: Sequence[Tuple[int, Optional[int]]]):
+    """Take ``(id, funnel_stage)`` applications being deleted out of the funnel; their history stays."""
+    deltas = Counter()
+    for _, reached in rows:
+        for stage in range(1, (reached or 0) + 1):
+            deltas[stage] -= 1
+    _add_to_counts(conn, deltas)
+
+def funnel(conn: Connection) -> List[FunnelStage]:
+    counts = dict(conn.execute(select(FunnelCount.stage, FunnelCount.count)).all())
+    result = []
+    previous = None
+    for stage, name in enumerate(FUNNEL_STAGES, start=1):
+        reached = counts.get(stage, 0)
+        conversion = round(reached / previous, 4) if previous else None
+        result.append(FunnelStage(name, reached, conversion))
+        previous = reached
+    return result
+
+def backfill_funnel_stages(conn: Connection):
+    """Set funnel_stage of existing applications from their current status (no history to go on)."""
+    whens = " ".join(f"WHEN :status_{i} THEN {stage}" for i, stage in enumerate(STAGE_OF_STATUS.values()))
+    params = {f"status_{i}": name for i, name in enumerate(STAGE_OF_STATUS)}
+    conn.execute(text(f"UPDATE applications SET funnel_stage = CASE status {whens} ELSE 0 END"), params)
+
+def rebuild_counts(conn: Connection):
+    """Recount funnel_counts from applications.funnel_stage."""
+    seed(conn)
+    conn.execute(text("UPDATE funnel_counts SET count = "
+                      "(SELECT count(*) FROM applications WHERE funnel_stage >= funnel_counts.stage)"))
+
+def backfill_history(conn: Connection):
+    """Give existing applications a first history entry: their current status, as of their creation."""
+    conn.execute(text(
+        "INSERT INTO status_history (application_id, from_status, status, status_id, timestamp) "
+        "SELECT id, NULL, status, status_id, coalesce(created_at, CURRENT_TIMESTAMP) FROM applications"
+    ))
+    logger.info("Backfilled status history for existing applications")
+
+@event.listens_for(Application, "before_insert")
+def _set_initial_stage(mapper, connection, target):
+    target.funnel_stage = stage_for(target.status)
+
+@event.listens_for(Application, "after_insert")
+def _record_initial_status(mapper, connection, target):
+    record_changes(connection, [(target.id, None, target.status, 0)])
+
+@event.listens_for(Application, "before_update")
+def _record_status_change(mapper, connection, target):
+    history = inspect(target).attrs.status.history
+    if not history.has_changes() or not history.deleted:
+        return
+    old_stage = target.funnel_stage or 0
+    record_changes(connection, [(target.id, history.deleted[0], target.status, old_stage)])
+    target.funnel_stage = max(old_stage, stage_for(target.status))
+
+@event.listens_for(Application, "before_delete")
+def _forget_deleted(mapper, connection, target):
+    forget(connection, [(target.id, target.funnel_stage)])
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_writes(orm_execute_state):
+    # Query.update()/delete() and update()/delete(Application) skip the mapper events
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return None
+    if orm_execute_state.bind_mapper is not inspect(Application):
+        return None
+    session = orm_execute_state.session
+    query = select(Application.id, Application.status, Application.funnel_stage)
+    if orm_execute_state.statement.whereclause is not None:
+        query = query.where(orm_execute_state.statement.whereclause)
+    before = session.execute(query).all()
+    conn = session.connection()
+    if orm_execute_state.is_delete:
+        forget(conn, [(row.id, row.funnel_stage) for row in before])
+        return None
+    result = orm_execute_state.invoke_statement()
+    ids = [row.id for row in before]
+    after = {}
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        after.update(session.execute(select(Application.id, Application.status).where(Application.id.in_(chunk))).all())
+    changes = [(row.id, row.status, after[row.id], row.funnel_stage or 0)
+               for row in before if row.id in after and after[row.id] != row.status]
+    record_changes(conn, changes)
+    stages = [{"row_id": app_id, "stage": max(old_stage, stage_for(new_status))}
+              for app_id, _, new_status, old_stage in changes if stage_for(new_status) > old_stage]
+    if stages:
+        conn.execute(update(Application.__table__).where(Application.__table__.c.id == bindparam("row_id"))
+                     .values(funnel_stage=bindparam("stage")), stages)
+    return result
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import List
+from app.database import get_db
+from app import crud, models, schemas
+
+router = APIRouter(tags=["history"])
+
+@router.get("/applications/{app_id}/history", response_model=List[schemas.StatusHistoryEntry])
+def status_history(app_id: int, db: Session = Depends(get_db)):
+    """Status changes of an application, oldest first (the Logs section of the detail modal).
+
+    The log outlives the application, so a deleted application still has one.
+    """
+    entries = (
+        db.query(models.StatusHistory)
+        .filter(models.StatusHistory.application_id == app_id)
+        .order_by(models.StatusHistory.timestamp, models.StatusHistory.id)
+        .all()
+    )
+    if not entries and crud.get_application(db, application_id=app_id) is None:
+        raise HTTPException(status_code=404, detail="Application not found")
+    return entries
@@ -0,0 +1,71 @@
+"""Spreadsheet import over HTTP.
+
+``POST /imports`` stages the uploaded .xlsx/.csv in ``config.IMPORT_FOLDER``
+and queues an ``import_spreadsheet`` job (see app/upload_spreadsheet.py), so
+parsing and inserting happen off the request thread. Poll
+``GET /imports/{job_id}`` for rows parsed, inserted and rejected, and for the
+per-row error and warning report.
+"""
+import json
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from sqlalchemy.orm import Session
+
+from app import config, jobs, models, schemas, uploads
+from app import upload_spreadsheet  # also registers the import_spreadsheet job handler
+from app.database import get_db
+
+router = APIRouter(prefix="/imports", tags=["imports"])
+
+os.makedirs(config.IMPORT_FOLDER, exist_ok=True)
+
+def _import_status(job: models.BackgroundJob) -> schemas.ImportStatus:
+    payload = json.loads(job.payload or "{}")
+    result = json.loads(job.result) if job.result else {}
+    return schemas.ImportStatus(
+        job_id=job.id,
+        status=job.status,
+        filename=payload.get("filename"),
+        key=payload.get("key"),
+        error=job.error,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+        **{key: result[key] for key in ("parsed", "inserted", "updated", "unchanged", "rejected", "total", "errors", "warnings", "duplicates") if key in result},
+    )
+
+@router.post("", response_model=schemas.ImportStatus, status_code=202)
+async def create_import(
+    file: UploadFile = File(...),
+    sheet_name: str = Form("Sheet1"),
+    key: Optional[str] = Form(None),
+    db: Session = Depends(get_db),
+):
+    """Queue an import of an .xlsx or .csv file (incremental when ``key`` is given)."""
+    key = key or config.IMPORT_KEY
+    try:
+        upload_spreadsheet.parse_key(key)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    stored = await uploads.save_upload(
+        file, config.IMPORT_FOLDER,
+        allowed_extensions=uploads.SPREADSHEET_EXTENSIONS, limit_mb=config.MAX_IMPORT_SIZE_MB,
+        content_addressed=False,
+    )
+    # Imports are not idempotent, so a failed run is reported rather than retried
+    job = jobs.enqueue(db, "import_spreadsheet", {
+        "path": os.path.join(config.IMPORT_FOLDER, stored.stored_name),
+        "filename": stored.original_filename,
+        "sheet_name": sheet_name,
+        "key": key,
+    }, max_attempts=1)
+    return _import_status(job)
+
+@router.get("/{job_id}", response_model=schemas.ImportStatus)
+def read_import(job_id: int, db: Session = Depends(get_db)):
+    """Progress and validation report of an import."""
+    job = jobs.get_job(db, job_id)
+    if job is None or job.kind != "import_spreadsheet":
+        raise HTTPException(status_code=404, detail="Import not found")
+    return _import_status(job)
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.database import get_db
+from app import jobs, models, schemas
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+@router.get("/", response_model=List[schemas.JobStatus])
+def list_jobs(status: Optional[str] = None, kind: Optional[str] = None, limit: int = 50, db: Session = Depends(get_db)):
+    """Most recent background jobs, optionally filtered by status or kind."""
+    query = db.query(models.BackgroundJob)
+    if status:
+        query = query.filter(models.BackgroundJob.status == status)
+    if kind:
+        query = query.filter(models.BackgroundJob.kind == kind)
+    return query.order_by(models.BackgroundJob.id.desc()).limit(limit).all()
+
+@router.get("/{job_id}", response_model=schemas.JobStatus)
+def read_job(job_id: int, db: Session = Depends(get_db)):
+    """Status, progress and result of a background job."""
+    job = jobs.get_job(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -0,0 +1,208 @@
+"""In-process, SQLite-persisted background job queue.
+
+Slow work is recorded as a ``background_jobs`` row with ``enqueue`` and
+executed by a small pool of workers started with the API. The workers run in
+their own thread pool (``JOBTRACKER_JOB_WORKERS`` threads), separate from the
+threadpool that serves sync FastAPI endpoints, so a long import never starves
+request handling.
+
+- Handlers are registered per job kind with ``@handler("kind")`` and are called
+  as ``fn(payload: dict, progress: JobProgress) -> dict | None``.
+- A failing job is retried with exponential backoff up to ``max_attempts``.
+- Jobs are claimed with a single conditional UPDATE, so two workers never run
+  the same job.
+- Jobs left ``running`` by a process that died are put back in the queue at
+  startup, unless that run was their last attempt: those are marked failed,
+  so a job enqueued with ``max_attempts=1`` never runs twice. Otherwise
+  delivery is at-least-once, and handlers should be idempotent.
+- Progress written through ``JobProgress`` is visible at ``GET /jobs/{id}``.
+"""
+import asyncio
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app import config, models
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+_handlers: Dict[str, Callable] = {}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_workers = []
+_wakeup: Optional[asyncio.Event] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def handler(kind: str):
+    """Register ``fn`` as the handler for jobs of ``kind``."""
+    def register(fn):
+        _handlers[kind] = fn
+        return fn
+    return register
+
+class JobProgress:
+    """Progress reporter passed to handlers; writes are throttled to keep the DB quiet."""
+
+    min_interval = 0.5
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self._last_write = 0.0
+
+    def update(self, current: Optional[int] = None, total: Optional[int] = None,
+               message: Optional[str] = None, result: Any = None, force: bool = False):
+        """Record progress; ``result`` stores a partial result visible while the job runs."""
+        now = time.monotonic()
+        if not force and now - self._last_write < self.min_interval:
+            return
+        self._last_write = now
+        values = {}
+        if current is not None:
+            values["progress_current"] = current
+        if total is not None:
+            values["progress_total"] = total
+        if message is not None:
+            values["progress_message"] = message
+        if result is not None:
+            values["result"] = json.dumps(result)
+        if values:
+            _update_job(self.job_id, **values)
+
+def enqueue(db: Session, kind: str, payload: Optional[Dict[str, Any]] = None,
+            max_attempts: Optional[int] = None) -> models.BackgroundJob:
+    """Persist a new job and wake an idle worker. Commits."""
+    if kind not in _handlers:
+        raise ValueError(f"Unknown job kind: {kind}")
+    job = models.BackgroundJob(
+        kind=kind,
+        payload=json.dumps(payload or {}),
+        max_attempts=max_attempts or config.JOB_MAX_ATTEMPTS,
+        run_after=datetime.utcnow(),
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    _wake()
+    logger.info("Enqueued job %s (%s)", job.id, kind)
+    return job
+
+def get_job(db: Session, job_id: int) -> Optional[models.BackgroundJob]:
+    return db.query(models.BackgroundJob).filter(models.BackgroundJob.id == job_id).first()
+
+def _wake():
+    if _loop is not None and _wakeup is not None:
+        _loop.call_soon_threadsafe(_wakeup.set)
+
+def _update_job(job_id: int, **values):
+    with SessionLocal() as db:
+        db.execute(update(models.BackgroundJob).where(models.BackgroundJob.id == job_id).values(**values))
+        db.commit()
+
+def _claim_next():
+    """Atomically move the oldest due job to ``running`` and return it (or None)."""
+    now = datetime.utcnow()
+    Job = models.BackgroundJob
+    next_id = (
+        select(Job.id)
+        .where(Job.status == "queued", Job.run_after <= now)
+        .order_by(Job.run_after, Job.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    with SessionLocal() as db:
+        row = db.execute(
+            update(Job)
+            .where(Job.id == next_id, Job.status == "queued")
+            .values(status="running", attempts=Job.attempts + 1, started_at=now, error=None)
+            .returning(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts)
+        ).first()
+        db.commit()
+    return row
+
+def _run(row):
+    job_id, kind, payload, attempts, max_attempts = row
+    fn = _handlers.get(kind)
+    if fn is None:
+        _update_job(job_id, status="failed", error=f"No handler for job kind {kind!r}", finished_at=datetime.utcnow())
+        return
+    try:
+        result = fn(json.loads(payload), JobProgress(job_id))
+    except Exception as e:
+        if attempts < max_attempts:
+            delay = config.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+            logger.warning("Job %s (%s) failed on attempt %d, retrying in %.0fs: %s", job_id, kind, attempts, delay, e)
+            _update_job(job_id, status="queued", error=str(e), run_after=datetime.utcnow() + timedelta(seconds=delay))
+        else:
+            logger.exception("Job %s (%s) failed after %d attempts", job_id, kind, attempts)
+            _update_job(job_id, status="failed", error=str(e), finished_at=datetime.utcnow())
+        return
+    _update_job(job_id, status="succeeded", result=json.dumps(result), finished_at=datetime.utcnow())
+    logger.info("Job %s (%s) succeeded", job_id, kind)
+
+def recover_interrupted_jobs() -> int:
+    """Requeue jobs that were running when the previous process stopped; fail those out of attempts."""
+    Job = models.BackgroundJob
+    now = datetime.utcnow()
+    with SessionLocal() as db:
+        failed = db.execute(
+            update(Job)
+            .where(Job.status == "running", Job.attempts >= Job.max_attempts)
+            .values(status="failed", error="Interrupted on its last attempt", finished_at=now)
+        ).rowcount
+        count = db.execute(
+            update(Job)
+            .where(Job.status == "running")
+            .values(status="queued", run_after=now)
+        ).rowcount
+        db.commit()
+    if failed:
+        logger.warning("Failed %d interrupted jobs with no attempts left", failed)
+    if count:
+        logger.info("Requeued %d interrupted jobs", count)
+    return count
+
+async def _worker_loop():
+    loop = asyncio.get_running_loop()
+    while True:
+        _wakeup.clear()
+        try:
+            row = await loop.run_in_executor(_executor, _claim_next)
+        except Exception:
+            logger.exception("Failed to claim a job")
+            row = None
+        if row is None:
+            try:
+                await asyncio.wait_for(_wakeup.wait(), config.JOB_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        await loop.run_in_executor(_executor, _run, row)
+
+async def start_workers(concurrency: Optional[int] = None):
+    global _executor, _wakeup, _loop
+    if _workers:
+        return
+    concurrency = concurrency or config.JOB_WORKERS
+    _loop = asyncio.get_running_loop()
+    _wakeup = asyncio.Event()
+    _executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="job-worker")
+    await _loop.run_in_executor(_executor, recover_interrupted_jobs)
+    _workers.extend(asyncio.create_task(_worker_loop()) for _ in range(concurrency))
+    logger.info("Started %d job workers", concurrency)
+
+async def stop_workers():
+    global _executor, _wakeup, _loop
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = _wakeup = _loop = None
@@ -0,0 +1,93 @@
+"""Logging setup for the API.
+
+Records are handed to a ``QueueHandler`` on the request path; a ``QueueListener``
+thread does the formatting and the actual stream I/O. Loggers use %-style
+arguments so nothing is formatted unless a record is actually emitted.
+
+Levels come from the environment:
+
+- ``JOBTRACKER_LOG_LEVEL``  - root level (default ``INFO``)
+- ``JOBTRACKER_LOG_LEVELS`` - per-module overrides, e.g. ``app.crud=DEBUG,sqlalchemy.engine=INFO``
+"""
+import copy
+import logging
+import logging.handlers
+import os
+import queue
+
+# Attributes every LogRecord has; anything else was passed through ``extra=``
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener = None
+_handler = None
+
+class StructuredFormatter(logging.Formatter):
+    """``time level logger message key=value ...`` with ``extra=`` fields appended."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = {k: v for k, v in vars(record).items() if k not in _RESERVED_ATTRS}
+        if fields:
+            line += " " + " ".join(f"{key}={value!r}" for key, value in fields.items())
+        return line
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue records with their message merged; the listener thread formats them.
+
+    Like the stock ``prepare``, ``msg % args`` is merged in the caller's thread
+    and the args are dropped, so objects logged as arguments can change (or be
+    freed) afterwards without changing the message, and a traceback is
+    rendered while its frames are still current. Unlike it, the formatter
+    (timestamp, ``extra=`` fields, the final line) runs on the listener thread.
+    """
+
+    _exception_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+def _parse_levels(spec: str):
+    for item in spec.split(","):
+        name, sep, level = item.partition("=")
+        if sep and name.strip() and level.strip():
+            yield name.strip(), level.strip().upper()
+
+def configure_logging():
+    """Route all logging through a background queue listener. Safe to call more than once."""
+    global _listener, _handler
+    if _listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(StructuredFormatter())
+
+    root = logging.getLogger()
+    root.setLevel(os.getenv("JOBTRACKER_LOG_LEVEL", "INFO").upper())
+    _handler = _DeferredQueueHandler(log_queue)
+    root.addHandler(_handler)
+    for name, level in _parse_levels(os.getenv("JOBTRACKER_LOG_LEVELS", "")):
+        logging.getLogger(name).setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+def stop_logging():
+    """Flush the queue, stop the listener thread and detach the queue handler."""
+    global _listener, _handler
+    if _listener is None:
+        return
+    logging.getLogger().removeHandler(_handler)
+    _listener.stop()
+    _listener = _handler = None
@@ -1,17 +1,31 @@
-import os
+import asyncio
 import logging
-from uuid import uuid4
 from typing import List, Optional
-from datetime import date
 
 from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 
-from app import models, crud, schemas, demo_models
+from app import crud, schemas, demo_models, config, uploads, upload_gc, extraction, jobs, migrations, duplicates
 from app.database import engine, SessionLocal
+from app.profiling import ProfilingMiddleware, install_sql_capture
+from app.logging_config import configure_logging, stop_logging
 from app.demo_routes import router as demo_router
+from app.file_routes import router as file_router
+from app.job_routes import router as job_router
+from app.import_routes import router as import_router
+from app.export_routes import router as export_router
+from app.status_routes import router as status_router
+from app.company_routes import router as company_router
+from app.autocomplete_routes import router as autocomplete_router
+from app.duplicate_routes import router as duplicate_router
+from app.facet_routes import router as facet_router
+from app.grid_routes import router as grid_router
+from app.view_routes import router as view_router
+from app.history_routes import router as history_router
+from app.analytics_routes import router as analytics_router
 from app import demo_data
 
 app = FastAPI()
@@ -25,16 +39,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount the uploads directory to serve files statically
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# Opt-in per-request profiling (send the profile header when JOBTRACKER_PROFILING=1)
+if config.PROFILING_ENABLED:
+    install_sql_capture(engine)
+    app.add_middleware(ProfilingMiddleware)
 
-UPLOAD_FOLDER = "uploads"
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+UPLOAD_FOLDER = config.UPLOAD_FOLDER
 
-models.Base.metadata.create_all(bind=engine)
+migrations.upgrade(engine)
+extraction.ensure_search_index(engine)
 
 logger = logging.getLogger(__name__)
 
+# A document_search that SQLite's full-text query parser rejects is the client's mistake
+@app.exception_handler(OperationalError)
+async def database_error_handler(request, exc: OperationalError):
+    if extraction.is_search_syntax_error(exc):
+        logger.warning("Rejected document search: %s", exc.orig)
+        return JSONResponse(status_code=400, content={"detail": "Invalid document search"})
+    logger.error("Database error on %s %s", request.method, request.url.path, exc_info=exc)
+    return JSONResponse(status_code=500, content={"detail": "Internal error"})
+
 # Dependency to get DB session
 def get_db():
     db = SessionLocal()
@@ -43,6 +68,12 @@ def get_db():
     finally:
         db.close()
 
+# The log listener thread lives as long as the app: started before the other
+# startup handlers log anything, stopped after the shutdown handlers
+@app.on_event("startup")
+def start_logging():
+    configure_logging()
+
 # Startup event to initialize demo data
 @app.on_event("startup")
 def startup_event():
@@ -53,6 +84,26 @@ def startup_event():
     demo_data.initialize_demo_data()
     logger.info("Application startup: Demo data initialized")
 
+# Background job workers (extraction, imports, demo resets)
+@app.on_event("startup")
+async def start_job_workers():
+    await jobs.start_workers()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await jobs.stop_workers()
+    extraction.shutdown()
+
+@app.on_event("shutdown")
+def shutdown_logging():
+    stop_logging()
+
+# Periodic cleanup of orphaned uploads (disabled unless an interval is configured)
+@app.on_event("startup")
+async def start_upload_gc():
+    if config.UPLOAD_GC_INTERVAL_MINUTES > 0:
+        asyncio.create_task(upload_gc.run_periodically(config.UPLOAD_GC_INTERVAL_MINUTES))
+
 @app.get("/")
 def read_root():
     """Root endpoint: Returns a welcome message."""
@@ -61,9 +112,46 @@ def read_root():
 # Include demo router
 app.include_router(demo_router)
 
+# Uploaded files (range requests, immutable caching, conditional GET)
+app.include_router(file_router)
+
+# Background job status
+app.include_router(job_router)
+
+# Spreadsheet imports
+app.include_router(import_router)
+
+# CSV / Parquet / Arrow exports (registered before /applications/{app_id})
+app.include_router(export_router)
+
+# Status dictionary
+app.include_router(status_router)
+
+# Companies (normalized names, per-company counts)
+app.include_router(company_router)
+
+# Typeahead for the company and role inputs
+app.include_router(autocomplete_router)
+
+# Likely duplicate applications
+app.include_router(duplicate_router)
+
+# Filter sidebar counts (registered before /applications/{app_id})
+app.include_router(facet_router)
+
+# Server-side DataGrid paging, filtering and sorting (registered before /applications/{app_id})
+app.include_router(grid_router)
+
+# Saved views
+app.include_router(view_router)
+
+# Status history and funnel analytics
+app.include_router(history_router)
+app.include_router(analytics_router)
+
 # --- API Endpoints ---
 
-@app.post("/applications/", response_model=schemas.Application)
+@app.post("/applications/", response_model=schemas.CreatedApplication)
 async def create_application(
     company: str = Form(...),
     role: str = Form(...),
@@ -80,33 +168,22 @@ async def create_application(
     cover_letter_file: Optional[UploadFile] = File(None),
     db: Session = Depends(get_db)
 ):
-    import traceback
     try:
         # Validate required fields
         if not company or not company.strip():
             company = "Untitled Company"
-            logger.warning(f"Empty company name provided, using default: {company}")
+            logger.warning("Empty company name provided, using default: %s", company)
             
         if not role or not role.strip():
             role = "Untitled Role"
-            logger.warning(f"Empty role provided, using default: {role}")
+            logger.warning("Empty role provided, using default: %s", role)
             
         if not status or not status.strip():
             status = "Not Yet Applied"
-            logger.warning(f"Empty status provided, using default: {status}")
+            logger.warning("Empty status provided, using default: %s", status)
             
-        async def save_file(file: UploadFile, folder: str) -> str:
-            if file:
-                filename = f"{uuid4().hex}_{file.filename}"
-                file_path = os.path.join(folder, filename)
-                content = await file.read()
-                with open(file_path, "wb") as f:
-                    f.write(content)
-                return filename
-            return None
-
-        resume_path = await save_file(resume_file, UPLOAD_FOLDER) if resume_file else None
-        cover_letter_path = await save_file(cover_letter_file, UPLOAD_FOLDER) if cover_letter_file else None
+        resume_upload = await uploads.save_upload(resume_file) if resume_file else None
+        cover_letter_upload = await uploads.save_upload(cover_letter_file) if cover_letter_file else None
 
         # Build ApplicationCreate object for CRUD
         app_create = schemas.ApplicationCreate(
@@ -121,14 +198,26 @@ async def create_application(
             cons=cons,
             salary=salary,
             follow_up_required=follow_up_required,
-            resume_file=resume_path,
-            cover_letter_file=cover_letter_path
+            resume_file=resume_upload.stored_name if resume_upload else None,
+            cover_letter_file=cover_letter_upload.stored_name if cover_letter_upload else None
+        )
+        db_app = crud.create_application(
+            db, application=app_create, uploads={"resume": resume_upload, "cover_letter": cover_letter_upload},
         )
-        db_app = crud.create_application(db, application=app_create)
-        return db_app
+        extraction.schedule(db, resume_upload, cover_letter_upload)
+        created = schemas.CreatedApplication.model_validate(db_app)
+        matches = duplicates.find_duplicates(db.connection(), db_app.company, db_app.role, db_app.url, exclude_id=db_app.id)
+        if matches:
+            logger.info("Application %d resembles %s", db_app.id, [match.id for match in matches])
+        created.possible_duplicates = [schemas.DuplicateMatch.model_validate(match) for match in matches]
+        return created
+    except HTTPException:
+        raise
+    except ValueError as ve:
+        logger.warning("Validation error creating application: %s", ve)
+        raise HTTPException(status_code=422, detail=str(ve))
     except Exception as e:
-        print("[DEBUG] Exception in POST /applications/:", str(e))
-        traceback.print_exc()
+        logger.exception("Failed to create application")
         raise HTTPException(status_code=422, detail=str(e))
 
 @app.get("/applications/", response_model=List[schemas.Application])
@@ -137,19 +226,29 @@ def list_applications(
     limit: int = 1000,  # Return up to 1000 records by default
     search: str = None,
     status: str = None,
+    company_id: Optional[int] = None,  # See GET /companies
+    url: Optional[str] = None,  # Exact posting URL match, ignoring tracking parameters, www. etc.
     follow_up_required: bool = None,
     missing_date: bool = None,
-    sort_by: str = "created_at",
+    salary_min: Optional[int] = None,  # Parsed annual salary range bounds
+    salary_max: Optional[int] = None,
+    sort_by: str = "created_at",  # Any column, or "salary" for numeric salary order
     sort_order: str = "asc",
+    document_search: str = None,  # Full-text search over resume/cover letter contents
     db: Session = Depends(get_db),
 ) -> List[schemas.Application]:
     """List job applications with advanced filtering, searching, and sorting."""
     return crud.get_filtered_applications(
         db=db,
         search=search,
+        document_search=document_search,
         status=status,
+        company_id=company_id,
+        url=url,
         follow_up_required=follow_up_required,
         missing_date=missing_date,
+        salary_min=salary_min,
+        salary_max=salary_max,
         sort_by=sort_by,
         sort_order=sort_order,
         skip=skip,
@@ -189,48 +288,12 @@ async def update_application(
         if existing_app is None:
             raise HTTPException(status_code=404, detail="Application not found")
 
-        # Log received data for debugging
-        logger.info(f"Received form data for update: company={company}, role={role}, status={status}, follow_up_required={follow_up_required}")
-        
-        async def save_file(file: UploadFile, folder: str, existing_path: str) -> str:
-            if file:
-                # Delete existing file if it exists
-                if existing_path and os.path.exists(existing_path):
-                    try:
-                        os.remove(existing_path)
-                    except Exception as e:
-                        logger.warning(f"Failed to delete old file {existing_path}: {e}")
-                
-                filename = f"{uuid4().hex}_{file.filename}"
-                file_path = os.path.join(folder, filename)
-                content = await file.read()
-                with open(file_path, "wb") as f:
-                    f.write(content)
-                return file_path
-            return existing_path  # Keep existing path if no new file
-
-        # Handle file updates
-        resume_path = await save_file(resume_file, UPLOAD_FOLDER, existing_app.resume_file) if resume_file else existing_app.resume_file
-        cover_letter_path = await save_file(cover_letter_file, UPLOAD_FOLDER, existing_app.cover_letter_file) if cover_letter_file else existing_app.cover_letter_file
-
-        # Debug logging
-        update_data = {
-            'company': company,
-            'role': role,
-            'status': status,
-            'url': url,
-            'application_date': application_date,
-            'met_with': met_with,
-            'notes': notes,
-            'pros': pros,
-            'cons': cons,
-            'salary': salary,
-            'follow_up_required': follow_up_required,
-            'resume_file': resume_path,
-        }
-        logger.info(f"Updating application {app_id} with data: {update_data}")
+        # Handle file updates; the previous blob is released once the update succeeds
+        resume_upload = await uploads.save_upload(resume_file) if resume_file else None
+        cover_letter_upload = await uploads.save_upload(cover_letter_file) if cover_letter_file else None
+        resume_path = resume_upload.stored_name if resume_upload else existing_app.resume_file
+        cover_letter_path = cover_letter_upload.stored_name if cover_letter_upload else existing_app.cover_letter_file
 
-        # Log received form data
         form_data = {
             'company': company,
             'role': role,
@@ -246,28 +309,29 @@ async def update_application(
             'resume_file': resume_path,
             'cover_letter_file': cover_letter_path
         }
-        logger.info(f"Processing update form data: {form_data}")
+        logger.debug("Processing update form data for application %s: %s", app_id, form_data)
         
         # Build ApplicationUpdate object
         app_update = schemas.ApplicationUpdate(**{
             k: v for k, v in form_data.items() if v is not None
         })
-        
-        # Log the processed update object
-        logger.info(f"Created update object: {app_update.dict()}")
 
-        updated_app = crud.update_application(db, application_id=app_id, application_update=app_update)
+        updated_app = crud.update_application(
+            db, application_id=app_id, application_update=app_update,
+            uploads={"resume": resume_upload, "cover_letter": cover_letter_upload},
+        )
         if updated_app is None:
             raise HTTPException(status_code=404, detail="Application not found")
+        extraction.schedule(db, resume_upload, cover_letter_upload)
         return updated_app
         
+    except HTTPException:
+        raise
     except ValueError as ve:
-        logger.error(f"Validation error updating application {app_id}: {ve}")
+        logger.warning("Validation error updating application %s: %s", app_id, ve)
         raise HTTPException(status_code=422, detail=str(ve))
     except Exception as e:
-        logger.error(f"Error updating application {app_id}: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.exception("Error updating application %s", app_id)
         raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
 
 @app.patch("/applications/{app_id}", response_model=schemas.Application)
@@ -277,9 +341,13 @@ async def patch_application(
     db: Session = Depends(get_db)
 ):
     """Update application data fields (excluding files)."""
-    logger.info(f"PATCH request for application {app_id} with data: {data}")
+    logger.debug("PATCH request for application %s with data: %s", app_id, data)
     
-    db_app = crud.update_application(db, app_id, data)
+    try:
+        db_app = crud.update_application(db, app_id, data)
+    except ValueError as ve:
+        logger.warning("Validation error patching application %s: %s", app_id, ve)
+        raise HTTPException(status_code=422, detail=str(ve))
     if not db_app:
         raise HTTPException(status_code=404, detail="Application not found")
     
@@ -0,0 +1,150 @@
+"""Additive schema upgrades for existing databases.
+
+``create_all`` creates missing tables but leaves existing ones alone, so a
+database created by an older version would lack newer columns and indexes.
+``upgrade`` adds them in place: every model column missing from its table is
+added with ``ALTER TABLE ... ADD COLUMN`` (as nullable, without a server
+default), and every declared index is created if absent. A column that
+needs existing rows filled in has an entry in ``BACKFILLS``, which runs once,
+in the same transaction that adds the column. A new table derived from
+existing rows is filled by its entry in ``TABLE_BACKFILLS`` when it is created.
+
+The one non-additive step is ``ensure_autoincrement``: SQLite cannot add
+AUTOINCREMENT to an existing table, so ``applications`` is rebuilt with it
+(copy, drop, rename) so that deleted ids are never handed out again.
+"""
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, inspect, select, text, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateTable
+
+from app import companies, duplicates, history, statuses
+from app.database import Base
+from app.salary import parse_salary
+from app.urls import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_ROWS = 1000
+
+def _backfill_derived(conn: Connection, source: str, derive: Callable[[str], Optional[dict]]):
+    """Set columns derived from ``applications.<source>`` in id order, one batch of rows at a time.
+
+    ``derive`` maps a non-null source value to the column values, or None to leave the row alone.
+    """
+    applications = Base.metadata.tables["applications"]
+    source_column = applications.c[source]
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(applications.c.id, source_column)
+            .where(applications.c.id > last_id, source_column.isnot(None))
+            .order_by(applications.c.id)
+            .limit(BACKFILL_BATCH_ROWS)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        params = []
+        for row_id, value in rows:
+            values = derive(value)
+            if values:
+                params.append({"row_id": row_id, **values})
+        if params:
+            statement = update(applications).where(applications.c.id == bindparam("row_id"))
+            conn.execute(statement.values({name: bindparam(name) for name in params[0] if name != "row_id"}), params)
+
+def _salary_range(salary: str) -> Optional[dict]:
+    low, high = parse_salary(salary)
+    return {"salary_min": low, "salary_max": high} if low is not None else None
+
+def _canonical_url(url: str) -> Optional[dict]:
+    canonical = canonicalize_url(url)
+    return {"canonical_url": canonical} if canonical else None
+
+# (table, column) -> function filling the column for existing rows
+BACKFILLS: Dict[Tuple[str, str], Callable[[Connection], None]] = {
+    ("applications", "salary_min"): lambda conn: _backfill_derived(conn, "salary", _salary_range),
+    ("applications", "canonical_url"): lambda conn: _backfill_derived(conn, "url", _canonical_url),
+    ("applications", "funnel_stage"): history.backfill_funnel_stages,
+    ("applications", "status_id"): lambda conn: statuses.backfill_status_ids(conn, "applications"),
+    ("applications", "company_id"): companies.backfill_company_ids,
+    ("demo_applications", "status_id"): lambda conn: statuses.backfill_status_ids(conn, "demo_applications"),
+}
+
+# table -> function filling a newly created table from existing rows
+TABLE_BACKFILLS: Dict[str, Callable[[Connection], None]] = {
+    "application_signatures": duplicates.backfill_signatures,
+    "status_history": history.backfill_history,
+    "funnel_counts": history.rebuild_counts,
+}
+
+def add_missing_columns(conn: Connection) -> List[Tuple[str, str]]:
+    inspector = inspect(conn)
+    added = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'))
+            added.append((table.name, column.name))
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+    return added
+
+def ensure_autoincrement(conn: Connection, table_name: str = "applications") -> bool:
+    """Rebuild ``table_name`` with AUTOINCREMENT if it was created without it.
+
+    The id sequence starts above every id ever used, including ids of deleted
+    applications still referenced by ``status_history``.
+    """
+    table = Base.metadata.tables[table_name]
+    sql = conn.execute(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                       {"name": table_name}).scalar()
+    if sql is None or "AUTOINCREMENT" in sql.upper():
+        return False
+    existing = [column["name"] for column in inspect(conn).get_columns(table_name)]
+    if set(existing) - set(table.columns.keys()):
+        logger.warning("Not rebuilding %s with AUTOINCREMENT: it has columns the model does not", table_name)
+        return False
+    columns = ", ".join(f'"{name}"' for name in existing)
+    create = str(CreateTable(table).compile(dialect=conn.dialect))
+    conn.execute(text(create.replace(f"CREATE TABLE {table_name} ", f"CREATE TABLE {table_name}_new ", 1)))
+    conn.execute(text(f'INSERT INTO "{table_name}_new" ({columns}) SELECT {columns} FROM "{table_name}"'))
+    conn.execute(text(f'DROP TABLE "{table_name}"'))
+    conn.execute(text(f'ALTER TABLE "{table_name}_new" RENAME TO "{table_name}"'))
+    for index in table.indexes:
+        index.create(conn, checkfirst=True)
+    last_id = conn.execute(text(
+        f'SELECT max(coalesce((SELECT max(id) FROM "{table_name}"), 0), '
+        "coalesce((SELECT max(application_id) FROM status_history), 0))"
+    )).scalar()
+    conn.execute(text("DELETE FROM sqlite_sequence WHERE name = :name"), {"name": table_name})
+    conn.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES (:name, :seq)"),
+                 {"name": table_name, "seq": last_id})
+    logger.info("Rebuilt %s with AUTOINCREMENT", table_name)
+    return True
+
+def upgrade(engine: Engine):
+    """Bring an existing database up to the current models. Safe to run repeatedly."""
+    existing_tables = set(inspect(engine).get_table_names())
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        statuses.seed(conn)
+        history.seed(conn)
+        added = add_missing_columns(conn)
+        for key in added:
+            if key in BACKFILLS:
+                BACKFILLS[key](conn)
+        for table, backfill in TABLE_BACKFILLS.items():
+            if table not in existing_tables:
+                backfill(conn)
+        ensure_autoincrement(conn)
+    if added:
+        logger.info("Added columns: %s", ", ".join(f"{table}.{column}" for table, column in added))
@@ -1,7 +1,10 @@
-from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, func
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Index, event, func, inspect
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
 from app.database import Base
+from app import companies, statuses
+from app.salary import parse_salary
+from app.urls import canonicalize_url
 
 class Job(Base):
     __tablename__ = "jobs"
@@ -12,6 +15,24 @@ class Job(Base):
     location = Column(String, index=True)
     # Add other fields as necessary
 
+class Status(Base):
+    """Status dictionary entry (see app/statuses.py)."""
+    __tablename__ = "statuses"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False, unique=True)
+    color = Column(String, nullable=False, default="#9966FF")
+    sort_order = Column(Integer, nullable=False, default=0)
+
+class Company(Base):
+    """Company entity; applications point at it through company_id (see app/companies.py)."""
+    __tablename__ = "companies"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    normalized_name = Column(String, nullable=False, unique=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
 class Application(Base):
     __tablename__ = "applications"
 
@@ -36,5 +57,164 @@ class Application(Base):
     salary = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Natural key and content hash of the spreadsheet row this application was imported from
+    import_key = Column(String, nullable=True)
+    import_fingerprint = Column(String, nullable=True)
+    # Annual range parsed from the free-text salary (see app/salary.py)
+    salary_min = Column(Integer, nullable=True)
+    salary_max = Column(Integer, nullable=True)
+    status_id = Column(Integer, ForeignKey("statuses.id"), nullable=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=True)
+    # url without tracking parameters, www., trailing slash etc. (see app/urls.py)
+    canonical_url = Column(String, nullable=True)
+    # Furthest funnel stage ever reached, 0 = none (see app/history.py)
+    funnel_stage = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_applications_import_key", "import_key", unique=True),
+        Index("ix_applications_salary_min", "salary_min"),
+        Index("ix_applications_salary_max", "salary_max"),
+        Index("ix_applications_status_id", "status_id"),
+        Index("ix_applications_company_id", "company_id"),
+        Index("ix_applications_canonical_url", "canonical_url"),
+        # Ids are never handed out again, so status_history outlives deleted applications
+        {"sqlite_autoincrement": True},
+    )
+
+    @validates("status")
+    def _resolve_status(self, key, value):
+        status = statuses.resolve(value)
+        self.status_id = status.id
+        return status.name
+
+    @validates("salary")
+    def _parse_salary(self, key, value):
+        self.salary_min, self.salary_max = parse_salary(value)
+        return value
+
+    @validates("url")
+    def _canonicalize_url(self, key, value):
+        self.canonical_url = canonicalize_url(value)
+        return value
+
+@event.listens_for(Application, "before_insert")
+def _resolve_company_on_insert(mapper, connection, target):
+    target.company_id = companies.resolve_id(connection, target.company)
+
+@event.listens_for(Application, "before_update")
+def _resolve_company_on_update(mapper, connection, target):
+    if inspect(target).attrs.company.history.has_changes():
+        target.company_id = companies.resolve_id(connection, target.company)
 
 # Demo models moved to demo_models.py for better isolation
+
+class ApplicationSignature(Base):
+    """One MinHash band (or canonical URL) key of an application; see app/duplicates.py."""
+    __tablename__ = "application_signatures"
+    __table_args__ = (
+        Index("ix_application_signatures_key", "key", "application_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    application_id = Column(Integer, ForeignKey("applications.id"), nullable=False, index=True)
+    key = Column(Integer, nullable=False)
+
+class Document(Base):
+    """A stored upload blob, keyed by the SHA-256 of its content and shared by every application that uses it."""
+    __tablename__ = "documents"
+
+    id = Column(Integer, primary_key=True, index=True)
+    sha256 = Column(String(64), nullable=False, unique=True, index=True)
+    stored_name = Column(String, nullable=False)
+    size = Column(Integer, nullable=False)
+    mime_type = Column(String, nullable=True)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    # Last time the content was uploaded, deduplicated or not; the orphan collector's grace period runs from here
+    last_uploaded_at = Column(DateTime, nullable=True)
+
+    links = relationship("ApplicationDocument", back_populates="document")
+
+class ApplicationDocument(Base):
+    """Links a real or demo application's resume/cover letter slot to a Document."""
+    __tablename__ = "application_documents"
+    __table_args__ = (
+        Index("ix_application_documents_owner", "application_table", "application_id", "kind", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    document_id = Column(Integer, ForeignKey("documents.id"), nullable=False, index=True)
+    application_table = Column(String, nullable=False)  # "applications" or "demo_applications"
+    application_id = Column(Integer, nullable=False)
+    kind = Column(String, nullable=False)  # "resume" or "cover_letter"
+    original_filename = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    document = relationship("Document", back_populates="links")
+
+class DocumentText(Base):
+    """Plain text extracted from an uploaded file, keyed by stored filename; indexed by the document_text_fts table."""
+    __tablename__ = "document_texts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    stored_name = Column(String, nullable=False, unique=True, index=True)
+    content = Column(String, nullable=False, default="")
+    error = Column(String, nullable=True)
+    extracted_at = Column(DateTime, default=datetime.utcnow)
+
+class StatusHistory(Base):
+    """Append-only log of an application's status changes; the first entry has no from_status."""
+    __tablename__ = "status_history"
+    __table_args__ = (
+        Index("ix_status_history_application", "application_id", "timestamp"),
+        Index("ix_status_history_status", "status_id", "timestamp"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    application_id = Column(Integer, nullable=False)  # kept after the application is deleted
+    from_status = Column(String, nullable=True)
+    status = Column(String, nullable=False)
+    status_id = Column(Integer, ForeignKey("statuses.id"), nullable=True)
+    timestamp = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+class FunnelCount(Base):
+    """How many applications have reached each funnel stage; updated incrementally by app/history.py."""
+    __tablename__ = "funnel_counts"
+
+    stage = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class SavedView(Base):
+    """A named applications view: list filters plus DataGrid filter and sort models; see app/views.py."""
+    __tablename__ = "saved_views"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False, unique=True)
+    filters = Column(String, nullable=False, default="{}")  # JSON, GET /applications/ filters
+    filter_model = Column(String, nullable=False, default="{}")  # JSON, DataGrid filter model
+    sort_model = Column(String, nullable=False, default="[]")  # JSON, DataGrid sort model
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class BackgroundJob(Base):
+    """A unit of slow work (import, extraction, export, ...) run by the worker pool in app/jobs.py."""
+    __tablename__ = "background_jobs"
+    __table_args__ = (
+        Index("ix_background_jobs_claim", "status", "run_after"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)
+    payload = Column(String, nullable=False, default="{}")  # JSON
+    status = Column(String, nullable=False, default="queued")  # queued, running, succeeded, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)
+    progress_current = Column(Integer, nullable=True)
+    progress_total = Column(Integer, nullable=True)
+    progress_message = Column(String, nullable=True)
+    result = Column(String, nullable=True)  # JSON
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
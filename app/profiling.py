@@ -0,0 +1,144 @@
+"""Opt-in per-request profiling.
+
+When ``JOBTRACKER_PROFILING`` is enabled, a request carrying the profile header
+(``X-Profile`` by default) is run under a sampling profiler. Two artifacts are
+written to ``PROFILES_DIR`` and the profile id is returned in the
+``X-Profile-Id`` response header:
+
+- ``<id>.folded``  - collapsed stacks, one ``frame;frame;frame count`` per line,
+  ready for flamegraph.pl / speedscope
+- ``<id>.sql.log`` - every SQL statement the request executed, with timings
+
+The profile covers the whole response, including a streamed body (the CSV
+export, for one), and the artifacts are written once the last chunk is sent.
+The sampler walks every thread in the process (sync endpoints run in the
+threadpool, not on the event loop), so profile one request at a time.
+"""
+import contextvars
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import event
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from app import config
+
+logger = logging.getLogger(__name__)
+
+# SQL statements executed by the current profiled request (None when not profiling)
+_sql_log = contextvars.ContextVar("profile_sql_log", default=None)
+
+# Leaf frames in these modules mean the thread is parked, not doing work
+_IDLE_MODULES = ("threading.py", "selectors.py", "queue.py", "base_events.py")
+
+class StackSampler(threading.Thread):
+    """Background thread that periodically records the stack of every other thread."""
+
+    def __init__(self, interval: float):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.samples = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == self.ident:
+                    continue
+                if frame.f_code.co_filename.endswith(_IDLE_MODULES):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+def install_sql_capture(engine):
+    """Attach statement timing hooks that feed the active request's SQL log."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _sql_log.get() is not None:
+            conn.info.setdefault("profile_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        entries = _sql_log.get()
+        if entries is None:
+            return
+        started = conn.info["profile_query_start"].pop()
+        entries.append((time.perf_counter() - started, statement, parameters))
+
+def _profile_id(request: Request) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", request.url.path).strip("-") or "root"
+    timestamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    return f"{timestamp}_{request.method}_{slug}_{uuid4().hex[:8]}"
+
+def _write_artifacts(profile_id: str, sampler: StackSampler, statements, elapsed: float):
+    os.makedirs(config.PROFILES_DIR, exist_ok=True)
+    base = os.path.join(config.PROFILES_DIR, profile_id)
+    with open(f"{base}.folded", "w") as f:
+        for stack, count in sampler.samples.most_common():
+            f.write(f"{stack} {count}\n")
+    with open(f"{base}.sql.log", "w") as f:
+        total_sql = sum(duration for duration, _, _ in statements)
+        f.write(f"# request {elapsed * 1000:.1f} ms, {len(statements)} statements, "
+                f"{total_sql * 1000:.1f} ms in SQL\n")
+        for duration, statement, parameters in statements:
+            f.write(f"{duration * 1000:8.2f} ms  {' '.join(statement.split())}  {parameters!r}\n")
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    """Profile requests that carry the configured header; pass all others straight through."""
+
+    async def dispatch(self, request: Request, call_next):
+        header_value = request.headers.get(config.PROFILE_HEADER)
+        if header_value is None or (config.PROFILE_TOKEN and header_value != config.PROFILE_TOKEN):
+            return await call_next(request)
+
+        profile_id = _profile_id(request)
+        statements = []
+        token = _sql_log.set(statements)
+        sampler = StackSampler(config.PROFILE_SAMPLE_INTERVAL)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            response = await call_next(request)
+        except BaseException:
+            sampler.stop()
+            raise
+        finally:
+            # The endpoint's task took its own copy of the context, so its SQL keeps landing in statements
+            _sql_log.reset(token)
+
+        def finish():
+            sampler.stop()
+            elapsed = time.perf_counter() - started
+            _write_artifacts(profile_id, sampler, statements, elapsed)
+            logger.info("Wrote profile %s (%.1f ms, %d SQL statements)", profile_id, elapsed * 1000, len(statements))
+
+        # call_next returns once the headers are ready; keep sampling until the body is sent too
+        body = response.body_iterator
+
+        async def profiled_body():
+            try:
+                async for chunk in body:
+                    yield chunk
+            finally:
+                finish()
+
+        response.body_iterator = profiled_body()
+        response.headers["X-Profile-Id"] = profile_id
+        return response
@@ -0,0 +1,53 @@
+"""Parsing of the free-text ``salary`` field into a numeric annual range.
+
+Handles the shapes found in the data: ``"100000"``, ``"$120k"``,
+``"160000-200000"``, ``"$120k - $140k"``, ``"120-140k"`` (a trailing unit
+applies to both ends), ``"1.2M"`` and hourly rates such as ``"$55/hr"``,
+which are annualized at 2080 hours. Text without a number parses to
+``(None, None)``.
+
+Only the first amount counts, and a second one only when a range separator
+(``-``, ``–``, ``to``) joins the two, so ``"$120k + 10% bonus"`` or
+``"$150k, 401k match"`` parse to their base salary. Percentages and numbers
+followed by a unit (``"2 weeks"``, ``"5 years"``) are not amounts unless
+they carry a currency sign.
+"""
+import re
+from typing import Optional, Tuple
+
+HOURS_PER_YEAR = 2080
+
+_AMOUNT = re.compile(r"(?:([$€£])\s*)?(\d+(?:\.\d+)?)\s*([km])?(?![a-z\d])", re.I)
+_NOT_MONEY = re.compile(r"\s*(?:%|(?:percent|weeks?|wks?|days?|months?|mos?|years?|yrs?|hours?|hrs?)\b)", re.I)
+_RANGE = re.compile(r"\s*(?:-|–|—|\bto\b)\s*", re.I)
+_HOURLY = re.compile(r"/\s*h(?:ou)?r|\bhourly\b|\bper\s+hour\b|/\s*h\b", re.I)
+_MULTIPLIERS = {"k": 1_000, "m": 1_000_000}
+
+def _is_amount(text: str, match: re.Match) -> bool:
+    # Percentages never are; a number followed by another unit only with a currency sign
+    unit = _NOT_MONEY.match(text, match.end())
+    return unit is None or ("%" not in unit.group() and match.group(1) is not None)
+
+def parse_salary(text: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """Return ``(salary_min, salary_max)`` in whole currency units per year."""
+    if not text:
+        return None, None
+    cleaned = str(text).replace(",", "")
+    matches = [match for match in _AMOUNT.finditer(cleaned) if _is_amount(cleaned, match)]
+    if not matches:
+        return None, None
+    amounts = [matches[0]]
+    if len(matches) > 1:
+        separator = _RANGE.match(cleaned, matches[0].end())
+        if separator and separator.end() == matches[1].start():
+            amounts.append(matches[1])
+    # "120-140k": the unit on the last number applies to a bare first number
+    last_unit = amounts[-1].group(3)
+    values = []
+    for match in amounts:
+        unit = (match.group(3) or last_unit or "").lower()
+        values.append(float(match.group(2)) * _MULTIPLIERS.get(unit, 1))
+    if _HOURLY.search(cleaned):
+        values = [value * HOURS_PER_YEAR for value in values]
+    low, high = min(values), max(values)
+    return int(round(low)), int(round(high))
@@ -1,5 +1,6 @@
+import json
 from pydantic import BaseModel, field_validator, Field
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime, date
 
 def normalize_date(date_str: str) -> str:
@@ -86,8 +87,164 @@ class ApplicationMetadata(BaseModel):
 
 class Application(ApplicationCreate):
     id: int
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+    company_id: Optional[int] = None
+    canonical_url: Optional[str] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+class DuplicateMatch(BaseModel):
+    id: int
+    company: str
+    role: str
+    url: Optional[str] = None
+    score: float
+
+    class Config:
+        from_attributes = True
+
+class CreatedApplication(Application):
+    """POST /applications/ response: the new application and stored ones it probably duplicates."""
+    possible_duplicates: List[DuplicateMatch] = []
+
+class JobStatus(BaseModel):
+    id: int
+    kind: str
+    status: str
+    attempts: int
+    max_attempts: int
+    progress_current: Optional[int] = None
+    progress_total: Optional[int] = None
+    progress_message: Optional[str] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @field_validator('result', mode='before')
+    def parse_result(cls, v):
+        return json.loads(v) if isinstance(v, str) else v
+
+    class Config:
+        from_attributes = True
+
+class ImportRowError(BaseModel):
+    row: int
+    column: Optional[str] = None
+    value: Optional[str] = None
+    message: str
+
+class ImportDuplicate(BaseModel):
+    row: int
+    application_id: int
+    score: float
+
+class ImportStatus(BaseModel):
+    job_id: int
+    status: str
+    filename: Optional[str] = None
+    key: Optional[str] = None
+    parsed: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    rejected: int = 0
+    total: Optional[int] = None
+    errors: List[ImportRowError] = []
+    warnings: List[ImportRowError] = []
+    duplicates: List[ImportDuplicate] = []
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+class StatusEntry(BaseModel):
+    id: int
+    name: str
+    color: str
+    sort_order: int
+
+class GridPage(BaseModel):
+    rows: List[Application]
+    total: int
+
+class SavedViewCreate(BaseModel):
+    name: str
+    filters: Dict[str, Any] = {}  # GET /applications/ filters, e.g. {"status": "Interviewing"}
+    filter_model: Dict[str, Any] = {}  # DataGrid filter model
+    sort_model: List[Dict[str, Any]] = []  # DataGrid sort model
+
+class SavedView(SavedViewCreate):
+    id: int
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class StatusHistoryEntry(BaseModel):
+    id: int
+    application_id: int
+    from_status: Optional[str] = None
+    status: str
+    timestamp: datetime
+
+    class Config:
+        from_attributes = True
+
+class FunnelStage(BaseModel):
+    stage: str
+    reached: int
+    conversion: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+class Funnel(BaseModel):
+    stages: List[FunnelStage]
+
+class StatusDwell(BaseModel):
+    status: str
+    count: int
+    median_days: Optional[float] = None
+    p90_days: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+class CompanyResponse(BaseModel):
+    company: str
+    applications: int
+    responded: int
+    median_days: Optional[float] = None
+    p90_days: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+class ResponseTimes(BaseModel):
+    dwell: List[StatusDwell]
+    first_response: CompanyResponse
+    companies: List[CompanyResponse]
+
+    class Config:
+        from_attributes = True
+
+class Facets(BaseModel):
+    total: int
+    status: Dict[str, int]
+    follow_up_required: Dict[str, int]
+    missing_date: Dict[str, int]
+
+class CompanySummary(BaseModel):
+    id: int
+    name: str
+    applications: int
+
+class CompanyDetail(CompanySummary):
+    by_status: Dict[str, int]
+
+class Suggestion(BaseModel):
+    value: str
+    count: int
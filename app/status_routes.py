@@ -0,0 +1,13 @@
+from typing import List
+
+from fastapi import APIRouter, Response
+
+from app import schemas, statuses
+
+router = APIRouter(tags=["statuses"])
+
+@router.get("/statuses", response_model=List[schemas.StatusEntry])
+def list_statuses(response: Response):
+    """The status dictionary (ids, names, colors, display order) for forms and charts."""
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return statuses.as_dicts()
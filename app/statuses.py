@@ -0,0 +1,122 @@
+"""The status dictionary: small-integer ids with display color and sort order.
+
+Applications keep their human-readable ``status`` and also a ``status_id``
+that points into the ``statuses`` table. The id is what filters, grouping and
+indexes use. Names are matched case- and whitespace-insensitively, and a
+name that is not in the dictionary is rejected instead of creating a new,
+misspelled status.
+
+The dictionary is small and rarely changes, so it is loaded once per process
+and kept in memory; call ``invalidate`` after changing the table.
+"""
+import logging
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COLOR = "#9966FF"
+
+# name, color, sort order (roughly the order an application moves through)
+DEFAULT_STATUSES = [
+    ("Not Yet Applied", "#FFFFFF", 10),
+    ("Applied", "#FFCE56", 20),
+    ("Interviewing", "#FF9F40", 30),
+    ("Offer", "#4BC0C0", 40),
+    ("Accepted", "#FF5722", 50),
+    ("Declined Offer", "#000000", 60),
+    ("Rejected", "#FF6384", 70),
+    ("No Longer Listed", "#9E9E9E", 80),
+    ("Applied / No Longer Listed", "#E0E0E0", 90),
+    ("Decided not to apply", "#8D6E63", 100),
+]
+
+@dataclass(frozen=True)
+class StatusInfo:
+    id: int
+    name: str
+    color: str
+    sort_order: int
+
+_cache: Optional[List[StatusInfo]] = None
+_by_key: Dict[str, StatusInfo] = {}
+
+def _key(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+def load() -> List[StatusInfo]:
+    """All statuses in display order (cached)."""
+    global _cache, _by_key
+    if _cache is None:
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT id, name, color, sort_order FROM statuses ORDER BY sort_order, id")).all()
+        _cache = [StatusInfo(*row) for row in rows]
+        _by_key = {_key(status.name): status for status in _cache}
+    return _cache
+
+def invalidate():
+    global _cache
+    _cache = None
+
+def lookup(name: Optional[str]) -> Optional[StatusInfo]:
+    if not name:
+        return None
+    load()
+    return _by_key.get(_key(name))
+
+def id_for(name: Optional[str]) -> Optional[int]:
+    status = lookup(name)
+    return status.id if status else None
+
+def by_id() -> Dict[int, StatusInfo]:
+    return {status.id: status for status in load()}
+
+def resolve(name: str) -> StatusInfo:
+    """The dictionary entry for ``name``; ValueError if there is none."""
+    status = lookup(name)
+    if status is None:
+        known = ", ".join(s.name for s in load())
+        raise ValueError(f"Unknown status {name!r}; expected one of: {known}")
+    return status
+
+def as_dicts() -> List[dict]:
+    return [asdict(status) for status in load()]
+
+def seed(conn: Connection):
+    """Insert any missing default statuses."""
+    conn.execute(
+        text("INSERT INTO statuses (name, color, sort_order) VALUES (:name, :color, :sort_order) "
+             "ON CONFLICT(name) DO NOTHING"),
+        [{"name": name, "color": color, "sort_order": order} for name, color, order in DEFAULT_STATUSES],
+    )
+    invalidate()
+
+def backfill_status_ids(conn: Connection, table: str):
+    """Point ``table.status_id`` at the dictionary, adding any status names only found in the data.
+
+    Names are matched with ``_key``, as on write, one UPDATE per distinct stored value.
+    """
+    known = {_key(name): (status_id, name) for status_id, name in conn.execute(text("SELECT id, name FROM statuses"))}
+    updates = []
+    for (value,) in conn.execute(text(f"SELECT DISTINCT status FROM {table} WHERE status IS NOT NULL")).all():
+        key = _key(value)
+        if not key:
+            continue
+        if key not in known:
+            name = " ".join(value.split())
+            status_id = conn.execute(
+                text("INSERT INTO statuses (name, color, sort_order) VALUES (:name, :color, 1000) RETURNING id"),
+                {"name": name, "color": DEFAULT_COLOR},
+            ).scalar()
+            known[key] = (status_id, name)
+        status_id, name = known[key]
+        updates.append({"stored": value, "status_id": status_id, "name": name})
+    if updates:
+        conn.execute(text(f"UPDATE {table} SET status_id = :status_id, status = :name WHERE status = :stored"), updates)
+    invalidate()
+    logger.info("Backfilled status ids for %s", table)
@@ -0,0 +1,60 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from app import analytics, models
+from app.database import SessionLocal
+from app.demo_models import DemoApplication
+from app.main import app
+
+client = TestClient(app)
+
+def company_row(result, company):
+    return next(row for row in result["companies"] if row["company"] == company)
+
+def test_dwell_times_and_first_response():
+    ids = []
+    for status in ("Applied", "Applied"):
+        ids.append(client.post("/applications/", data={"company": "Latencyco", "role": "Engineer", "status": status}).json()["id"])
+    try:
+        client.put(f"/applications/{ids[0]}", data={"company": "Latencyco", "role": "Engineer", "status": "Interviewing"})
+        client.put(f"/applications/{ids[0]}", data={"company": "Latencyco", "role": "Engineer", "status": "Offer"})
+        with SessionLocal() as db:
+            log = db.query(models.StatusHistory).filter_by(application_id=ids[0]).order_by(models.StatusHistory.id).all()
+            for entry, day in zip(log, (1, 4, 14)):
+                entry.timestamp = datetime(2025, 1, day)
+            db.commit()  # an ORM write to the log moves the cache on too
+
+        result = client.get("/analytics/response-times").json()
+        row = company_row(result, "Latencyco")
+        assert (row["applications"], row["responded"], row["median_days"], row["p90_days"]) == (2, 1, 3.0, 3.0)
+        assert {"status": "Interviewing", "count": 1, "median_days": 10.0, "p90_days": 10.0} in result["dwell"]
+        assert result["first_response"]["responded"] >= 1
+    finally:
+        for app_id in ids:
+            client.delete(f"/applications/{app_id}")
+    assert all(row["company"] != "Latencyco" for row in client.get("/analytics/response-times").json()["companies"])
+
+def test_results_are_cached_until_a_write():
+    first = analytics.response_times()
+    assert analytics.response_times() is first
+    app_id = client.post("/applications/", data={"company": "Latencyco", "role": "PM", "status": "Applied"}).json()["id"]
+    try:
+        assert analytics.response_times() is not first
+    finally:
+        client.delete(f"/applications/{app_id}")
+
+def test_demo_applications_fall_back_to_status_change_date():
+    with SessionLocal() as db:
+        generated = DemoApplication(company="Demolatency", role="Engineer", status="Rejected",
+                                    created_at=datetime(2025, 3, 1), status_change_date=datetime(2025, 3, 8))
+        db.add(generated)
+        db.commit()
+        app_id = generated.id
+    try:
+        row = company_row(client.get("/demo/analytics/response-times").json(), "Demolatency")
+        assert (row["applications"], row["responded"], row["median_days"]) == (1, 1, 7.0)
+    finally:
+        with SessionLocal() as db:
+            db.delete(db.get(DemoApplication, app_id))
+            db.commit()
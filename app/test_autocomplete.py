@@ -0,0 +1,57 @@
+from fastapi.testclient import TestClient
+
+from app import autocomplete, models
+from app.database import SessionLocal
+from app.main import app
+
+client = TestClient(app)
+
+def test_prefix_index_ranks_by_frequency_and_forgets_unused_values():
+    index = autocomplete.PrefixIndex()
+    for value in ["Google", "google ", "Goodyear", "GoDaddy", "Amazon", "Google"]:
+        index.add(value)
+    assert index.search("go") == [("Google", 3), ("GoDaddy", 1), ("Goodyear", 1)]
+    assert index.search("GOO", limit=1) == [("Google", 3)]
+    assert index.search("x") == []
+    index.remove("godaddy")
+    assert [value for value, _ in index.search("go")] == ["Google", "Goodyear"]
+    assert len(index) == 3
+
+def test_autocomplete_follows_writes():
+    def suggestions(field, prefix):
+        response = client.get("/autocomplete", params={"field": field, "prefix": prefix})
+        assert response.status_code == 200
+        return {entry["value"]: entry["count"] for entry in response.json()}
+
+    autocomplete.invalidate()
+    form = {"company": "Plumtree Robotics", "role": "Plumtree Wrangler", "status": "Applied"}
+    ids = [client.post("/applications/", data=form).json()["id"] for _ in range(2)]
+    try:
+        assert suggestions("company", "plumtree r") == {"Plumtree Robotics": 2}
+        assert suggestions("role", "Plumtree") == {"Plumtree Wrangler": 2}
+
+        client.put(f"/applications/{ids[0]}", data={**form, "company": "Plumtree Rockets"})
+        assert suggestions("company", "plumtree r") == {"Plumtree Robotics": 1, "Plumtree Rockets": 1}
+
+        client.delete(f"/applications/{ids[1]}")
+        assert suggestions("company", "plumtree r") == {"Plumtree Rockets": 1}
+    finally:
+        for app_id in ids:
+            client.delete(f"/applications/{app_id}")
+    assert suggestions("company", "plumtree") == {}
+
+def test_bulk_updates_rebuild_the_index():
+    form = {"company": "Quillfeather Labs", "role": "Engineer", "status": "Applied"}
+    app_id = client.post("/applications/", data=form).json()["id"]
+    try:
+        assert autocomplete.suggest("company", "quillfeather") == [("Quillfeather Labs", 1)]
+        with SessionLocal() as db:
+            db.query(models.Application).filter(models.Application.id == app_id).update(
+                {"company": "Quillfeather Works"}, synchronize_session=False)
+            db.commit()
+        assert autocomplete.suggest("company", "quillfeather") == [("Quillfeather Works", 1)]
+    finally:
+        client.delete(f"/applications/{app_id}")
+
+def test_autocomplete_rejects_unknown_field():
+    assert client.get("/autocomplete", params={"field": "notes", "prefix": "a"}).status_code == 400
@@ -0,0 +1,73 @@
+import pandas as pd
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app import companies, migrations, models, upload_spreadsheet
+from app.database import SessionLocal
+from app.main import app
+
+client = TestClient(app)
+
+def test_normalize_company_name_folds_case_punctuation_and_suffixes():
+    assert companies.normalize_company_name("Acme, Inc.") == "acme"
+    assert companies.normalize_company_name("  ACME ") == "acme"
+    assert companies.normalize_company_name("acme llc") == "acme"
+    assert companies.normalize_company_name("Macy’s, Inc.") == "macys"
+    # A suffix on its own is the name
+    assert companies.normalize_company_name("Company") == "company"
+    assert companies.normalize_company_name(" ,. ") is None
+
+def test_applications_share_a_company_and_update_moves_it():
+    ids = []
+    try:
+        for name in ["Zyxwv Widgets, Inc.", "ZYXWV WIDGETS", "zyxwv widgets llc"]:
+            created = client.post("/applications/", data={"company": name, "role": "Engineer", "status": "Applied"})
+            assert created.status_code == 200
+            ids.append(created.json()["id"])
+        company_ids = {client.get(f"/applications/{app_id}").json()["company_id"] for app_id in ids}
+        assert len(company_ids) == 1
+        company_id = company_ids.pop()
+        with SessionLocal() as db:
+            assert db.get(models.Company, company_id).name == "Zyxwv Widgets, Inc."
+
+        listed = client.get("/applications/", params={"search": "zyxwv widgets llc"}).json()
+        assert sorted(a["id"] for a in listed) == sorted(ids)
+        by_id = client.get("/applications/", params={"company_id": company_id}).json()
+        assert sorted(a["id"] for a in by_id) == sorted(ids)
+
+        detail = client.get(f"/companies/{company_id}").json()
+        assert detail["applications"] == 3
+        assert detail["by_status"] == {"Applied": 3}
+        summary = client.get("/companies/", params={"q": "Zyxwv"}).json()
+        assert [(c["id"], c["applications"]) for c in summary] == [(company_id, 3)]
+
+        updated = client.put(f"/applications/{ids[0]}", data={"company": "Qwvut Labs", "role": "Engineer", "status": "Applied"})
+        assert updated.status_code == 200
+        assert updated.json()["company_id"] != company_id
+        assert client.get(f"/companies/{company_id}").json()["applications"] == 2
+    finally:
+        for app_id in ids:
+            client.delete(f"/applications/{app_id}")
+
+def test_company_not_found():
+    assert client.get("/companies/999999999").status_code == 404
+
+def test_import_resolves_companies_in_bulk():
+    df = pd.DataFrame({"company": ["Vutsr Co", "VUTSR", None]})
+    with upload_spreadsheet.engine.connect() as conn:
+        resolved = upload_spreadsheet.with_company_ids(conn, df)
+        conn.rollback()
+    assert resolved["company_id"][0] == resolved["company_id"][1]
+    assert resolved["company_id"][2] is None
+
+def test_upgrade_backfills_company_ids(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE applications (id INTEGER PRIMARY KEY, company VARCHAR NOT NULL, "
+                          "role VARCHAR NOT NULL, status VARCHAR NOT NULL)"))
+        conn.execute(text("INSERT INTO applications (company, role, status) VALUES "
+                          "('Acme, Inc.', 'Eng', 'Applied'), ('acme', 'PM', 'Applied'), ('Globex', 'PM', 'Applied')"))
+    migrations.upgrade(engine)
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT a.company, c.name FROM applications a JOIN companies c ON c.id = a.company_id ORDER BY a.id")).all()
+    assert [row[1] for row in rows] == ["Acme, Inc.", "Acme, Inc.", "Globex"]
@@ -0,0 +1,108 @@
+import pandas as pd
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app import duplicates, migrations, models, upload_spreadsheet
+from app.database import SessionLocal, engine
+from app.main import app
+
+client = TestClient(app)
+
+def test_similar_applications_share_a_blocking_key():
+    original = duplicates.features("Initech Systems", "Senior Backend Engineer", None)
+    typo = duplicates.features("Initech Systems, Inc.", "Senior Backend Enginer", None)
+    other = duplicates.features("Globex", "Product Designer", None)
+    assert set(duplicates.signature_keys(original)) & set(duplicates.signature_keys(typo))
+    assert not set(duplicates.signature_keys(original)) & set(duplicates.signature_keys(other))
+    assert duplicates.similarity(original, typo) >= duplicates.THRESHOLD
+    assert duplicates.similarity(original, other) < 0.2
+
+def test_duplicates_on_create_and_endpoint():
+    def create(**fields):
+        response = client.post("/applications/", data={"status": "Applied", **fields})
+        assert response.status_code == 200
+        ids.append(response.json()["id"])
+        return response.json()
+
+    ids = []
+    try:
+        original = create(company="Initrode Systems", role="Senior Backend Engineer",
+                          url="https://www.initrode.example/jobs/42?utm_source=board")
+        assert original["possible_duplicates"] == []
+
+        typo = create(company="Initrode Systems, Inc.", role="Senior Backend Enginer")
+        assert [match["id"] for match in typo["possible_duplicates"]] == [original["id"]]
+
+        same_posting = create(company="Recruiter Co", role="Backend role", url="initrode.example/jobs/42/")
+        assert same_posting["possible_duplicates"][0]["id"] == original["id"]
+        assert same_posting["possible_duplicates"][0]["score"] == 1.0
+
+        unrelated = create(company="Umbrella Pharmaceuticals", role="Lab Technician")
+        assert unrelated["possible_duplicates"] == []
+
+        found = client.get(f"/applications/{original['id']}/duplicates").json()
+        assert sorted(match["id"] for match in found) == sorted([typo["id"], same_posting["id"]])
+
+        client.delete(f"/applications/{typo['id']}")
+        found = client.get(f"/applications/{original['id']}/duplicates").json()
+        assert [match["id"] for match in found] == [same_posting["id"]]
+        assert client.get("/applications/999999999/duplicates").status_code == 404
+    finally:
+        for app_id in ids:
+            client.delete(f"/applications/{app_id}")
+
+def test_import_reports_possible_duplicates(tmp_path):
+    created = client.post("/applications/", data={"company": "Vandelay Industries", "role": "Latex Importer",
+                                                   "status": "Applied"}).json()
+    path = tmp_path / "apps.csv"
+    pd.DataFrame({
+        "Company": ["Vandelay Industries LLC", "Kramerica"],
+        "Role": ["Latex Importer", "Intern"],
+        "Status": ["Applied", "Applied"],
+    }).to_csv(path, index=False)
+    try:
+        result = upload_spreadsheet.upload_spreadsheet(str(path))
+        assert result.inserted == 2
+        assert [(d.row, d.application_id) for d in result.duplicates] == [(2, created["id"])]
+    finally:
+        with SessionLocal() as db:
+            for application in db.query(models.Application).filter(models.Application.company.in_(
+                    ["Vandelay Industries LLC", "Kramerica", "Vandelay Industries"])):
+                db.delete(application)
+            db.commit()
+
+def test_candidate_lookup_uses_the_key_index():
+    with engine.connect() as conn:
+        plan = conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT key, application_id FROM application_signatures WHERE key IN (1, 2, 3)"
+        )).all()
+    assert "ix_application_signatures_key" in " ".join(str(row[-1]) for row in plan)
+
+def test_upgrade_backfills_signatures(tmp_path):
+    old = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with old.begin() as conn:
+        conn.execute(text("CREATE TABLE applications (id INTEGER PRIMARY KEY, company VARCHAR NOT NULL, "
+                          "role VARCHAR NOT NULL, status VARCHAR NOT NULL)"))
+        conn.execute(text("INSERT INTO applications (company, role, status) VALUES "
+                          "('Acme', 'Data Engineer', 'Applied'), ('ACME Inc', 'Data Enginer', 'Applied')"))
+    migrations.upgrade(old)
+    with old.connect() as conn:
+        matches = duplicates.find_duplicates(conn, "Acme", "Data Engineer", None, exclude_id=1)
+    assert [match.id for match in matches] == [2]
+
+def test_unparseable_urls_still_index(tmp_path):
+    bad = duplicates.features("Acme", "Data Engineer", "http://acme.example:abc/jobs")
+    assert bad.url == "http://acme.example:abc/jobs"
+    assert duplicates.signature_keys(bad)
+
+    old = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with old.begin() as conn:
+        conn.execute(text("CREATE TABLE applications (id INTEGER PRIMARY KEY, company VARCHAR NOT NULL, "
+                          "role VARCHAR NOT NULL, status VARCHAR NOT NULL, url VARCHAR)"))
+        conn.execute(text("INSERT INTO applications (company, role, status, url) VALUES "
+                          "('Acme', 'Data Engineer', 'Applied', 'https://[::1/jobs'), "
+                          "('Globex', 'Designer', 'Applied', 'https://[::1/jobs')"))
+    migrations.upgrade(old)
+    with old.connect() as conn:
+        matches = duplicates.find_duplicates(conn, "Initech", "Chef", "https://[::1/jobs", exclude_id=1)
+    assert [(match.id, match.score) for match in matches] == [(2, 1.0)]
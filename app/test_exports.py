@@ -0,0 +1,132 @@
+import csv
+import io
+from datetime import date, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import exports, models, upload_spreadsheet
+from app.database import SessionLocal
+from app.main import app
+
+client = TestClient(app)
+
+def test_export_csv_applies_list_filters():
+    with SessionLocal() as db:
+        rows = [
+            models.Application(company="Export Co", role="Engineer", status="Offer", follow_up_required=True),
+            models.Application(company="Export Co", role="PM", status="Rejected"),
+        ]
+        db.add_all(rows)
+        db.commit()
+        ids = [row.id for row in rows]
+    try:
+        response = client.get("/applications/export.csv", params={"search": "Export Co", "status": "Offer"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        records = list(csv.DictReader(io.StringIO(response.text)))
+        assert [(r["ID"], r["Role"], r["Follow Up Required"]) for r in records] == [(str(ids[0]), "Engineer", "Yes")]
+    finally:
+        with SessionLocal() as db:
+            db.query(models.Application).filter(models.Application.id.in_(ids)).delete()
+            db.commit()
+
+def test_iter_csv_yields_in_batches(monkeypatch):
+    monkeypatch.setattr(exports, "CSV_BATCH_ROWS", 2)
+    rows = [(i, None) for i in range(5)]
+    chunks = list(exports.iter_csv(iter(rows)))
+    assert len(chunks) == 3
+    assert "".join(chunks).splitlines()[1:] == ["0,", "1,", "2,", "3,", "4,"]
+
+def test_iter_csv_keeps_formulas_as_text():
+    rows = [("=HYPERLINK(\"http://x\")", "+1", "-2", "@SUM(A1)", "plain", -3)]
+    record = next(csv.reader(io.StringIO("".join(exports.iter_csv(iter(rows))).splitlines()[1])))
+    assert record == ["'=HYPERLINK(\"http://x\")", "'+1", "'-2", "'@SUM(A1)", "plain", "-3"]
+
+@pytest.mark.skipif(exports.pa is None, reason="pyarrow not installed")
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_snapshot_export_keeps_types_and_filters_dates(fmt):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with SessionLocal() as db:
+        rows = [
+            models.Application(company="Snapshot Co", role="Engineer", status="Applied", application_date=date(1999, 1, 5)),
+            models.Application(company="Snapshot Co", role="PM", status="Applied", application_date=date(1999, 2, 5)),
+        ]
+        db.add_all(rows)
+        db.commit()
+        ids = [row.id for row in rows]
+    try:
+        response = client.get(f"/applications/export.{fmt}", params={"date_from": "1999-01-01", "date_to": "1999-01-31"})
+        assert response.status_code == 200
+        source = pa.BufferReader(response.content)
+        table = pq.read_table(source) if fmt == "parquet" else pa.ipc.open_file(source).read_all()
+        assert table.column("id").to_pylist() == [ids[0]]
+        assert table.schema.field("application_date").type == pa.date32()
+        assert table.column("application_date").to_pylist() == [date(1999, 1, 5)]
+        assert "import_key" not in table.column_names
+    finally:
+        with SessionLocal() as db:
+            db.query(models.Application).filter(models.Application.id.in_(ids)).delete()
+            db.commit()
+
+@pytest.mark.skipif(exports.pa is None, reason="pyarrow not installed")
+def test_status_history_snapshot_filters_on_timestamp():
+    import pyarrow as pa
+
+    app_id = client.post("/applications/", data={"company": "Snapshot Log", "role": "Engineer", "status": "Applied"}).json()["id"]
+    try:
+        today = datetime.utcnow().date().isoformat()  # history timestamps are UTC
+        response = client.get("/applications/export.arrow",
+                              params={"table": "status_history", "date_from": today, "date_to": today})
+        assert response.status_code == 200
+        table = pa.ipc.open_file(pa.BufferReader(response.content)).read_all()
+        assert table.schema.field("timestamp").type == pa.timestamp("us")
+        assert (app_id, "Applied") in zip(table.column("application_id").to_pylist(), table.column("status").to_pylist())
+        old = client.get("/applications/export.arrow", params={"table": "status_history", "date_to": "1999-12-31"})
+        assert app_id not in pa.ipc.open_file(pa.BufferReader(old.content)).read_all().column("application_id").to_pylist()
+    finally:
+        client.delete(f"/applications/{app_id}")
+
+def test_snapshot_export_rejects_unknown_table():
+    assert client.get("/applications/export.parquet", params={"table": "users"}).status_code in (400, 501)
+
+def test_xlsx_export_round_trips_through_importer(tmp_path):
+    fields = [
+        {
+            "company": "Roundtrip Co", "role": "Engineer", "status": "Interviewing", "order_number": 77,
+            "url": "https://example.com/jobs/1", "application_date": date(2025, 3, 9), "follow_up_required": True,
+            "notes": "=SUM(A1:A2) is text, not a formula", "pros": "Remote", "cons": None, "salary": "120k - 140k",
+        },
+        # The last columns are empty, so the written row is shorter than the header
+        {
+            "company": "Roundtrip Co", "role": "PM", "status": "Applied", "order_number": 78,
+            "url": None, "application_date": None, "follow_up_required": False,
+            "notes": None, "pros": None, "cons": None, "salary": None,
+        },
+    ]
+    with SessionLocal() as db:
+        rows = [models.Application(**values) for values in fields]
+        db.add_all(rows)
+        db.commit()
+        ids = [row.id for row in rows]
+    try:
+        response = client.get("/applications/export.xlsx", params={"search": "Roundtrip Co", "sort_by": "order_number"})
+        assert response.status_code == 200
+        path = tmp_path / "applications.xlsx"
+        path.write_bytes(response.content)
+
+        [chunk] = list(upload_spreadsheet.iter_chunks(str(path)))
+        assert list(chunk.columns) == list(upload_spreadsheet.COLUMN_MAP)
+        imported = upload_spreadsheet.normalize_chunk(chunk).to_dict("records")
+        assert [{key: record[key] for key in fields[0]} for record in imported] == fields
+
+        # A chunk holding only the short row must still get every column
+        result = upload_spreadsheet.upload_spreadsheet(str(path), chunk_size=1)
+        assert (result.inserted, result.rejected) == (2, 0)
+    finally:
+        with SessionLocal() as db:
+            for application in db.query(models.Application).filter(models.Application.company == "Roundtrip Co"):
+                db.delete(application)
+            db.commit()
@@ -0,0 +1,115 @@
+import io
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import config, extraction, models
+from app.database import SessionLocal
+from app.main import app
+
+def _docx_bytes(*paragraphs):
+    ns = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    body = "".join(f"<w:p><w:r><w:t>{p}</w:t></w:r></w:p>" for p in paragraphs)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", f'<w:document xmlns:w="{ns}"><w:body>{body}</w:body></w:document>')
+    return buffer.getvalue()
+
+@pytest.mark.parametrize("filename, content, expected", [
+    ("resume.txt", b"Ran Kubernetes clusters", "Ran Kubernetes clusters"),
+    ("resume.docx", _docx_bytes("Platform engineer", "Kubernetes and Terraform"), "Platform engineer\nKubernetes and Terraform"),
+    ("resume.rtf", b"{\\rtf1\\ansi{\\fonttbl\\f0 Arial;}{\\*\\generator Word;}\\f0\\fs24 Kubernetes \\'e9quipe\\par}", "Kubernetes \xe9quipe"),
+    ("resume.pdf", b"%PDF-1.4\nstream\nBT (Kubernetes) Tj [(oper) -20 (ator)] TJ ET\nendstream", "Kubernetes operator"),
+])
+def test_extract_text_by_type(tmp_path, filename, content, expected):
+    """Each supported format yields its plain text"""
+    if filename.endswith(".pdf") and extraction.pypdf is not None:
+        pytest.skip("fallback parser only runs without pypdf")
+    path = tmp_path / filename
+    path.write_bytes(content)
+    assert extraction.extract_text(str(path)).strip() == expected
+
+def test_fts_query_quotes_terms():
+    assert extraction.fts_query('kubernetes AND "helm" OR') == '"kubernetes" "AND" "helm" "OR"'
+    assert extraction.fts_query("!!! ()") == ""
+
+def test_document_search_without_terms_matches_nothing():
+    client = TestClient(app)
+    for path in ("/applications/", "/applications/export.csv", "/applications/facets"):
+        response = client.get(path, params={"document_search": "!!!"})
+        assert response.status_code == 200
+    assert client.get("/applications/", params={"document_search": "!!!"}).json() == []
+    assert client.get("/applications/facets", params={"document_search": "!!!"}).json()["total"] == 0
+
+def test_document_search_syntax_errors_are_bad_requests(monkeypatch):
+    monkeypatch.setattr(extraction, "fts_query", lambda query: 'AND "unbalanced')
+    response = TestClient(app).get("/applications/", params={"document_search": "anything"})
+    assert response.status_code == 400
+
+def test_list_applications_filters_on_document_text(tmp_path, monkeypatch):
+    """Uploaded resumes are indexed in the background and searchable from the list endpoint"""
+    monkeypatch.setattr(config, "UPLOAD_FOLDER", str(tmp_path))
+    token = f"zq{uuid4().hex[:10]}"
+    form = {"company": "Search Co", "role": "SRE", "status": "Applied"}
+    with TestClient(app) as client:
+        created = client.post("/applications/", data=form,
+                              files={"resume_file": ("resume.txt", f"Operated {token} clusters".encode(), "text/plain")})
+        assert created.status_code == 200
+        app_id = created.json()["id"]
+        try:
+            deadline = time.time() + 60
+            matches = []
+            while time.time() < deadline and not matches:
+                matches = client.get("/applications/", params={"document_search": token}).json()
+                time.sleep(0.2)
+            assert [a["id"] for a in matches] == [app_id]
+            assert client.get("/applications/", params={"document_search": token + "x"}).json() == []
+        finally:
+            client.delete(f"/applications/{app_id}")
+
+class _BrokenPool:
+    def __init__(self):
+        self.shut_down = False
+
+    def submit(self, *args):
+        raise BrokenProcessPool("a worker died")
+
+    def shutdown(self, **kwargs):
+        self.shut_down = True
+
+def _stored_text(stored_name):
+    with SessionLocal() as db:
+        return db.query(models.DocumentText).filter_by(stored_name=stored_name).one_or_none()
+
+def test_broken_pool_is_replaced(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "UPLOAD_FOLDER", str(tmp_path))
+    monkeypatch.setattr(extraction, "ProcessPoolExecutor", lambda **kwargs: ThreadPoolExecutor(max_workers=1))
+    broken = _BrokenPool()
+    monkeypatch.setattr(extraction, "_pool", broken)
+    stored_name = f"{uuid4().hex}.txt"
+    (tmp_path / stored_name).write_text("Recovered after a crash")
+    try:
+        assert extraction.extract_document_job({"stored_name": stored_name}, None)["chars"] == 23
+        assert broken.shut_down and extraction._pool is not broken
+        assert _stored_text(stored_name).content == "Recovered after a crash"
+    finally:
+        extraction.shutdown()
+
+def test_extraction_failures_are_recorded(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "UPLOAD_FOLDER", str(tmp_path))
+    monkeypatch.setattr(extraction, "ProcessPoolExecutor", lambda **kwargs: ThreadPoolExecutor(max_workers=1))
+    monkeypatch.setattr(extraction, "_pool", None)
+    stored_name = f"{uuid4().hex}.txt"  # never written, so reading it fails
+    try:
+        result = extraction.extract_document_job({"stored_name": stored_name}, None)
+        assert "No such file" in result["error"]
+        row = _stored_text(stored_name)
+        assert (row.content, "No such file" in row.error) == ("", True)
+        assert extraction.extract_document_job({"stored_name": stored_name}, None)["skipped"]
+    finally:
+        extraction.shutdown()
@@ -0,0 +1,68 @@
+from fastapi.testclient import TestClient
+
+from app import facets, generations, models
+from app.database import SessionLocal
+from app.main import app
+
+client = TestClient(app)
+
+def test_facets_count_the_filtered_applications():
+    rows = [
+        {"status": "Applied", "follow_up_required": "true", "application_date": "2025-01-02"},
+        {"status": "Applied", "follow_up_required": "false"},
+        {"status": "Rejected", "follow_up_required": "false", "application_date": "2025-01-03"},
+    ]
+    ids = [client.post("/applications/", data={"company": "Facetcorp", "role": "Engineer", **row}).json()["id"]
+           for row in rows]
+    try:
+        body = client.get("/applications/facets", params={"search": "Facetcorp"}).json()
+        assert body["total"] == 3
+        assert body["status"] == {"Applied": 2, "Rejected": 1}
+        assert body["follow_up_required"] == {"true": 1, "false": 2}
+        assert body["missing_date"] == {"true": 1, "false": 2}
+
+        # A facet ignores its own filter but applies the others
+        body = client.get("/applications/facets", params={"search": "Facetcorp", "status": "Applied"}).json()
+        assert body["total"] == 2
+        assert body["status"] == {"Applied": 2, "Rejected": 1}
+        assert body["follow_up_required"] == {"true": 1, "false": 1}
+
+        body = client.get("/applications/facets", params={"search": "Facetcorp", "missing_date": True}).json()
+        assert (body["total"], body["status"]) == (1, {"Applied": 1})
+        assert client.get("/applications/facets", params={"search": "Facetcorp", "status": "Nope"}).json()["total"] == 0
+
+        # A write starts a new generation, so the cached counts are not served again
+        client.delete(f"/applications/{ids.pop()}")
+        body = client.get("/applications/facets", params={"search": "Facetcorp"}).json()
+        assert body["total"] == 2
+        assert body["status"] == {"Applied": 2}
+    finally:
+        for app_id in ids:
+            client.delete(f"/applications/{app_id}")
+
+def test_facets_are_cached_within_a_generation(monkeypatch):
+    calls = []
+    real_cells = facets._cells
+    monkeypatch.setattr(facets, "_cells", lambda **filters: calls.append(filters) or real_cells(**filters))
+    generations.bump(generations.APPLICATIONS)
+    for _ in range(3):
+        client.get("/applications/facets", params={"search": "Cachecorp"})
+    assert len(calls) == 1
+    generations.bump(generations.APPLICATIONS)
+    client.get("/applications/facets", params={"search": "Cachecorp"})
+    assert len(calls) == 2
+
+def test_extracted_text_moves_the_generation(monkeypatch):
+    calls = []
+    real_cells = facets._cells
+    monkeypatch.setattr(facets, "_cells", lambda **filters: calls.append(filters) or real_cells(**filters))
+    params = {"document_search": "zyzzyvafacet"}
+    client.get("/applications/facets", params=params)
+    with SessionLocal() as db:
+        text = models.DocumentText(stored_name="facet-generation-test.txt", content="zyzzyvafacet")
+        db.add(text)
+        db.commit()
+        client.get("/applications/facets", params=params)
+        assert len(calls) == 2
+        db.delete(text)
+        db.commit()
@@ -0,0 +1,77 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import config
+from app.main import app
+
+client = TestClient(app)
+
+CONTENT = b"%PDF-1.7\n" + bytes(range(256)) * 40
+
+@pytest.fixture
+def stored_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "UPLOAD_FOLDER", str(tmp_path))
+    name = "0123abcd.pdf"
+    (tmp_path / name).write_bytes(CONTENT)
+    return name
+
+def test_serve_upload_sets_immutable_caching_headers(stored_file):
+    """Full responses carry an immutable Cache-Control and a name-based ETag"""
+    response = client.get(f"/uploads/{stored_file}")
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert "immutable" in response.headers["cache-control"]
+    assert response.headers["etag"] == '"0123abcd"'
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-disposition"].startswith("inline")
+
+def test_serve_upload_answers_conditional_get_with_304(stored_file):
+    """A matching If-None-Match or a current If-Modified-Since yields 304"""
+    first = client.get(f"/uploads/{stored_file}")
+    assert client.get(f"/uploads/{stored_file}", headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+    assert client.get(f"/uploads/{stored_file}", headers={"If-Modified-Since": first.headers["last-modified"]}).status_code == 304
+    assert client.get(f"/uploads/{stored_file}", headers={"If-None-Match": '"other"'}).status_code == 200
+
+def test_serve_upload_supports_byte_ranges(stored_file):
+    """Range requests return 206 with just the requested bytes"""
+    response = client.get(f"/uploads/{stored_file}", headers={"Range": "bytes=100-199"})
+    assert response.status_code == 206
+    assert response.content == CONTENT[100:200]
+    assert response.headers["content-range"] == f"bytes 100-199/{len(CONTENT)}"
+
+def test_serve_upload_rejects_missing_and_hidden_files(stored_file):
+    assert client.get("/uploads/missing.pdf").status_code == 404
+    assert client.get("/uploads/.quarantine").status_code == 404
+
+def test_serve_upload_names_downloads_after_the_uploaded_file(tmp_path, monkeypatch):
+    """Content-Disposition carries the user's filename, not the content hash"""
+    monkeypatch.setattr(config, "UPLOAD_FOLDER", str(tmp_path))
+    content = b"%PDF-1.7 named " + bytes(range(32))
+    response = client.post("/applications/", data={"company": "Name Co", "role": "Engineer", "status": "Applied"},
+                           files={"resume_file": ("Jane Doe résumé.pdf", content, "application/pdf")})
+    assert response.status_code == 200
+    stored_name = response.json()["resume_file"]
+    try:
+        disposition = client.get(f"/uploads/{stored_name}", params={"download": True}).headers["content-disposition"]
+        assert disposition.startswith("attachment")
+        assert "Jane%20Doe%20r%C3%A9sum%C3%A9.pdf" in disposition
+        assert stored_name not in disposition
+    finally:
+        client.delete(f"/applications/{response.json()['id']}")
+
+def test_last_modified_does_not_move_when_content_is_uploaded_again(tmp_path, monkeypatch):
+    import io
+    import os
+    import time
+
+    from app import uploads
+
+    monkeypatch.setattr(config, "UPLOAD_FOLDER", str(tmp_path))
+    content = CONTENT + os.urandom(8)
+    stored = uploads.store_upload(io.BytesIO(content), "resume.pdf")
+    first = client.get(f"/uploads/{stored.stored_name}")
+    time.sleep(1.1)
+    uploads.store_upload(io.BytesIO(content), "resume again.pdf")
+    second = client.get(f"/uploads/{stored.stored_name}", headers={"If-Modified-Since": first.headers["last-modified"]})
+    assert second.status_code == 304
+    assert second.headers["last-modified"] == first.headers["last-modified"]
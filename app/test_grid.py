@@ -0,0 +1,92 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import grid
+from app.main import app
+
+client = TestClient(app)
+
+ROWS = [
+    {"company": "Gridco Alpha", "role": "Backend Engineer", "status": "Applied", "application_date": "2025-03-01", "salary": "120k"},
+    {"company": "Gridco Beta", "role": "Frontend Engineer", "status": "Rejected", "application_date": "2025-01-15", "salary": "90k"},
+    {"company": "Gridco Gamma", "role": "Data Analyst", "status": "Applied", "salary": "100k"},
+    {"company": "Gridco Delta", "role": "Backend Engineer", "status": "Interviewing", "application_date": "2025-02-10"},
+]
+
+@pytest.fixture
+def grid_rows():
+    ids = [client.post("/applications/", data=row).json()["id"] for row in ROWS]
+    yield ids
+    for app_id in ids:
+        client.delete(f"/applications/{app_id}")
+
+def fetch(items=(), logic="and", sort=(), **params):
+    """Companies (last word) and total of a grid page, scoped to the test rows by ``search``."""
+    response = client.get("/applications/grid", params={
+        "filter_model": json.dumps({"items": list(items), "logicOperator": logic}),
+        "sort_model": json.dumps(list(sort)),
+        "search": "Gridco",
+        **params,
+    })
+    assert response.status_code == 200, response.text
+    body = response.json()
+    return [row["company"].split()[-1] for row in body["rows"]], body["total"]
+
+def test_multi_column_sort_puts_missing_dates_last(grid_rows):
+    by_date = [{"field": "application_date", "sort": "asc"}]
+    assert fetch(sort=by_date)[0] == ["Beta", "Delta", "Alpha", "Gamma"]
+    assert fetch(sort=[{"field": "application_date", "sort": "desc"}])[0] == ["Alpha", "Delta", "Beta", "Gamma"]
+    by_role_then_date = [{"field": "role", "sort": "asc"}, {"field": "application_date", "sort": "desc"}]
+    assert fetch(sort=by_role_then_date)[0] == ["Alpha", "Delta", "Gamma", "Beta"]
+
+def test_compound_filters(grid_rows):
+    backend = {"field": "role", "operator": "contains", "value": "backend"}
+    applied = {"field": "status", "operator": "is", "value": "applied"}
+    assert fetch([backend, applied]) == (["Alpha"], 1)
+    assert sorted(fetch([backend, applied], logic="or")[0]) == ["Alpha", "Delta", "Gamma"]
+
+    assert fetch([{"field": "application_date", "operator": "after", "value": "2025-02-10"}])[0] == ["Alpha"]
+    assert sorted(fetch([{"field": "application_date", "operator": "onOrBefore", "value": "2025-02-10"}])[0]) == ["Beta", "Delta"]
+    assert fetch([{"field": "application_date", "operator": "isEmpty"}])[0] == ["Gamma"]
+    assert fetch([{"field": "salary_min", "operator": ">=", "value": "100000"},
+                  {"field": "status", "operator": "isAnyOf", "value": ["Applied", "Rejected"]}],
+                 sort=[{"field": "salary_min", "sort": "desc"}])[0] == ["Alpha", "Gamma"]
+    # Items without a value are ignored, as in the grid UI
+    assert fetch([{"field": "company", "operator": "contains", "value": ""}])[1] == 4
+
+def test_quick_filter_and_paging(grid_rows):
+    response = client.get("/applications/grid", params={
+        "filter_model": json.dumps({"items": [], "quickFilterValues": ["gridco", "engineer"]}),
+        "sort_model": json.dumps([{"field": "company", "sort": "asc"}]),
+        "page": 1, "page_size": 2,
+    })
+    body = response.json()
+    assert body["total"] == 3
+    assert [row["company"] for row in body["rows"]] == ["Gridco Delta"]
+
+def test_values_are_bound_parameters():
+    condition = grid.item_condition({"field": "company", "operator": "contains", "value": "x'; DROP TABLE applications; --"})
+    assert "DROP" not in str(condition.compile(compile_kwargs={}))
+
+@pytest.mark.parametrize("params", [
+    {"sort_model": json.dumps([{"field": "import_key", "sort": "asc"}])},
+    {"sort_model": json.dumps([{"field": "company", "sort": "sideways"}])},
+    {"filter_model": json.dumps({"items": [{"field": "notes; --", "operator": "contains", "value": "a"}]})},
+    {"filter_model": json.dumps({"items": [{"field": "application_date", "operator": "contains", "value": "a"}]})},
+    {"filter_model": json.dumps({"items": [{"field": "application_date", "operator": "after", "value": "soon"}]})},
+    {"filter_model": json.dumps({"items": [], "logicOperator": "xor"})},
+    {"filter_model": "{not json"},
+    {"filter_model": json.dumps({"items": ["company"]})},
+    {"filter_model": json.dumps({"items": {"field": "company"}})},
+    {"filter_model": json.dumps({"items": [{"field": ["company"], "operator": "contains", "value": "a"}]})},
+    {"filter_model": json.dumps({"items": [{"field": "company", "operator": ["contains"], "value": "a"}]})},
+    {"filter_model": json.dumps({"items": [{"field": "status", "operator": "isAnyOf", "value": "Offer"}]})},
+    {"filter_model": json.dumps({"items": [{"field": "order_number", "operator": ">", "value": {"gt": 1}}]})},
+    {"filter_model": json.dumps({"items": [], "quickFilterValues": "remote"})},
+    {"sort_model": json.dumps(["company"])},
+    {"sort_model": json.dumps([{"field": {"name": "company"}}])},
+])
+def test_invalid_models_are_rejected(params):
+    assert client.get("/applications/grid", params=params).status_code == 400
@@ -0,0 +1,130 @@
+import pandas as pd
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app import history, migrations, models, upload_spreadsheet
+from app.database import SessionLocal
+from app.main import app
+
+client = TestClient(app)
+
+def funnel_counts():
+    return {stage["stage"]: stage["reached"] for stage in client.get("/analytics/funnel").json()["stages"]}
+
+def update(app_id, status):
+    response = client.put(f"/applications/{app_id}", data={"company": "Historyco", "role": "Engineer", "status": status})
+    assert response.status_code == 200
+
+def test_status_changes_are_logged_and_counted():
+    before = funnel_counts()
+    app_id = client.post("/applications/", data={"company": "Historyco", "role": "Engineer", "status": "Not Yet Applied"}).json()["id"]
+    try:
+        update(app_id, "Applied")
+        update(app_id, "Applied")  # not a change
+        update(app_id, "Offer")  # skipping Interviewing still implies it
+        update(app_id, "Rejected")  # never takes a reached stage back
+        log = client.get(f"/applications/{app_id}/history").json()
+        assert [(entry["from_status"], entry["status"]) for entry in log] == [
+            (None, "Not Yet Applied"), ("Not Yet Applied", "Applied"), ("Applied", "Offer"), ("Offer", "Rejected"),
+        ]
+        after = funnel_counts()
+        assert {stage: after[stage] - before[stage] for stage in after} == {
+            "Applied": 1, "Interviewing": 1, "Offer": 1, "Accepted": 0,
+        }
+    finally:
+        client.delete(f"/applications/{app_id}")
+    assert funnel_counts() == before
+    # The log is append-only: it outlives the application, whose id is not handed out again
+    assert len(client.get(f"/applications/{app_id}/history").json()) == 4
+    new_id = client.post("/applications/", data={"company": "Historyco", "role": "Engineer", "status": "Applied"}).json()["id"]
+    client.delete(f"/applications/{new_id}")
+    assert new_id > app_id
+    assert client.get("/applications/999999999/history").status_code == 404
+
+def test_bulk_status_updates_are_logged():
+    before = funnel_counts()
+    app_id = client.post("/applications/", data={"company": "Bulkhistory", "role": "Engineer", "status": "Applied"}).json()["id"]
+    try:
+        with SessionLocal() as db:
+            db.query(models.Application).filter(models.Application.company == "Bulkhistory").update(
+                {"status": "Interviewing"}, synchronize_session=False)
+            db.commit()
+            assert db.get(models.Application, app_id).funnel_stage == 2
+        log = client.get(f"/applications/{app_id}/history").json()
+        assert [(entry["from_status"], entry["status"]) for entry in log] == [(None, "Applied"), ("Applied", "Interviewing")]
+        after = funnel_counts()
+        assert (after["Applied"] - before["Applied"], after["Interviewing"] - before["Interviewing"]) == (1, 1)
+    finally:
+        client.delete(f"/applications/{app_id}")
+    assert funnel_counts() == before
+
+def test_funnel_conversion_rates():
+    stages = client.get("/analytics/funnel").json()["stages"]
+    assert [stage["stage"] for stage in stages] == history.FUNNEL_STAGES
+    assert stages[0]["conversion"] is None
+    for previous, stage in zip(stages, stages[1:]):
+        expected = round(stage["reached"] / previous["reached"], 4) if previous["reached"] else None
+        assert stage["conversion"] == expected
+
+def test_counters_match_a_recount():
+    with SessionLocal() as db:
+        counts = dict(db.query(models.FunnelCount.stage, models.FunnelCount.count).all())
+        for stage in range(1, len(history.FUNNEL_STAGES) + 1):
+            assert counts[stage] == db.query(models.Application).filter(models.Application.funnel_stage >= stage).count()
+
+def test_import_records_history(tmp_path):
+    path = tmp_path / "apps.csv"
+    frame = pd.DataFrame({"Company": ["Histimport"], "Role": ["Engineer"], "Status": ["Applied"], "Order number": [987654]})
+    frame.to_csv(path, index=False)
+    before = funnel_counts()
+    try:
+        upload_spreadsheet.upload_spreadsheet(str(path), key="order_number")
+        frame.assign(Status=["Interviewing"]).to_csv(path, index=False)
+        upload_spreadsheet.upload_spreadsheet(str(path), key="order_number")
+        with SessionLocal() as db:
+            application = db.query(models.Application).filter_by(company="Histimport").one()
+            app_id = application.id
+            assert application.funnel_stage == 2
+        log = client.get(f"/applications/{app_id}/history").json()
+        assert [(entry["from_status"], entry["status"]) for entry in log] == [(None, "Applied"), ("Applied", "Interviewing")]
+        after = funnel_counts()
+        assert (after["Applied"] - before["Applied"], after["Interviewing"] - before["Interviewing"]) == (1, 1)
+    finally:
+        with SessionLocal() as db:
+            for application in db.query(models.Application).filter_by(company="Histimport"):
+                db.delete(application)
+            db.commit()
+
+def test_upgrade_backfills_history_and_funnel(tmp_path):
+    old = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with old.begin() as conn:
+        conn.execute(text("CREATE TABLE applications (id INTEGER PRIMARY KEY, company VARCHAR NOT NULL, "
+                          "role VARCHAR NOT NULL, status VARCHAR NOT NULL)"))
+        conn.execute(text("INSERT INTO applications (company, role, status) VALUES "
+                          "('A', 'Eng', 'Applied'), ('B', 'PM', 'Offer'), ('C', 'PM', 'Not Yet Applied')"))
+    migrations.upgrade(old)
+    with old.connect() as conn:
+        assert [(stage.stage, stage.reached) for stage in history.funnel(conn)] == [
+            ("Applied", 2), ("Interviewing", 1), ("Offer", 1), ("Accepted", 0),
+        ]
+        assert conn.execute(text("SELECT count(*) FROM status_history")).scalar() == 3
+
+def test_upgrade_rebuilds_applications_with_autoincrement(tmp_path):
+    old = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with old.begin() as conn:
+        conn.execute(text("CREATE TABLE applications (id INTEGER PRIMARY KEY, company VARCHAR NOT NULL, "
+                          "role VARCHAR NOT NULL, status VARCHAR NOT NULL, salary VARCHAR)"))
+        conn.execute(text("INSERT INTO applications (id, company, role, status, salary) VALUES "
+                          "(1, 'A', 'Eng', 'Applied', '$100k'), (2, 'B', 'PM', 'Offer', NULL)"))
+    migrations.upgrade(old)
+    with old.begin() as conn:
+        # A deleted application's history stays behind; the id must not come back
+        conn.execute(text("DELETE FROM applications WHERE id = 2"))
+        assert "AUTOINCREMENT" in conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'applications'")).scalar()
+        assert conn.execute(text("SELECT salary_min FROM applications WHERE id = 1")).scalar() == 100000
+        new_id = conn.execute(text("INSERT INTO applications (company, role, status, funnel_stage) "
+                                   "VALUES ('C', 'Eng', 'Applied', 1) RETURNING id")).scalar()
+        assert new_id == 3
+    migrations.upgrade(old)  # already rebuilt: nothing to do
+    with old.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM applications")).scalar() == 2
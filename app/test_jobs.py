@@ -0,0 +1,96 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import config, jobs, models
+from app.database import get_db
+from app.main import app
+
+calls = []
+
+@jobs.handler("test_echo")
+def _echo(payload, progress):
+    progress.update(1, 1, "echoed", force=True)
+    return {"echo": payload["value"]}
+
+@jobs.handler("test_flaky")
+def _flaky(payload, progress):
+    calls.append(payload)
+    if len(calls) < 2:
+        raise RuntimeError("transient")
+    return {"calls": len(calls)}
+
+@pytest.fixture
+def sessions(tmp_path, monkeypatch):
+    """A session factory on an empty database of its own, used by the queue and GET /jobs."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    models.Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(jobs, "SessionLocal", factory)
+
+    def get_test_db():
+        with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = get_test_db
+    yield factory
+    app.dependency_overrides.pop(get_db, None)
+    engine.dispose()
+
+@pytest.fixture
+def db(sessions):
+    with sessions() as session:
+        yield session
+
+def _claim(job_id):
+    row = jobs._claim_next()
+    assert row is not None and row[0] == job_id
+    return row
+
+def test_enqueue_rejects_unknown_kind(db):
+    with pytest.raises(ValueError):
+        jobs.enqueue(db, "no_such_kind")
+
+def test_failed_job_is_retried_with_backoff(db, monkeypatch):
+    monkeypatch.setattr(config, "JOB_RETRY_BASE_SECONDS", 0)
+    calls.clear()
+    job = jobs.enqueue(db, "test_flaky", {"n": 1}, max_attempts=3)
+
+    jobs._run(_claim(job.id))
+    db.refresh(job)
+    assert (job.status, job.attempts, job.error) == ("queued", 1, "transient")
+
+    jobs._run(_claim(job.id))
+    db.refresh(job)
+    assert (job.status, job.attempts, job.error) == ("succeeded", 2, None)
+    assert jobs._claim_next() is None
+
+def test_job_runs_in_worker_and_reports_status(sessions):
+    with TestClient(app) as client:
+        with sessions() as session:
+            job_id = jobs.enqueue(session, "test_echo", {"value": "hi"}).id
+        deadline = time.time() + 30
+        body = client.get(f"/jobs/{job_id}").json()
+        while body["status"] in ("queued", "running") and time.time() < deadline:
+            time.sleep(0.1)
+            body = client.get(f"/jobs/{job_id}").json()
+        assert body["status"] == "succeeded"
+        assert body["result"] == {"echo": "hi"}
+        assert body["progress_message"] == "echoed"
+        assert client.get("/jobs/999999999").status_code == 404
+
+def test_interrupted_jobs_are_requeued_unless_out_of_attempts(db):
+    retryable = jobs.enqueue(db, "test_echo", {"value": 1}, max_attempts=2)
+    last_try = jobs.enqueue(db, "test_echo", {"value": 2}, max_attempts=1)
+    _claim(retryable.id)
+    _claim(last_try.id)
+
+    assert jobs.recover_interrupted_jobs() == 1
+    db.refresh(retryable)
+    db.refresh(last_try)
+    assert (retryable.status, retryable.attempts) == ("queued", 1)
+    assert (last_try.status, last_try.error) == ("failed", "Interrupted on its last attempt")
+    assert last_try.finished_at is not None
@@ -0,0 +1,44 @@
+import logging
+import queue
+
+from fastapi.testclient import TestClient
+
+from app import logging_config
+from app.logging_config import StructuredFormatter, _DeferredQueueHandler
+from app.main import app
+
+def test_records_are_merged_on_the_calling_thread():
+    log_queue = queue.SimpleQueue()
+    logger = logging.getLogger("app.test_logging_config")
+    logger.propagate = False
+    logger.addHandler(_DeferredQueueHandler(log_queue))
+    try:
+        items = ["a"]
+        logger.warning("items: %s", items, extra={"request_id": 7})
+        items.append("b")  # changed after logging: the message keeps the old value
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            logger.exception("failed")
+    finally:
+        logger.handlers.clear()
+        logger.propagate = True
+
+    record = log_queue.get_nowait()
+    assert (record.msg, record.args) == ("items: ['a']", None)
+    line = StructuredFormatter().format(record)
+    assert "WARNING app.test_logging_config items: ['a'] request_id=7" in line
+
+    failed = log_queue.get_nowait()
+    assert failed.exc_info is None
+    assert "RuntimeError: boom" in StructuredFormatter().format(failed)
+
+def _queue_handlers():
+    return [h for h in logging.getLogger().handlers if isinstance(h, _DeferredQueueHandler)]
+
+def test_listener_runs_only_while_the_app_is_up():
+    assert logging_config._listener is None and _queue_handlers() == []
+    with TestClient(app):
+        assert logging_config._listener._thread.is_alive()
+        assert len(_queue_handlers()) == 1
+    assert logging_config._listener is None and _queue_handlers() == []
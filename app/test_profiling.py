@@ -0,0 +1,66 @@
+import os
+import time
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app import config
+from app.profiling import ProfilingMiddleware, install_sql_capture
+
+engine = create_engine("sqlite://")
+install_sql_capture(engine)
+
+profiled = FastAPI()
+profiled.add_middleware(ProfilingMiddleware)
+
+def busy(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+@profiled.get("/slow")
+def slow_endpoint():
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    busy(0.1)
+    return {"ok": True}
+
+@profiled.get("/stream")
+def stream_endpoint():
+    def rows():
+        yield "header\n"
+        busy(0.1)  # after the first byte
+        with engine.connect() as conn:
+            yield f"{conn.execute(text('SELECT 42')).scalar()}\n"
+    return StreamingResponse(rows(), media_type="text/csv")
+
+client = TestClient(profiled)
+
+def profile(monkeypatch, tmp_path, path):
+    monkeypatch.setattr(config, "PROFILES_DIR", str(tmp_path))
+    monkeypatch.setattr(config, "PROFILE_SAMPLE_INTERVAL", 0.001)
+    monkeypatch.setattr(config, "PROFILE_TOKEN", None)
+    response = client.get(path, headers={config.PROFILE_HEADER: "1"})
+    assert response.status_code == 200
+    base = os.path.join(str(tmp_path), response.headers["X-Profile-Id"])
+    with open(f"{base}.folded") as folded, open(f"{base}.sql.log") as sql_log:
+        return response, folded.read(), sql_log.read()
+
+def test_slow_request_is_sampled(monkeypatch, tmp_path):
+    _, folded, sql_log = profile(monkeypatch, tmp_path, "/slow")
+    assert "test_profiling.py:busy" in folded
+    assert "SELECT 1" in sql_log
+
+def test_streamed_body_is_profiled_to_the_end(monkeypatch, tmp_path):
+    response, folded, sql_log = profile(monkeypatch, tmp_path, "/stream")
+    assert response.text == "header\n42\n"
+    assert "test_profiling.py:rows;test_profiling.py:busy" in folded
+    assert "SELECT 42" in sql_log
+
+def test_requests_without_the_header_are_not_profiled(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "PROFILES_DIR", str(tmp_path))
+    response = client.get("/slow")
+    assert "X-Profile-Id" not in response.headers
+    assert os.listdir(str(tmp_path)) == []
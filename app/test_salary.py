@@ -0,0 +1,68 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app import migrations, models
+from app.database import SessionLocal
+from app.main import app
+from app.salary import parse_salary
+
+client = TestClient(app)
+
+@pytest.mark.parametrize("text_value, expected", [
+    ("100000", (100000, 100000)),
+    ("$120k", (120000, 120000)),
+    ("160000-200000", (160000, 200000)),
+    ("$120k - $140k", (120000, 140000)),
+    ("120-140k", (120000, 140000)),
+    ("100,000 - 120,000 USD", (100000, 120000)),
+    ("$55/hr", (114400, 114400)),
+    ("$90k to $110k", (90000, 110000)),
+    ("120k–140k", (120000, 140000)),
+    ("$120k + 10% bonus", (120000, 120000)),
+    ("$150k, 401k match", (150000, 150000)),
+    ("120000 (2 weeks PTO)", (120000, 120000)),
+    ("3 years exp, $130k", (130000, 130000)),
+    ("10% equity", (None, None)),
+    ("Competitive", (None, None)),
+    (None, (None, None)),
+])
+def test_parse_salary(text_value, expected):
+    assert parse_salary(text_value) == expected
+
+def test_upgrade_adds_and_backfills_salary_range(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE applications (id INTEGER PRIMARY KEY, company VARCHAR NOT NULL, "
+                          "role VARCHAR NOT NULL, status VARCHAR NOT NULL, salary VARCHAR)"))
+        conn.execute(text("INSERT INTO applications (company, role, status, salary) VALUES "
+                          "('A', 'Eng', 'Applied', '$90k-$110k'), ('B', 'PM', 'Applied', NULL)"))
+    migrations.upgrade(engine)
+    migrations.upgrade(engine)  # idempotent
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT salary_min, salary_max FROM applications ORDER BY id")).all()
+    assert [tuple(row) for row in rows] == [(90000, 110000), (None, None)]
+
+def test_salary_filters_and_numeric_sort():
+    with SessionLocal() as db:
+        rows = [
+            models.Application(company="Pay Co", role=role, status="Applied", salary=salary)
+            for role, salary in [("A", "$95k"), ("B", "100000-150000"), ("C", "$200k"), ("D", None)]
+        ]
+        db.add_all(rows)
+        db.commit()
+        ids = [row.id for row in rows]
+        assert (rows[1].salary_min, rows[1].salary_max) == (100000, 150000)
+    try:
+        listed = client.get("/applications/", params={"search": "Pay Co", "sort_by": "salary", "sort_order": "desc"}).json()
+        assert [a["role"] for a in listed] == ["C", "B", "A", "D"]
+        filtered = client.get("/applications/", params={"search": "Pay Co", "salary_min": 96000, "salary_max": 160000}).json()
+        assert [a["role"] for a in filtered] == ["B"]
+
+        response = client.put(f"/applications/{ids[0]}", data={"company": "Pay Co", "role": "A", "status": "Applied", "salary": "$300k"})
+        assert response.status_code == 200
+        assert response.json()["salary_min"] == 300000
+    finally:
+        with SessionLocal() as db:
+            db.query(models.Application).filter(models.Application.id.in_(ids)).delete()
+            db.commit()
@@ -0,0 +1,76 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app import main, migrations, models, statuses
+from app.database import SessionLocal
+from app.main import app
+
+client = TestClient(app)
+
+def test_statuses_endpoint_returns_dictionary_in_order():
+    response = client.get("/statuses")
+    assert response.status_code == 200
+    body = response.json()
+    names = [entry["name"] for entry in body]
+    assert names[:3] == ["Not Yet Applied", "Applied", "Interviewing"]
+    assert [entry["sort_order"] for entry in body] == sorted(entry["sort_order"] for entry in body)
+    assert all(entry["color"].startswith("#") for entry in body)
+
+def test_status_names_resolve_to_ids_and_typos_are_rejected():
+    form = {"company": "Status Co", "role": "Engineer", "status": "  interviewing "}
+    created = client.post("/applications/", data=form)
+    assert created.status_code == 200
+    app_id = created.json()["id"]
+    try:
+        assert created.json()["status"] == "Interviewing"
+        with SessionLocal() as db:
+            assert db.get(models.Application, app_id).status_id == statuses.id_for("Interviewing")
+        listed = client.get("/applications/", params={"search": "Status Co", "status": "Interviewing"}).json()
+        assert [a["id"] for a in listed] == [app_id]
+        assert client.get("/applications/", params={"search": "Status Co", "status": "Intervewing"}).json() == []
+
+        assert client.post("/applications/", data={**form, "status": "Intervewing"}).status_code == 422
+        assert client.patch(f"/applications/{app_id}", json={"status": "Intervewing"}).status_code == 422
+        assert client.get(f"/applications/{app_id}").json()["status"] == "Interviewing"
+    finally:
+        client.delete(f"/applications/{app_id}")
+
+def test_unknown_status_on_create_is_a_warning_not_a_traceback(monkeypatch):
+    logged = []
+    monkeypatch.setattr(main.logger, "exception", lambda *args, **kwargs: logged.append(("exception", args)))
+    monkeypatch.setattr(main.logger, "warning", lambda *args, **kwargs: logged.append(("warning", args)))
+    response = client.post("/applications/", data={"company": "Status Co", "role": "Engineer", "status": "Intervewing"})
+    assert response.status_code == 422
+    assert "Unknown status" in response.json()["detail"]
+    assert [level for level, _ in logged] == ["warning"]
+
+def test_demo_routes_reject_unknown_statuses():
+    form = {"company": "Demo Status Co", "role": "Engineer", "status": "Intervewing"}
+    assert client.post("/demo/applications/", data=form).status_code == 422
+    created = client.post("/demo/applications/", data={**form, "status": "Applied"})
+    assert created.status_code == 200
+    app_id = created.json()["id"]
+    try:
+        assert client.put(f"/demo/applications/{app_id}", data={"status": "Intervewing"}).status_code == 422
+        assert client.get(f"/demo/applications/{app_id}").json()["status"] == "Applied"
+    finally:
+        client.delete(f"/demo/applications/{app_id}")
+
+def test_upgrade_backfills_status_ids(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE applications (id INTEGER PRIMARY KEY, company VARCHAR NOT NULL, "
+                          "role VARCHAR NOT NULL, status VARCHAR NOT NULL)"))
+        conn.execute(text("INSERT INTO applications (company, role, status) VALUES "
+                          "('A', 'Eng', 'applied'), ('B', 'PM', 'On Hold'), ('C', 'PM', ' Phone  Screen'), "
+                          "('D', 'PM', 'phone screen'), ('E', 'PM', 'Not  yet   applied')"))
+    migrations.upgrade(engine)
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT a.status, s.name FROM applications a JOIN statuses s ON s.id = a.status_id ORDER BY a.id")).all()
+        added = conn.execute(text("SELECT name FROM statuses WHERE sort_order = 1000 ORDER BY name")).scalars().all()
+    # Matched like names on write: case-insensitive, any run of whitespace as one space
+    assert [tuple(row) for row in rows] == [
+        ("Applied", "Applied"), ("On Hold", "On Hold"), ("Phone Screen", "Phone Screen"),
+        ("Phone Screen", "Phone Screen"), ("Not Yet Applied", "Not Yet Applied"),
+    ]
+    assert added == ["On Hold", "Phone Screen"]
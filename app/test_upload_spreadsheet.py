@@ -0,0 +1,113 @@
+import datetime
+import time
+
+import openpyxl
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app import config, migrations, models, upload_spreadsheet
+from app.database import SessionLocal, engine
+from app.main import app
+
+def test_normalize_chunk_parses_columns():
+    raw = pd.DataFrame({
+        "Company ": ["Acme", "Globex", None],
+        "Role": ["Engineer", "PM", None],
+        "Status": ["Applied", "Rejected", None],
+        "Application Date": ["03/04/2024", datetime.datetime(2024, 5, 6), "not a date"],
+        "Follow Up Required": ["Yes", None, "no"],
+        "Order number": [1, "2", None],
+        "Unrelated": ["x", "y", "z"],
+        "URL": [None, " ", None],
+    })
+    df = upload_spreadsheet.normalize_chunk(raw)
+    assert "Unrelated" not in df.columns
+    assert df["application_date"].tolist() == [datetime.date(2024, 3, 4), datetime.date(2024, 5, 6), None]
+    assert df["follow_up_required"].tolist() == [True, False, False]
+    assert df["order_number"].tolist() == [1, 2, None]
+    assert df["url"].tolist() == [None, None, None]
+
+    valid, errors, warnings, rejected, parsed = upload_spreadsheet.validate_chunk(raw, df, first_row=2)
+    assert valid["company"].tolist() == ["Acme", "Globex"]
+    assert (rejected, parsed) == (1, 3)
+    assert [(e.row, e.column, e.value) for e in errors] == [(4, "Company", None), (4, "Role", None), (4, "Status", None)]
+    assert [(w.row, w.column, w.value) for w in warnings] == [(4, "Application Date", "not a date")]
+
+def test_unreadable_dates_are_imported_as_missing():
+    raw = pd.DataFrame({
+        "Company": ["Acme", "Globex"], "Role": ["Engineer", "PM"], "Status": ["Applied", "Applied"],
+        "Application Date": ["N/A", "X"],
+    })
+    valid, errors, warnings, rejected, parsed = upload_spreadsheet.validate_chunk(raw, upload_spreadsheet.normalize_chunk(raw), first_row=2)
+    assert valid["application_date"].tolist() == [None, None]
+    assert (errors, rejected, parsed) == ([], 0, 2)
+    assert [(w.row, w.value) for w in warnings] == [(2, "N/A"), (3, "X")]
+
+def test_iter_chunks_streams_xlsx(tmp_path):
+    path = tmp_path / "apps.xlsx"
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Sheet1"
+    sheet.append(["Company", "Role", "Status"])
+    for i in range(7):
+        sheet.append([f"Co{i}", "Engineer", "Applied"])
+    workbook.save(path)
+
+    chunks = list(upload_spreadsheet.iter_chunks(str(path), chunk_size=3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert chunks[-1]["Company"].tolist() == ["Co6"]
+
+def test_import_endpoint_reports_progress_and_row_errors(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "IMPORT_FOLDER", str(tmp_path))
+    csv = b"Order number,Company,Role,Status,Application Date\n1,Importer Co,Engineer,Applied,03/04/2024\nx,Importer Co,PM,,2024-13-40\n,,,,\n"
+    with TestClient(app) as client:
+        response = client.post("/imports", files={"file": ("apps.csv", csv, "text/csv")}, follow_redirects=False)
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        deadline = time.time() + 30
+        body = client.get(f"/imports/{job_id}").json()
+        while body["status"] in ("queued", "running") and time.time() < deadline:
+            time.sleep(0.1)
+            body = client.get(f"/imports/{job_id}").json()
+        try:
+            assert body["status"] == "succeeded"
+            assert (body["parsed"], body["inserted"], body["rejected"]) == (2, 1, 1)
+            assert [(e["row"], e["column"]) for e in body["errors"]] == [(3, "Order number"), (3, "Status")]
+            assert [(w["row"], w["column"]) for w in body["warnings"]] == [(3, "Application Date")]
+            assert list(tmp_path.iterdir()) == []
+        finally:
+            with SessionLocal() as db:
+                db.query(models.Application).filter(models.Application.company == "Importer Co").delete()
+                db.commit()
+
+def test_import_rejects_other_file_types():
+    response = TestClient(app).post("/imports", files={"file": ("apps.pdf", b"%PDF-1.4", "application/pdf")})
+    assert response.status_code == 400
+
+def test_incremental_import_upserts_by_natural_key(tmp_path):
+    path = tmp_path / "sync.csv"
+    header = "Order number,Company,Role,Status\n"
+    rows = ["9001,Sync Co,Engineer,Applied", "9002,Sync Co,PM,Applied"]
+    path.write_text(header + "\n".join(rows))
+    migrations.upgrade(engine)
+    try:
+        first = upload_spreadsheet.upload_spreadsheet(str(path), key="order_number")
+        assert (first.inserted, first.updated, first.unchanged) == (2, 0, 0)
+
+        path.write_text(header + "\n".join([rows[0], "9002,Sync Co,PM,Interviewing", "9003,Sync Co,SRE,Applied"]))
+        second = upload_spreadsheet.upload_spreadsheet(str(path), key="order_number")
+        assert (second.inserted, second.updated, second.unchanged) == (1, 1, 1)
+
+        with SessionLocal() as db:
+            synced = db.query(models.Application).filter(models.Application.company == "Sync Co").order_by(models.Application.order_number).all()
+            assert [(a.order_number, a.status) for a in synced] == [(9001, "Applied"), (9002, "Interviewing"), (9003, "Applied")]
+    finally:
+        with SessionLocal() as db:
+            db.query(models.Application).filter(models.Application.company == "Sync Co").delete()
+            db.commit()
+
+def test_parse_key_rejects_unknown_columns():
+    assert upload_spreadsheet.parse_key("company, role,url") == ["company", "role", "url"]
+    with pytest.raises(ValueError):
+        upload_spreadsheet.parse_key("company,favourite_colour")
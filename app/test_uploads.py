@@ -0,0 +1,173 @@
+import hashlib
+import io
+import os
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app import config, uploads
+
+@pytest.fixture
+def upload_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "UPLOAD_FOLDER", str(tmp_path))
+    return tmp_path
+
+def test_store_upload_accepts_matching_pdf(upload_folder):
+    """A PDF with a PDF signature is streamed into place under its content hash"""
+    content = b"%PDF-1.7\n" + b"x" * 5000
+    stored = uploads.store_upload(io.BytesIO(content), "resume.pdf")
+    assert stored.stored_name == hashlib.sha256(content).hexdigest() + ".pdf"
+    assert stored.original_filename == "resume.pdf"
+    assert stored.mime_type == "application/pdf"
+    assert (upload_folder / stored.stored_name).stat().st_size == 5009
+    assert [p.name for p in upload_folder.iterdir()] == [stored.stored_name]
+
+def test_store_upload_deduplicates_identical_content(upload_folder):
+    """Uploading the same bytes twice keeps a single blob"""
+    first = uploads.store_upload(io.BytesIO(b"%PDF-1.7 same"), "resume.pdf")
+    second = uploads.store_upload(io.BytesIO(b"%PDF-1.7 same"), "resume-copy.pdf")
+    assert first.stored_name == second.stored_name
+    assert second.original_filename == "resume-copy.pdf"
+    assert os.listdir(upload_folder) == [first.stored_name]
+
+@pytest.mark.parametrize("filename, content, status_code", [
+    ("resume.exe", b"MZ...", 400),
+    ("resume.pdf", b"PK\x03\x04 not a pdf", 400),
+    ("notes.txt", b"\x00\x01\x02", 400),
+    ("resume.pdf", b"", 400),
+])
+def test_store_upload_rejects_bad_files(upload_folder, filename, content, status_code):
+    """Rejected uploads raise and leave no partial file behind"""
+    with pytest.raises(HTTPException) as exc_info:
+        uploads.store_upload(io.BytesIO(content), filename)
+    assert exc_info.value.status_code == status_code
+    assert os.listdir(upload_folder) == []
+
+def test_store_upload_enforces_size_limit_while_streaming(upload_folder, monkeypatch):
+    """Files over the limit are rejected with 413"""
+    monkeypatch.setattr(config, "MAX_UPLOAD_SIZE_MB", 0.01)
+    monkeypatch.setattr(config, "UPLOAD_CHUNK_SIZE", 1024)
+    with pytest.raises(HTTPException) as exc_info:
+        uploads.store_upload(io.BytesIO(b"hello world\n" * 2000), "cover.txt")
+    assert exc_info.value.status_code == 413
+    assert os.listdir(upload_folder) == []
+
+def test_repeated_upload_shares_one_reference_counted_document(upload_folder):
+    """Applications that upload the same resume share one documents row"""
+    from fastapi.testclient import TestClient
+    from app.database import SessionLocal
+    from app.main import app
+    from app.models import Document
+
+    client = TestClient(app)
+    content = b"%PDF-1.7 shared resume " + os.urandom(8).hex().encode()
+    sha256 = hashlib.sha256(content).hexdigest()
+    form = {"company": "Dedup Co", "role": "Engineer", "status": "Applied"}
+
+    app_ids = []
+    for name in ("resume.pdf", "resume (1).pdf"):
+        response = client.post("/applications/", data=form, files={"resume_file": (name, content, "application/pdf")})
+        assert response.status_code == 200
+        assert response.json()["resume_file"] == f"{sha256}.pdf"
+        app_ids.append(response.json()["id"])
+
+    with SessionLocal() as db:
+        document = db.query(Document).filter(Document.sha256 == sha256).one()
+        assert document.ref_count == 2
+        assert sorted(link.original_filename for link in document.links) == ["resume (1).pdf", "resume.pdf"]
+
+    for app_id in app_ids:
+        assert client.delete(f"/applications/{app_id}").status_code == 200
+
+    with SessionLocal() as db:
+        assert db.query(Document.ref_count).filter(Document.sha256 == sha256).scalar() == 0
+
+def test_collect_orphans_removes_only_old_unreferenced_files(upload_folder, monkeypatch):
+    """The collector keeps referenced and recent files and reports reclaimed bytes"""
+    from app import upload_gc
+
+    old = time.time() - 3 * 24 * 3600
+    for name, content in [("keep.pdf", b"%PDF-keep"), ("orphan.pdf", b"%PDF-orphan"), (".upload-x.part", b"partial")]:
+        path = upload_folder / name
+        path.write_bytes(content)
+        os.utime(path, (old, old))
+    (upload_folder / "fresh.pdf").write_bytes(b"%PDF-fresh")
+    monkeypatch.setattr(upload_gc, "referenced_filenames", lambda db, uploaded_since=None: {"keep.pdf"})
+
+    report = upload_gc.collect_orphans(db=None, grace_hours=24, quarantine=True, dry_run=True)
+    assert (report.removed, report.reclaimed_bytes) == (2, len(b"%PDF-orphan") + len(b"partial"))
+    assert len(os.listdir(upload_folder)) == 4
+
+    from app.database import SessionLocal
+    with SessionLocal() as db:
+        report = upload_gc.collect_orphans(db, grace_hours=24, quarantine=True)
+    assert sorted(os.listdir(upload_folder)) == [upload_gc.QUARANTINE_DIR, "fresh.pdf", "keep.pdf"]
+    assert sorted(os.listdir(upload_folder / upload_gc.QUARANTINE_DIR)) == [".upload-x.part", "orphan.pdf"]
+
+def test_reuploads_leave_the_blob_alone_but_hold_off_the_collector(upload_folder):
+    """Deduplicating keeps the stored file as it was; the upload is noted in the database instead"""
+    from app import upload_gc
+    from app.database import SessionLocal
+    from app.models import Document
+
+    content = b"%PDF-1.7 reupload " + os.urandom(8).hex().encode()
+    first = uploads.store_upload(io.BytesIO(content), "resume.pdf")
+    path = upload_folder / first.stored_name
+    old = time.time() - 3 * 24 * 3600
+    os.utime(path, (old, old))
+    with SessionLocal() as db:
+        # Nothing links the blob and the file is old: an orphan
+        db.query(Document).filter(Document.sha256 == first.sha256).update({"last_uploaded_at": None})
+        db.commit()
+        assert first.stored_name not in upload_gc.referenced_filenames(db, upload_gc.datetime.utcnow())
+
+    uploads.store_upload(io.BytesIO(content), "resume (1).pdf")
+    assert path.stat().st_mtime == old
+    with SessionLocal() as db:
+        report = upload_gc.collect_orphans(db, grace_hours=24)
+    assert report.removed == 0 and path.exists()
+
+def test_failed_document_link_rolls_back_the_application(upload_folder, monkeypatch):
+    """The application row and its document links are written in one transaction"""
+    from fastapi.testclient import TestClient
+    from app import documents
+    from app.database import SessionLocal
+    from app.main import app
+    from app.models import Application
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(documents, "attach", fail)
+    response = TestClient(app).post(
+        "/applications/", data={"company": "Atomic Co", "role": "Engineer", "status": "Applied"},
+        files={"resume_file": ("resume.pdf", b"%PDF-1.7 atomic", "application/pdf")},
+    )
+    assert response.status_code != 200
+    with SessionLocal() as db:
+        assert db.query(Application).filter(Application.company == "Atomic Co").count() == 0
+
+def test_regenerating_demo_data_releases_demo_documents(upload_folder):
+    """Dropping the demo tables gives back their document references"""
+    from fastapi.testclient import TestClient
+    from app import demo_data
+    from app.database import SessionLocal
+    from app.main import app
+    from app.models import ApplicationDocument, Document
+
+    content = b"%PDF-1.7 demo resume " + os.urandom(8).hex().encode()
+    sha256 = hashlib.sha256(content).hexdigest()
+    response = TestClient(app).post(
+        "/demo/applications/", data={"company": "Demo Docs", "role": "Engineer", "status": "Applied"},
+        files={"resume_file": ("resume.pdf", content, "application/pdf")},
+    )
+    assert response.status_code == 200
+    with SessionLocal() as db:
+        assert db.query(Document.ref_count).filter(Document.sha256 == sha256).scalar() == 1
+
+    demo_data.initialize_demo_data()
+    with SessionLocal() as db:
+        assert db.query(Document.ref_count).filter(Document.sha256 == sha256).scalar() == 0
+        assert db.query(ApplicationDocument).filter(
+            ApplicationDocument.application_table == "demo_applications").count() == 0
@@ -0,0 +1,66 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app import migrations
+from app.database import engine
+from app.main import app
+from app.urls import canonicalize_url
+
+client = TestClient(app)
+
+def test_canonicalize_url_drops_cosmetic_differences():
+    assert canonicalize_url("HTTP://www.Example.com/jobs/1/?utm_source=x&b=2&a=1#apply") == "https://example.com/jobs/1?a=1&b=2"
+    assert canonicalize_url("example.com/jobs/1") == "https://example.com/jobs/1"
+    assert canonicalize_url("https://Example.com:443/Jobs/1") == "https://example.com/Jobs/1"
+    assert canonicalize_url("https://boards.greenhouse.io/acme/jobs/123?gh_src=abc") == "https://boards.greenhouse.io/acme/jobs/123"
+    assert canonicalize_url("   ") is None
+
+def test_unparseable_urls_are_kept_as_typed():
+    assert canonicalize_url(" http://example.com:abc/x ") == "http://example.com:abc/x"
+    assert canonicalize_url("http://example.com:99999/x") == "http://example.com:99999/x"
+    assert canonicalize_url("https://[::1/jobs") == "https://[::1/jobs"
+    assert canonicalize_url("https://exa]mple.com/jobs") == "https://exa]mple.com/jobs"
+    app_id = client.post("/applications/", data={"company": "Port Co", "role": "Engineer", "status": "Applied",
+                                                 "url": "http://example.com:abc/x"}).json()["id"]
+    try:
+        response = client.get("/applications/", params={"url": "http://example.com:abc/x"})
+        assert response.status_code == 200
+        assert [a["id"] for a in response.json()] == [app_id]
+    finally:
+        client.delete(f"/applications/{app_id}")
+
+def test_list_filters_on_canonical_url():
+    form = {"company": "Url Co", "role": "Engineer", "status": "Applied",
+            "url": "https://www.url-co.example/careers/7/?utm_campaign=spring"}
+    app_id = client.post("/applications/", data=form).json()["id"]
+    try:
+        created = client.get(f"/applications/{app_id}").json()
+        assert created["canonical_url"] == "https://url-co.example/careers/7"
+        found = client.get("/applications/", params={"url": "url-co.example/careers/7#top"}).json()
+        assert [a["id"] for a in found] == [app_id]
+        assert client.get("/applications/", params={"url": "https://url-co.example/careers/8"}).json() == []
+
+        client.put(f"/applications/{app_id}", data={**form, "url": "https://url-co.example/careers/8?trk=feed"})
+        assert [a["id"] for a in client.get("/applications/", params={"url": "url-co.example/careers/8"}).json()] == [app_id]
+    finally:
+        client.delete(f"/applications/{app_id}")
+
+def test_url_lookup_uses_the_index():
+    with engine.connect() as conn:
+        plan = conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM applications WHERE canonical_url = 'https://example.com'"
+        )).all()
+    assert "ix_applications_canonical_url" in " ".join(str(row[-1]) for row in plan)
+
+def test_upgrade_backfills_canonical_urls(tmp_path):
+    old = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with old.begin() as conn:
+        conn.execute(text("CREATE TABLE applications (id INTEGER PRIMARY KEY, company VARCHAR NOT NULL, "
+                          "role VARCHAR NOT NULL, status VARCHAR NOT NULL, url VARCHAR)"))
+        conn.execute(text("INSERT INTO applications (company, role, status, url) VALUES "
+                          "('A', 'Eng', 'Applied', 'HTTP://WWW.A.example/jobs/1/?utm_source=x'), ('B', 'PM', 'Applied', NULL), "
+                          "('C', 'PM', 'Applied', 'http://c.example:abc/jobs')"))
+    migrations.upgrade(old)
+    with old.connect() as conn:
+        rows = conn.execute(text("SELECT canonical_url FROM applications ORDER BY id")).scalars().all()
+    assert rows == ["https://a.example/jobs/1", None, "http://c.example:abc/jobs"]
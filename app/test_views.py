@@ -0,0 +1,84 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.database import engine
+from app.main import app
+
+client = TestClient(app)
+
+VIEW = {
+    "name": "Viewco interviewing, follow-up",
+    "filters": {"search": "Viewco", "status": "Interviewing", "follow_up_required": True},
+    "sort_model": [{"field": "application_date", "sort": "desc"}],
+}
+
+def create(company, date=None, status="Interviewing", follow_up="true"):
+    data = {"company": company, "role": "Engineer", "status": status, "follow_up_required": follow_up}
+    if date:
+        data["application_date"] = date
+    return client.post("/applications/", data=data).json()["id"]
+
+def companies(view_id, **params):
+    body = client.get(f"/views/{view_id}/applications", params=params).json()
+    return [row["company"] for row in body["rows"]], body["total"]
+
+@pytest.fixture
+def view():
+    response = client.post("/views/", json=VIEW)
+    assert response.status_code == 201, response.text
+    yield response.json()
+    client.delete(f"/views/{response.json()['id']}")
+
+def test_view_follows_writes_incrementally(view):
+    ids = [create("Viewco A", "2025-01-01"), create("Viewco B", "2025-03-01"), create("Viewco C"),
+           create("Viewco D", "2025-02-01", status="Applied")]
+    try:
+        assert companies(view["id"]) == (["Viewco B", "Viewco A", "Viewco C"], 3)
+        assert companies(view["id"], page=1, page_size=2) == (["Viewco C"], 3)
+
+        # D enters the view, B moves to the end, A leaves it
+        client.put(f"/applications/{ids[3]}", data={"company": "Viewco D", "role": "Engineer", "status": "Interviewing",
+                                                    "follow_up_required": "true", "application_date": "2025-02-01"})
+        client.put(f"/applications/{ids[1]}", data={"company": "Viewco B", "role": "Engineer", "status": "Interviewing",
+                                                    "follow_up_required": "true", "application_date": "2024-12-01"})
+        client.put(f"/applications/{ids[0]}", data={"company": "Viewco A", "role": "Engineer", "status": "Rejected",
+                                                    "follow_up_required": "true"})
+        client.delete(f"/applications/{ids.pop(2)}")
+        assert companies(view["id"]) == (["Viewco D", "Viewco B"], 2)
+    finally:
+        for app_id in ids:
+            client.delete(f"/applications/{app_id}")
+
+def test_cached_view_opens_with_one_primary_key_fetch(view):
+    ids = [create("Viewco E", "2025-01-05"), create("Viewco F", "2025-01-06")]
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    try:
+        companies(view["id"])  # builds the cached list
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            assert companies(view["id"], page_size=1) == (["Viewco F"], 2)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        selects = [statement for statement in statements if statement.lstrip().upper().startswith("SELECT")]
+        assert len(selects) == 1
+        assert "applications.id IN" in selects[0]
+    finally:
+        for app_id in ids:
+            client.delete(f"/applications/{app_id}")
+
+def test_view_crud_and_validation(view):
+    assert client.get(f"/views/{view['id']}").json()["filters"] == VIEW["filters"]
+    assert view["id"] in [v["id"] for v in client.get("/views/").json()]
+    assert client.post("/views/", json=VIEW).status_code == 409
+    assert client.post("/views/", json={"name": "bad", "filters": {"document_search": "x"}}).status_code == 400
+    assert client.post("/views/", json={"name": "bad", "sort_model": [{"field": "import_key"}]}).status_code == 400
+
+    renamed = client.put(f"/views/{view['id']}", json={**VIEW, "name": "Renamed", "filters": {"search": "Nothing-matches"}})
+    assert renamed.json()["name"] == "Renamed"
+    assert companies(view["id"]) == ([], 0)
+    assert client.get("/views/999999/applications").status_code == 404
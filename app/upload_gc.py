@@ -0,0 +1,152 @@
+"""Garbage collector for orphaned files in the upload folder.
+
+A file is kept if any real or demo application references it (``resume_file``
+or ``cover_letter_file``, stored as a bare filename or a legacy path), or if a
+``documents`` row still counts references to it. Everything else that is older
+than the grace period is deleted, or moved to ``<upload folder>/.quarantine``.
+The grace period protects uploads whose application row has not been committed
+yet. It runs from the file's mtime, or from the blob's ``last_uploaded_at``
+when the same content was uploaded again later (stored blobs are never
+touched). Leftover ``.part`` files from interrupted uploads are collected too.
+
+Run it by hand::
+
+    python -m app.upload_gc --grace-hours 24 --dry-run
+
+or set ``JOBTRACKER_UPLOAD_GC_INTERVAL_MINUTES`` to run it periodically inside the API.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator, Optional, Set
+
+from sqlalchemy import or_, select, union_all
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app import config, models
+from app.database import SessionLocal, engine
+from app.demo_models import DemoApplication
+
+logger = logging.getLogger(__name__)
+
+QUARANTINE_DIR = ".quarantine"
+
+@dataclass
+class GCReport:
+    scanned: int = 0
+    kept: int = 0
+    removed: int = 0
+    reclaimed_bytes: int = 0
+    dry_run: bool = False
+    quarantine: bool = False
+
+def _iter_referenced_names(db: Session, uploaded_since: Optional[datetime] = None) -> Iterator[str]:
+    """Stream every stored filename referenced from the database (or uploaded after ``uploaded_since``)."""
+    in_use = models.Document.ref_count > 0
+    if uploaded_since is not None:
+        in_use = or_(in_use, models.Document.last_uploaded_at > uploaded_since)
+    file_columns = union_all(
+        select(models.Application.resume_file.label("name")),
+        select(models.Application.cover_letter_file),
+        select(DemoApplication.resume_file),
+        select(DemoApplication.cover_letter_file),
+        select(models.Document.stored_name).where(in_use),
+    )
+    result = db.execute(file_columns.execution_options(yield_per=1000))
+    for (name,) in result:
+        if name:
+            yield os.path.basename(name)
+
+def referenced_filenames(db: Session, uploaded_since: Optional[datetime] = None) -> Set[str]:
+    return set(_iter_referenced_names(db, uploaded_since))
+
+def collect_orphans(
+    db: Session,
+    folder: str = None,
+    grace_hours: float = None,
+    quarantine: bool = None,
+    dry_run: bool = False,
+) -> GCReport:
+    folder = folder or config.UPLOAD_FOLDER
+    grace_hours = config.UPLOAD_GC_GRACE_HOURS if grace_hours is None else grace_hours
+    quarantine = config.UPLOAD_GC_QUARANTINE if quarantine is None else quarantine
+    report = GCReport(dry_run=dry_run, quarantine=quarantine)
+
+    cutoff = time.time() - grace_hours * 3600
+    referenced = referenced_filenames(db, datetime.utcfromtimestamp(cutoff))
+    quarantine_path = os.path.join(folder, QUARANTINE_DIR)
+    removed_names = []
+
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            report.scanned += 1
+            stat = entry.stat(follow_symlinks=False)
+            if entry.name in referenced or stat.st_mtime > cutoff:
+                report.kept += 1
+                continue
+
+            report.removed += 1
+            report.reclaimed_bytes += stat.st_size
+            removed_names.append(entry.name)
+            if dry_run:
+                continue
+            if quarantine:
+                os.makedirs(quarantine_path, exist_ok=True)
+                shutil.move(entry.path, os.path.join(quarantine_path, entry.name))
+            else:
+                os.remove(entry.path)
+
+    if removed_names and not dry_run:
+        # Blob metadata for files that are gone
+        db.query(models.Document).filter(
+            models.Document.stored_name.in_(removed_names),
+            models.Document.ref_count <= 0,
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    logger.info(
+        "Upload GC: scanned %d, kept %d, %s %d, reclaimed %d bytes%s",
+        report.scanned, report.kept, "quarantined" if quarantine else "deleted",
+        report.removed, report.reclaimed_bytes, " (dry run)" if dry_run else "",
+    )
+    return report
+
+def _collect_with_session() -> GCReport:
+    with SessionLocal() as db:
+        return collect_orphans(db)
+
+async def run_periodically(interval_minutes: float):
+    """Background loop started by the API when the GC interval is configured."""
+    while True:
+        await asyncio.sleep(interval_minutes * 60)
+        try:
+            await run_in_threadpool(_collect_with_session)
+        except Exception:
+            logger.exception("Upload GC run failed")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Delete or quarantine unreferenced files in the upload folder.")
+    parser.add_argument("--folder", default=config.UPLOAD_FOLDER)
+    parser.add_argument("--grace-hours", type=float, default=config.UPLOAD_GC_GRACE_HOURS)
+    parser.add_argument("--quarantine", action="store_true", default=config.UPLOAD_GC_QUARANTINE,
+                        help=f"move orphans to {QUARANTINE_DIR}/ instead of deleting them")
+    parser.add_argument("--dry-run", action="store_true", help="report what would be removed without touching files")
+    args = parser.parse_args(argv)
+
+    models.Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        report = collect_orphans(db, args.folder, args.grace_hours, args.quarantine, args.dry_run)
+    action = "Would remove" if report.dry_run else ("Quarantined" if report.quarantine else "Deleted")
+    print(f"Scanned {report.scanned} files, kept {report.kept}. "
+          f"{action} {report.removed} files, reclaiming {report.reclaimed_bytes} bytes.")
+
+if __name__ == "__main__":
+    main()
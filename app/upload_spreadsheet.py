@@ -1,47 +1,406 @@
+"""Bulk import of applications from an .xlsx or .csv spreadsheet.
+
+Rows are streamed in chunks (openpyxl read-only mode for workbooks,
+``read_csv(chunksize=...)`` for CSV), so memory use stays bounded no matter
+how long the sheet is. Each chunk is normalized column-wise with pandas and
+inserted with one Core ``executemany`` and one commit.
+
+With a natural key (``--key order_number`` or ``--key company,role,url``) the
+import is incremental. Each row is stored with its key and a fingerprint of
+its content. On re-import only new or changed rows are written, with
+``INSERT ... ON CONFLICT(import_key) DO UPDATE``, so syncing a large master
+sheet repeatedly neither duplicates rows nor rewrites unchanged ones.
+
+    python -m app.upload_spreadsheet datasample/JobApplicationTracker2025.xlsx --sheet Sheet1 --key order_number
+"""
+import argparse
+import logging
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Iterator, List, Optional
+
 import pandas as pd
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app import companies, config, duplicates, generations, history, jobs, migrations, statuses
+from app.database import engine
 from app.models import Application
-from datetime import datetime
+from app.salary import parse_salary
+from app.urls import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# Spreadsheet header -> applications column
+COLUMN_MAP = {
+    "Order number": "order_number",
+    "Company": "company",
+    "Role": "role",
+    "URL": "url",
+    "Status": "status",
+    "Application Date": "application_date",
+    "Met with": "met_with",
+    "Notes": "notes",
+    "Resume Link": "resume_file",
+    "Cover Letter Link": "cover_letter_file",
+    "Follow Up Required": "follow_up_required",
+    "Pros": "pros",
+    "Cons": "cons",
+    "Salary": "salary",
+}
+HEADER_FOR = {column: header for header, column in COLUMN_MAP.items()}
+_HEADER_ORDER = {header: i for i, header in enumerate(COLUMN_MAP)}
+REQUIRED_COLUMNS = ["company", "role", "status"]
+DERIVED_COLUMNS = ["status_id", "salary_min", "salary_max", "canonical_url"]  # computed from the sheet, not read from it
+DATE_FORMATS = ["%m/%d/%Y", "%Y-%m-%d"]
+TRUE_VALUES = {"true", "yes", "y", "1", "x"}
+
+@dataclass
+class RowError:
+    row: int  # spreadsheet row number, the header being row 1
+    column: Optional[str]  # spreadsheet header, e.g. "Application Date"
+    value: Optional[str]
+    message: str
+
+@dataclass
+class PossibleDuplicate:
+    row: int  # spreadsheet row number
+    application_id: int  # the stored application it resembles
+    score: float
+
+@dataclass
+class ImportResult:
+    parsed: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    rejected: int = 0
+    total: Optional[int] = None  # estimated row count, when the format allows it
+    errors: List[RowError] = field(default_factory=list)
+    warnings: List[RowError] = field(default_factory=list)  # values dropped from rows that were imported
+    duplicates: List[PossibleDuplicate] = field(default_factory=list)
+
+def _iter_xlsx_chunks(file_path: str, sheet_name: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name]
+        header = next(sheet.iter_rows(max_row=1, values_only=True), None)
+        if header is None:
+            return
+        columns = [str(name).strip() if name is not None else f"_unnamed_{i}" for i, name in enumerate(header)]
+        # Without stored dimensions (openpyxl's write-only mode, for one) a row ends at its
+        # last non-empty cell; max_col pads every row to the header width
+        rows = sheet.iter_rows(min_row=2, max_col=len(columns), values_only=True)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            yield pd.DataFrame(chunk, columns=columns)
+    finally:
+        workbook.close()
+
+def iter_chunks(file_path: str, sheet_name: str = "Sheet1", chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Yield the raw rows of the sheet as DataFrames of at most ``chunk_size`` rows."""
+    if file_path.lower().endswith(".csv"):
+        yield from pd.read_csv(file_path, chunksize=chunk_size, dtype=object, skipinitialspace=True)
+    else:
+        yield from _iter_xlsx_chunks(file_path, sheet_name, chunk_size)
+
+def estimate_rows(file_path: str, sheet_name: str = "Sheet1") -> Optional[int]:
+    """Data row count from the workbook dimensions (may include trailing blank rows); None for CSV."""
+    if file_path.lower().endswith(".csv"):
+        return None
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        return max((workbook[sheet_name].max_row or 1) - 1, 0)
+    finally:
+        workbook.close()
+
+def parse_dates(values: pd.Series) -> pd.Series:
+    """Parse a column holding dates in any of ``DATE_FORMATS`` (or already as datetimes)."""
+    parsed = pd.to_datetime(values, format=DATE_FORMATS[0], errors="coerce")
+    for fmt in DATE_FORMATS[1:]:
+        parsed = parsed.fillna(pd.to_datetime(values, format=fmt, errors="coerce"))
+    return parsed.dt.date
 
-def normalize_date(date_str: str):
-    if pd.isna(date_str) or not date_str:
+def parse_booleans(values: pd.Series) -> pd.Series:
+    if pd.api.types.is_bool_dtype(values):
+        return values
+    return values.astype("string").str.strip().str.lower().isin(TRUE_VALUES)
+
+def _map_columns(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.rename(columns=lambda name: str(name).strip())
+    return df[[name for name in df.columns if name in COLUMN_MAP]].rename(columns=COLUMN_MAP)
+
+def _present(values: pd.Series) -> pd.Series:
+    text = values.astype("string").str.strip()
+    return (text.notna() & (text != "")).fillna(False).astype(bool)
+
+def normalize_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    """Map spreadsheet headers to columns and coerce every column to its database type."""
+    df = _map_columns(df)
+    out = pd.DataFrame(index=df.index)
+    for column in COLUMN_MAP.values():
+        if column not in df.columns:
+            out[column] = None
+            continue
+        values = df[column]
+        if column == "application_date":
+            out[column] = parse_dates(values)
+        elif column == "follow_up_required":
+            out[column] = parse_booleans(values)
+        elif column == "order_number":
+            out[column] = pd.to_numeric(values, errors="coerce").round().astype("Int64")
+        else:
+            text = values.astype("string").str.strip()
+            out[column] = text.mask(text == "")
+    if "follow_up_required" in out:
+        out["follow_up_required"] = out["follow_up_required"].fillna(False).astype(bool)
+    # Status names resolve to the dictionary entry; unknown ones are left without an id
+    known = out["status"].map(statuses.lookup, na_action="ignore")
+    out["status"] = known.map(lambda status: status.name, na_action="ignore").fillna(out["status"])
+    out["status_id"] = known.map(lambda status: status.id, na_action="ignore").astype("Int64")
+    salary_range = out["salary"].map(parse_salary, na_action="ignore")
+    out["salary_min"] = salary_range.str[0].astype("Int64")
+    out["salary_max"] = salary_range.str[1].astype("Int64")
+    out["canonical_url"] = out["url"].map(canonicalize_url, na_action="ignore")
+    return out.astype(object).where(out.notna(), None)
+
+def parse_key(spec: Optional[str]) -> Optional[List[str]]:
+    """Parse a natural key spec such as ``"company,role,url"`` into column names."""
+    if not spec:
         return None
+    columns = [part.strip() for part in spec.split(",") if part.strip()]
+    unknown = [column for column in columns if column not in HEADER_FOR]
+    if not columns or unknown:
+        raise ValueError(f"Invalid import key {spec!r}; choose from {', '.join(HEADER_FOR)}")
+    return columns
+
+def validate_chunk(raw: pd.DataFrame, normalized: pd.DataFrame, first_row: int,
+                   key_columns: Optional[List[str]] = None):
+    """Split a normalized chunk into insertable rows, per-row errors and warnings.
+
+    Blank rows are dropped silently. A row is rejected if a required value is
+    missing, if an order number is present but cannot be parsed, if the
+    status is not in the status dictionary, or if it has none of the
+    ``key_columns``. A date that cannot be parsed (``N/A``, ``TBD``) is
+    imported as no date and reported as a warning.
+    Returns ``(valid rows, errors, warnings, rejected count, non-blank row count)``.
+    """
+    raw = _map_columns(raw)
+    present = pd.DataFrame({column: _present(raw[column]) for column in raw.columns}, index=raw.index)
+    non_blank = present.any(axis=1) if len(present.columns) else pd.Series(False, index=raw.index)
+    row_numbers = pd.Series(range(first_row, first_row + len(raw)), index=raw.index)
+
+    # (column, failing rows, message, whether the row is rejected)
+    checks = [(column, normalized[column].isna(), f"{HEADER_FOR[column]} is required", True) for column in REQUIRED_COLUMNS]
+    if "application_date" in raw:
+        checks.append(("application_date", present["application_date"] & normalized["application_date"].isna(),
+                       "Unrecognized date (expected MM/DD/YYYY or YYYY-MM-DD), imported without a date", False))
+    if "order_number" in raw:
+        checks.append(("order_number", present["order_number"] & normalized["order_number"].isna(), "Not a number", True))
+    checks.append(("status", normalized["status"].notna() & normalized["status_id"].isna(), "Unknown status", True))
+    if key_columns:
+        key_headers = ", ".join(HEADER_FOR[column] for column in key_columns)
+        checks.append((key_columns[0], normalized[key_columns].isna().all(axis=1), f"Missing import key ({key_headers})", True))
+
+    errors, warnings = [], []
+    rejected = pd.Series(False, index=raw.index)
+    for column, failed, message, rejects in checks:
+        failed = failed & non_blank
+        if rejects:
+            rejected |= failed
+        for index in failed[failed].index:
+            value = raw.at[index, column] if column in raw else None
+            (errors if rejects else warnings).append(RowError(int(row_numbers[index]), HEADER_FOR[column],
+                                                              None if pd.isna(value) else str(value), message))
+    for report in (errors, warnings):
+        report.sort(key=lambda error: (error.row, _HEADER_ORDER[error.column]))
+    return (normalized[non_blank & ~rejected], errors, warnings,
+            int((non_blank & rejected).sum()), int(non_blank.sum()))
+
+def with_company_ids(conn, df: pd.DataFrame) -> pd.DataFrame:
+    """Add ``company_id``, creating missing companies (Core inserts skip the ORM events)."""
+    ids = companies.resolve_ids(conn, df["company"].dropna().unique().tolist())
+    company_ids = df["company"].map(ids).astype("object")
+    return df.assign(company_id=company_ids.where(company_ids.notna(), None))
+
+def _signature_rows(ids, records):
+    return [(application_id, record["company"], record["role"], record.get("url")) for application_id, record in zip(ids, records)]
+
+def insert_chunk(df: pd.DataFrame) -> int:
+    if df.empty:
+        return 0
+    with engine.begin() as conn:
+        records = with_company_ids(conn, df).to_dict("records")
+        for record in records:
+            record["funnel_stage"] = history.stage_for(record["status"])
+        ids = conn.execute(insert(Application).returning(Application.id, sort_by_parameter_order=True), records).scalars().all()
+        duplicates.index_rows(conn, _signature_rows(ids, records))
+        history.record_changes(conn, [(application_id, None, record["status"], 0) for application_id, record in zip(ids, records)])
+    return len(records)
+
+def row_keys(df: pd.DataFrame, key_columns: List[str]) -> pd.Series:
+    """Natural key per row: the key columns, trimmed and case-folded, joined with a separator."""
+    parts = [df[column].astype("string").fillna("").str.strip().str.casefold() for column in key_columns]
+    key = parts[0]
+    for part in parts[1:]:
+        key = key + "\x1f" + part
+    return ",".join(key_columns) + ":" + key
+
+def row_fingerprints(df: pd.DataFrame) -> pd.Series:
+    hashes = pd.util.hash_pandas_object(df[list(HEADER_FOR)].astype("string"), index=False)
+    return hashes.map("{:016x}".format)
+
+def _upsert_statement():
+    stmt = sqlite_insert(Application)
+    updates = {column: stmt.excluded[column]
+               for column in [*HEADER_FOR, *DERIVED_COLUMNS, "company_id", "funnel_stage", "import_fingerprint"]}
+    # on_conflict_do_update does not apply Column.onupdate, so set updated_at here
+    updates["updated_at"] = datetime.utcnow()
+    return stmt.on_conflict_do_update(index_elements=[Application.import_key], set_=updates)
+
+def upsert_chunk(df: pd.DataFrame, key_columns: List[str]):
+    """Insert new rows and update changed ones; returns (inserted, updated, unchanged)."""
+    if df.empty:
+        return 0, 0, 0
+    df = df.assign(import_key=row_keys(df, key_columns), import_fingerprint=row_fingerprints(df))
+    df = df.drop_duplicates("import_key", keep="last")
+    with engine.begin() as conn:
+        existing = {
+            row.import_key: row for row in conn.execute(
+                select(Application.import_key, Application.import_fingerprint, Application.status, Application.funnel_stage)
+                .where(Application.import_key.in_(df["import_key"].tolist()))
+            )
+        }
+        known = df["import_key"].map(lambda key: existing[key].import_fingerprint if key in existing else None)
+        new = known.isna()
+        changed = df[new | (known != df["import_fingerprint"])]
+        if not changed.empty:
+            records = with_company_ids(conn, changed).to_dict("records")
+            previous = [existing.get(record["import_key"]) for record in records]
+            for record, old in zip(records, previous):
+                old_stage = (old.funnel_stage or 0) if old else 0
+                record["funnel_stage"] = max(old_stage, history.stage_for(record["status"]))
+            ids = conn.execute(
+                _upsert_statement().returning(Application.id, sort_by_parameter_order=True), records
+            ).scalars().all()
+            duplicates.index_rows(conn, _signature_rows(ids, records))
+            history.record_changes(conn, [
+                (application_id, old.status if old else None, record["status"], (old.funnel_stage or 0) if old else 0)
+                for application_id, record, old in zip(ids, records, previous)
+            ])
+    inserted = int(new.sum())
+    return inserted, len(changed) - inserted, len(df) - len(changed)
+
+def find_possible_duplicates(df: pd.DataFrame, row_numbers: pd.Series,
+                             key_columns: Optional[List[str]] = None) -> List[PossibleDuplicate]:
+    """Rows resembling an already stored application (other than the one their import key updates)."""
+    if df.empty:
+        return []
+    url = df["url"] if "url" in df else pd.Series(None, index=df.index)
+    with engine.connect() as conn:
+        exclude = [None] * len(df)
+        if key_columns:
+            keys = row_keys(df, key_columns)
+            existing = dict(conn.execute(
+                select(Application.import_key, Application.id).where(Application.import_key.in_(keys.tolist()))
+            ).all())
+            exclude = [existing.get(key) for key in keys]
+        matches = duplicates.find_duplicates_many(conn, list(zip(df["company"], df["role"], url)), exclude, limit=1)
+    return [
+        PossibleDuplicate(int(row_numbers[index]), found[0].id, found[0].score)
+        for index, found in zip(df.index, matches) if found
+    ]
+
+def upload_spreadsheet(
+    file_path: str,
+    sheet_name: str = "Sheet1",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    on_progress: Optional[Callable[[ImportResult], None]] = None,
+    max_errors: Optional[int] = None,
+    key: Optional[str] = None,
+) -> ImportResult:
+    """Import every valid row; ``on_progress`` is called after each committed chunk.
+
+    ``key`` switches to incremental mode (see the module docstring).
+    """
+    key_columns = parse_key(key)
+    result = ImportResult(total=estimate_rows(file_path, sheet_name))
+    first_row = 2
+    for raw in iter_chunks(file_path, sheet_name, chunk_size):
+        valid, errors, warnings, rejected, parsed = validate_chunk(raw, normalize_chunk(raw), first_row, key_columns)
+        row_numbers = pd.Series(range(first_row, first_row + len(raw)), index=raw.index)
+        first_row += len(raw)
+        possible_duplicates = find_possible_duplicates(valid, row_numbers, key_columns)
+        if key_columns:
+            inserted, updated, unchanged = upsert_chunk(valid, key_columns)
+            result.inserted += inserted
+            result.updated += updated
+            result.unchanged += unchanged
+        else:
+            result.inserted += insert_chunk(valid)
+        # Core writes bypass the ORM events that keep the caches current
+        generations.bump(generations.APPLICATIONS)
+        result.parsed += parsed
+        result.rejected += rejected
+        room = None if max_errors is None else max(max_errors - len(result.errors), 0)
+        result.errors.extend(errors[:room])
+        room = None if max_errors is None else max(max_errors - len(result.warnings), 0)
+        result.warnings.extend(warnings[:room])
+        room = None if max_errors is None else max(max_errors - len(result.duplicates), 0)
+        result.duplicates.extend(possible_duplicates[:room])
+        if on_progress is not None:
+            on_progress(result)
+    logger.info("Imported %s: %d inserted, %d updated, %d unchanged, %d rejected",
+                file_path, result.inserted, result.updated, result.unchanged, result.rejected)
+    return result
+
+@jobs.handler("import_spreadsheet")
+def import_spreadsheet_job(payload: dict, progress: jobs.JobProgress) -> dict:
+    """Run an import queued by ``POST /imports`` and delete the staged file afterwards."""
+    path = payload["path"]
+
+    def report(result: ImportResult, force: bool = False):
+        message = f"{result.inserted} inserted, {result.updated} updated, {result.rejected} rejected"
+        progress.update(result.parsed, result.total, message, result=asdict(result), force=force)
+
     try:
-        return datetime.strptime(str(date_str), "%m/%d/%Y").date()
-    except ValueError:
-        try:
-            return datetime.strptime(str(date_str), "%Y-%m-%d").date()
-        except ValueError:
-            return None
-
-def upload_spreadsheet(file_path: str, sheet_name: str = "Sheet1"):
-    df = pd.read_excel(file_path, sheet_name=sheet_name)
-    applications = []
-    for _, row in df.iterrows():
-        app = Application(
-            order_number=row.get('Order number'),
-            company=row.get('Company'),
-            role=row.get('Role'),
-            url=row.get('URL'),
-            status=row.get('Status'),
-            application_date=normalize_date(row.get('Application Date')),
-            met_with=row.get('Met with'),
-            notes=row.get('Notes'),
-            resume_file=row.get('Resume Link'),
-            cover_letter_file=row.get('Cover Letter Link'),
-            follow_up_required=bool(row.get('Follow Up Required', False)),
-            pros=row.get('Pros'),
-            cons=row.get('Cons'),
-            salary=row.get('Salary'),
-        )
-        applications.append(app)
-    with SessionLocal() as session:
-        session: Session
-        session.add_all(applications)
-        session.commit()
-    print(f"Successfully uploaded {len(applications)} applications.")
+        result = upload_spreadsheet(path, payload.get("sheet_name", "Sheet1"), on_progress=report,
+                                    max_errors=config.IMPORT_MAX_ERRORS, key=payload.get("key"))
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+    report(result, force=True)
+    return asdict(result)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Import job applications from a spreadsheet.")
+    parser.add_argument("file_path", nargs="?", default="datasample/JobApplicationTracker2025.xlsx")
+    parser.add_argument("--sheet", default="Sheet1")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--key", default=config.IMPORT_KEY,
+                        help="natural key columns for an incremental import, e.g. order_number or company,role,url")
+    args = parser.parse_args(argv)
+    migrations.upgrade(engine)
+    result = upload_spreadsheet(args.file_path, args.sheet, args.chunk_size, key=args.key)
+    for error in result.errors:
+        print(f"Row {error.row}, {error.column}: {error.message} ({error.value!r})")
+    for warning in result.warnings:
+        print(f"Row {warning.row}, {warning.column}: warning: {warning.message} ({warning.value!r})")
+    for duplicate in result.duplicates:
+        print(f"Row {duplicate.row}: possible duplicate of application {duplicate.application_id} "
+              f"(similarity {duplicate.score:.2f})")
+    print(f"Successfully uploaded {result.inserted} applications ({result.updated} updated, "
+          f"{result.unchanged} unchanged, {result.rejected} rows rejected).")
 
 if __name__ == "__main__":
-    file_path = "datasample/JobApplicationTracker2025.xlsx"
-    upload_spreadsheet(file_path)
+    main()
@@ -0,0 +1,152 @@
+"""Shared pipeline for resume and cover letter uploads.
+
+Every upload endpoint goes through ``save_upload`` (async routes) or
+``store_upload`` (sync code). The file is copied in chunks to a temporary file
+inside the upload folder, off the event loop. The copy enforces the size limit
+as it streams, checks the extension and the content signature of the first
+chunk, and hashes the content. A rejected upload never leaves a partial file
+behind.
+
+Files are content-addressed: the blob is stored as ``<sha256>.<ext>``. If that
+blob already exists, the temp file is dropped, so uploading the same resume
+again only costs a metadata write (see app/documents.py). A stored blob is
+never modified, its mtime included; each upload instead stamps the blob's
+``documents`` row with ``last_uploaded_at``, which the orphan collector
+(app/upload_gc.py) honours until an application links the blob.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import BinaryIO, Optional, Set
+
+from fastapi import HTTPException, UploadFile
+from sqlalchemy.dialects.sqlite import insert
+from starlette.concurrency import run_in_threadpool
+
+from app import config, models
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_EXTENSIONS = {"pdf", "doc", "docx", "rtf", "txt"}
+SPREADSHEET_EXTENSIONS = {"xlsx", "csv"}
+
+# Leading bytes expected for each allowed extension, with the MIME type they imply
+_SIGNATURES = {
+    "pdf": ((b"%PDF-",), "application/pdf"),
+    "doc": ((b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",), "application/msword"),
+    "docx": ((b"PK\x03\x04",), "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    "rtf": ((b"{\\rtf",), "application/rtf"),
+    "xlsx": ((b"PK\x03\x04",), "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+_TEXT_MIME_TYPES = {"txt": "text/plain", "csv": "text/csv"}
+
+os.makedirs(config.UPLOAD_FOLDER, exist_ok=True)
+
+@dataclass
+class StoredUpload:
+    stored_name: str
+    original_filename: str
+    sha256: str
+    size: int
+    mime_type: str
+
+def max_upload_bytes(limit_mb: float = None) -> int:
+    return int((config.MAX_UPLOAD_SIZE_MB if limit_mb is None else limit_mb) * 1024 * 1024)
+
+def file_extension(filename: str) -> str:
+    return filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+
+def sniff_mime_type(extension: str, head: bytes) -> Optional[str]:
+    """Return the MIME type if ``head`` matches what ``extension`` promises, else None."""
+    if extension in _TEXT_MIME_TYPES:
+        if b"\x00" in head:
+            return None
+        try:
+            # A multi-byte character may be cut at the chunk boundary
+            head.decode("utf-8")
+        except UnicodeDecodeError as e:
+            if e.start < len(head) - 3:
+                return None
+        return _TEXT_MIME_TYPES[extension]
+    prefixes, mime_type = _SIGNATURES[extension]
+    return mime_type if head.startswith(prefixes) else None
+
+def _note_upload(upload: StoredUpload):
+    """Create the blob's documents row if needed and stamp it as just uploaded."""
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(
+            insert(models.Document)
+            .values(sha256=upload.sha256, stored_name=upload.stored_name, size=upload.size,
+                    mime_type=upload.mime_type, ref_count=0, last_uploaded_at=now)
+            .on_conflict_do_update(index_elements=["sha256"], set_={"last_uploaded_at": now})
+        )
+
+def _reject(status_code: int, detail: str):
+    logger.warning("Rejected upload: %s", detail)
+    raise HTTPException(status_code=status_code, detail=detail)
+
+def store_upload(source: BinaryIO, filename: str, folder: str = None,
+                 allowed_extensions: Set[str] = None, limit_mb: float = None,
+                 content_addressed: bool = True) -> StoredUpload:
+    """Stream ``source`` into ``folder`` under its content hash. Blocking.
+
+    With ``content_addressed=False`` every call gets its own file (used for
+    staged imports, which are deleted once processed).
+    """
+    folder = folder or config.UPLOAD_FOLDER
+    original_name = os.path.basename(filename or "")
+    extension = file_extension(original_name)
+    if extension not in (allowed_extensions or ALLOWED_EXTENSIONS):
+        _reject(400, f"Invalid file type: {original_name}")
+
+    limit = max_upload_bytes(limit_mb)
+    digest = hashlib.sha256()
+    mime_type = None
+    fd, temp_path = tempfile.mkstemp(dir=folder, prefix=".upload-", suffix=".part")
+    try:
+        size = 0
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = source.read(config.UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                if size == 0:
+                    mime_type = sniff_mime_type(extension, chunk)
+                    if mime_type is None:
+                        _reject(400, f"File content does not match its extension: {original_name}")
+                size += len(chunk)
+                if size > limit:
+                    _reject(413, f"File too large: {original_name} (limit {limit / 1024 / 1024:g}MB)")
+                digest.update(chunk)
+                out.write(chunk)
+        if size == 0:
+            _reject(400, f"Empty file: {original_name}")
+
+        sha256 = digest.hexdigest()
+        stored_name = f"{sha256 if content_addressed else uuid.uuid4().hex}.{extension}"
+        final_path = os.path.join(folder, stored_name)
+        if os.path.exists(final_path):
+            # Same content already stored: keep the existing blob untouched
+            os.remove(temp_path)
+            logger.info("Upload %s deduplicated to %s", original_name, stored_name)
+        else:
+            os.replace(temp_path, final_path)
+            logger.info("Stored upload %s as %s (%d bytes)", original_name, stored_name, size)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    stored = StoredUpload(stored_name, original_name, sha256, size, mime_type)
+    if content_addressed:
+        _note_upload(stored)
+    return stored
+
+async def save_upload(upload: UploadFile, folder: str = None, **kwargs) -> StoredUpload:
+    """Async wrapper around ``store_upload`` that runs the copy in the threadpool."""
+    return await run_in_threadpool(store_upload, upload.file, upload.filename, folder, **kwargs)
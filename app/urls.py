@@ -0,0 +1,43 @@
+"""Canonical form of job posting URLs.
+
+Two links to the same posting often differ only in scheme, a ``www.``
+prefix, a trailing slash, a fragment or tracking parameters
+(``utm_source``, ``gclid``, LinkedIn's ``trk`` ...). ``canonicalize_url``
+removes those differences so the links compare equal. A link that does not
+parse (a non-numeric port, an unbalanced ``[`` ...) is kept as typed, trimmed.
+"""
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+TRACKING_PARAMS = {
+    "gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "ref", "refid", "ref_src",
+    "trk", "trkinfo", "trackingid", "lipi", "gh_src", "_hsenc", "_hsmi",
+}
+_DEFAULT_PORTS = {"80", "443"}
+
+def _is_tracking(name: str) -> bool:
+    name = name.lower()
+    return name.startswith("utm_") or name in TRACKING_PARAMS
+
+def canonicalize_url(url: Optional[str]) -> Optional[str]:
+    """``"HTTP://www.Example.com/jobs/1/?utm_source=x#apply"`` -> ``"https://example.com/jobs/1"``."""
+    if not url or not url.strip():
+        return None
+    original = url.strip()
+    url = original if "://" in original else "https://" + original
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return original
+    host = (parts.hostname or "").lower()
+    if not host:
+        return None
+    if host.startswith("www."):
+        host = host[4:]
+    if port and str(port) not in _DEFAULT_PORTS:
+        host = f"{host}:{port}"
+    path = parts.path.rstrip("/")
+    query = urlencode(sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                             if not _is_tracking(name)))
+    return urlunsplit(("https", host, path, query, ""))
@@ -0,0 +1,86 @@
+import json
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import models, schemas, views
+from app.database import get_db
+
+router = APIRouter(prefix="/views", tags=["views"])
+
+def _view_out(view: models.SavedView) -> schemas.SavedView:
+    definition = views.ViewDefinition.of(view)
+    return schemas.SavedView(
+        id=view.id,
+        name=view.name,
+        filters=definition.filters,
+        filter_model=definition.filter_model,
+        sort_model=definition.sort_model,
+        created_at=view.created_at,
+        updated_at=view.updated_at,
+    )
+
+def _get_view(db: Session, view_id: int) -> models.SavedView:
+    view = db.get(models.SavedView, view_id)
+    if view is None:
+        raise HTTPException(status_code=404, detail="View not found")
+    return view
+
+def _save(db: Session, view: models.SavedView, data: schemas.SavedViewCreate) -> schemas.SavedView:
+    filters = {name: value for name, value in data.filters.items() if value is not None}
+    try:
+        views.validate(filters, data.filter_model, data.sort_model)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    view.name = data.name
+    view.filters = json.dumps(filters)
+    view.filter_model = json.dumps(data.filter_model)
+    view.sort_model = json.dumps(data.sort_model)
+    db.add(view)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"A view named {data.name!r} already exists")
+    db.refresh(view)
+    views.invalidate(view.id)
+    return _view_out(view)
+
+@router.get("/", response_model=List[schemas.SavedView])
+def list_views(db: Session = Depends(get_db)):
+    return [_view_out(view) for view in db.query(models.SavedView).order_by(models.SavedView.name)]
+
+@router.post("/", response_model=schemas.SavedView, status_code=201)
+def create_view(data: schemas.SavedViewCreate, db: Session = Depends(get_db)):
+    """Save a filter/sort definition under a name."""
+    return _save(db, models.SavedView(), data)
+
+@router.get("/{view_id}", response_model=schemas.SavedView)
+def read_view(view_id: int, db: Session = Depends(get_db)):
+    return _view_out(_get_view(db, view_id))
+
+@router.put("/{view_id}", response_model=schemas.SavedView)
+def update_view(view_id: int, data: schemas.SavedViewCreate, db: Session = Depends(get_db)):
+    return _save(db, _get_view(db, view_id), data)
+
+@router.delete("/{view_id}", status_code=204)
+def delete_view(view_id: int, db: Session = Depends(get_db)):
+    db.delete(_get_view(db, view_id))
+    db.commit()
+    views.invalidate(view_id)
+
+@router.get("/{view_id}/applications", response_model=schemas.GridPage)
+def view_applications(
+    view_id: int,
+    page: int = Query(0, ge=0),
+    page_size: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    """One page of the view's applications, served from its cached id list."""
+    result = views.page(db, view_id, page * page_size, page_size)
+    if result is None:
+        raise HTTPException(status_code=404, detail="View not found")
+    rows, total = result
+    return schemas.GridPage(rows=rows, total=total)
@@ -0,0 +1,163 @@
+"""Saved views and their cached result lists.
+
+A saved view is a stored set of GET /applications/ filters plus a DataGrid
+filter and sort model (see app/grid.py). The first time a view is opened
+its matching application ids are read in order, together with their sort
+values, and kept in memory. Opening it again slices the requested page out
+of that list and fetches just those rows by primary key.
+
+Writes do not recompute anything. ORM writes record the ids they touched;
+when a view with touched ids is next opened, only those rows are checked
+against the view (one query restricted to them) and moved, inserted or
+dropped. Bulk writes, which have no rows to follow, bump the applications
+generation (see app/generations.py); ``invalidate`` is subscribed to it, and
+the list is rebuilt on the next open.
+"""
+import json
+import threading
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from functools import total_ordering
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app import crud, generations, grid
+from app.models import Application, SavedView
+
+# GET /applications/ filters a view may store; document_search is left out, since
+# extracted document text changes without an application write
+VIEW_FILTERS = {"search", "status", "company_id", "url", "follow_up_required", "missing_date", "salary_min", "salary_max"}
+_TOUCHED_KEY = "views_touched"
+
+@dataclass(frozen=True)
+class ViewDefinition:
+    filters: Dict[str, Any]
+    filter_model: Dict[str, Any]
+    sort_model: List[Dict[str, Any]]
+
+    @classmethod
+    def of(cls, view: SavedView) -> "ViewDefinition":
+        return cls(json.loads(view.filters or "{}"), json.loads(view.filter_model or "{}"), json.loads(view.sort_model or "[]"))
+
+def validate(filters: Dict[str, Any], filter_model: Dict[str, Any], sort_model: List[Dict[str, Any]]):
+    """Raise ValueError unless the definition compiles."""
+    unknown = set(filters) - VIEW_FILTERS
+    if unknown:
+        raise ValueError(f"Unknown view filters: {', '.join(sorted(unknown))}")
+    grid.filter_condition(filter_model)
+    grid.sort_columns(sort_model)
+
+def view_query(db: Session, definition: ViewDefinition):
+    """The view's applications, filtered and in view order."""
+    query = crud.filtered_applications_query(db, sort_by=None, **definition.filters)
+    return grid.apply(query, definition.filter_model, definition.sort_model)
+
+@total_ordering
+class _Descending:
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return self.value > other.value
+
+@dataclass
+class CachedView:
+    definition: ViewDefinition
+    keys: List[Tuple] = field(default_factory=list)  # sort keys in view order, each ending with the id
+    key_by_id: Dict[int, Tuple] = field(default_factory=dict)
+    touched: Set[int] = field(default_factory=set)
+
+    def page_ids(self, offset: int, limit: int) -> List[int]:
+        return [key[-1] for key in self.keys[offset:offset + limit]]
+
+def _sort_key(row, descending: List[bool]) -> Tuple:
+    # Mirrors grid.sort_clauses: NULLs last in either direction, then id ascending
+    parts = []
+    for value, desc in zip(row[1:], descending):
+        parts.append((1, 0) if value is None else (0, _Descending(value) if desc else value))
+    return (*parts, row[0])
+
+def _rows(db: Session, definition: ViewDefinition, only_ids: Optional[Set[int]] = None):
+    columns = grid.sort_columns(definition.sort_model)
+    query = view_query(db, definition).with_entities(Application.id, *[column for column, _ in columns])
+    if only_ids is not None:
+        query = query.filter(Application.id.in_(only_ids)).order_by(None)
+    descending = [desc for _, desc in columns]
+    return [_sort_key(row, descending) for row in query]
+
+_lock = threading.Lock()
+_cache: Dict[int, CachedView] = {}
+
+def cached_view(db: Session, view_id: int) -> Optional[CachedView]:
+    """The view's up-to-date result list, or None if there is no such view."""
+    with _lock:
+        cached = _cache.get(view_id)
+        if cached is None:
+            view = db.get(SavedView, view_id)
+            if view is None:
+                return None
+            cached = CachedView(ViewDefinition.of(view))
+            cached.keys = _rows(db, cached.definition)
+            cached.key_by_id = {key[-1]: key for key in cached.keys}
+            _cache[view_id] = cached
+        elif cached.touched:
+            touched, cached.touched = cached.touched, set()
+            for application_id in touched:
+                old = cached.key_by_id.pop(application_id, None)
+                if old is not None:
+                    del cached.keys[bisect_left(cached.keys, old)]
+            for key in _rows(db, cached.definition, only_ids=touched):
+                insort(cached.keys, key)
+                cached.key_by_id[key[-1]] = key
+        return cached
+
+def page(db: Session, view_id: int, offset: int, limit: int) -> Optional[Tuple[List[Application], int]]:
+    """One page of a view's applications and the view's total, or None if there is no such view."""
+    cached = cached_view(db, view_id)
+    if cached is None:
+        return None
+    with _lock:
+        ids = cached.page_ids(offset, limit)
+        total = len(cached.keys)
+    by_id = {application.id: application for application in db.query(Application).filter(Application.id.in_(ids))} if ids else {}
+    return [by_id[application_id] for application_id in ids if application_id in by_id], total
+
+def invalidate(view_id: Optional[int] = None):
+    """Forget one view's result list, or every view's."""
+    with _lock:
+        if view_id is None:
+            _cache.clear()
+        else:
+            _cache.pop(view_id, None)
+
+generations.subscribe(generations.APPLICATIONS, invalidate)
+
+def _touch(ids: Set[int]):
+    with _lock:
+        for cached in _cache.values():
+            cached.touched |= ids
+
+@event.listens_for(Application, "after_insert")
+@event.listens_for(Application, "after_update")
+@event.listens_for(Application, "after_delete")
+def _record_write(mapper, connection, target):
+    session = inspect(target).session
+    if session is not None:
+        session.info.setdefault(_TOUCHED_KEY, set()).add(target.id)
+
+@event.listens_for(Session, "after_commit")
+def _apply_writes(session):
+    ids = session.info.pop(_TOUCHED_KEY, None)
+    if ids:
+        _touch(ids)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_writes(session):
+    session.info.pop(_TOUCHED_KEY, None)
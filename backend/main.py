@@ -5,9 +5,9 @@ from backend.database import SessionLocal
 from backend.models import JobApplication, DemoApplication, DemoStatusHistory
 from backend.generate_demo_data import generate_demo_data, clear_demo_data
 from app.schemas import ApplicationCreate, ApplicationUpdate, Application
+from app import uploads
 from datetime import datetime
 import os
-from uuid import uuid4
 import pandas as pd
 
 app = FastAPI()
@@ -15,22 +15,9 @@ app = FastAPI()
 UPLOAD_FOLDER = "uploads"
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-ALLOWED_EXTENSIONS = {"pdf", "doc", "docx", "rtf", "txt"}
-MAX_FILE_SIZE_MB = 5
-
-# Helper to save uploaded files
+# Helper to save uploaded files (size, extension and content checks live in app.uploads)
 def save_upload_file(upload_file: UploadFile, folder: str) -> str:
-    ext = upload_file.filename.split(".")[-1].lower()
-    if ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(status_code=400, detail=f"Invalid file type: {upload_file.filename}")
-    contents = upload_file.file.read()
-    if len(contents) > MAX_FILE_SIZE_MB * 1024 * 1024:
-        raise HTTPException(status_code=400, detail=f"File too large: {upload_file.filename}")
-    filename = f"{uuid4().hex}_{upload_file.filename}"
-    file_path = os.path.join(folder, filename)
-    with open(file_path, "wb") as f:
-        f.write(contents)
-    return filename
+    return uploads.store_upload(upload_file.file, upload_file.filename, folder).stored_name
 
 def get_db():
     db = SessionLocal()
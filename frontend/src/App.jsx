@@ -328,6 +328,7 @@ function App() {
                 application={viewedApplication}
                 onEdit={handleModalEdit}
                 onDelete={() => handleModalDelete(viewedApplication)}
+                isDemoMode={demoMode}
               />
             </>
           )}
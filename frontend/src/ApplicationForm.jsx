@@ -1,20 +1,10 @@
 import React, { useState } from 'react';
 import { TextField, Button, MenuItem, Box, Checkbox, FormControlLabel } from '@mui/material';
-
-const statuses = [
-  'Not Yet Applied',
-  'Applied',
-  'Interviewing',
-  'Offer',
-  'Rejected',
-  'No Longer Listed',
-  'Decided not to apply',
-  'Declined Offer',
-  'Accepted',
-  'Applied / No Longer Listed',
-];
+import useStatuses from './useStatuses';
+import useSuggestions from './useSuggestions';
 
 const ApplicationForm = ({ onSubmit, initialData }) => {
+  const statuses = useStatuses();
   const [form, setForm] = useState(initialData || {
     company: '',
     role: '',
@@ -31,6 +21,8 @@ const ApplicationForm = ({ onSubmit, initialData }) => {
     salary: '',
     // order_number, created_at, updated_at, id are system fields and should NOT be included
   });
+  const companySuggestions = useSuggestions('company', form.company);
+  const roleSuggestions = useSuggestions('role', form.role);
   const [resumeFile, setResumeFile] = useState(null);
   const [coverLetterFile, setCoverLetterFile] = useState(null);
 
@@ -100,8 +92,14 @@ const ApplicationForm = ({ onSubmit, initialData }) => {
     }} encType="multipart/form-data">
       <h2 style={{ marginTop: 0, marginBottom: 24, textAlign: 'center' }}>Add New Application</h2>
       <Box sx={{ display: 'flex', gap: 2, mb: 2 }}>
-        <TextField label="Company" name="company" value={form.company} onChange={handleChange} required fullWidth />
-        <TextField label="Role" name="role" value={form.role} onChange={handleChange} required fullWidth />
+        <TextField label="Company" name="company" value={form.company} onChange={handleChange} required fullWidth slotProps={{ htmlInput: { list: 'company-suggestions', autoComplete: 'off' } }} />
+        <datalist id="company-suggestions">
+          {companySuggestions.map((value) => <option key={value} value={value} />)}
+        </datalist>
+        <TextField label="Role" name="role" value={form.role} onChange={handleChange} required fullWidth slotProps={{ htmlInput: { list: 'role-suggestions', autoComplete: 'off' } }} />
+        <datalist id="role-suggestions">
+          {roleSuggestions.map((value) => <option key={value} value={value} />)}
+        </datalist>
       </Box>
       <Box sx={{ display: 'flex', gap: 2, mb: 2 }}>
         <TextField label="Job Posting URL" name="url" value={form.url} onChange={handleChange} fullWidth />
@@ -12,6 +12,8 @@ import FileDownloadIcon from '@mui/icons-material/FileDownload';
 import VisibilityIcon from '@mui/icons-material/Visibility';
 import AccessTimeIcon from '@mui/icons-material/AccessTime';
 import { format } from 'date-fns';
+import { fetchStatusHistory, uploadUrl } from './api';
+import useStatuses from './useStatuses';
 
 const statusColors = {
   'Not Yet Applied': 'default',
@@ -26,28 +28,16 @@ const statusColors = {
   'Applied / No Longer Listed': 'default',
 };
 
-const statuses = [
-  'Not Yet Applied',
-  'Applied',
-  'Interviewing',
-  'Offer',
-  'Rejected',
-  'No Longer Listed',
-  'Decided not to apply',
-  'Declined Offer',
-  'Accepted',
-  'Applied / No Longer Listed',
-];
-
 const FileLink = ({ file, label }) => {
   if (!file) return <Typography color="text.secondary">No {label} uploaded</Typography>;
   
-  // Handle both full URLs and local file paths
-  const fileUrl = file.startsWith('http') ? file : `http://localhost:8000/${file}`;
+  // Handle both full URLs and stored upload names
+  const fileUrl = uploadUrl(file);
+  const downloadUrl = uploadUrl(file, { download: true });
   
   return (
     <Box sx={{ display: 'flex', alignItems: 'center', gap: 1 }}>
-      <Link href={fileUrl} target="_blank" rel="noopener noreferrer">
+      <Link href={downloadUrl} target="_blank" rel="noopener noreferrer">
         <IconButton size="small" color="primary">
           <FileDownloadIcon />
         </IconButton>
@@ -75,7 +65,8 @@ const FileLink = ({ file, label }) => {
   );
 };
 
-export default function ApplicationViewModal({ open, onClose, application, onEdit, onDelete }) {
+export default function ApplicationViewModal({ open, onClose, application, onEdit, onDelete, isDemoMode = false }) {
+  const statuses = useStatuses();
   const [deleteConfirm, setDeleteConfirm] = useState(false);
   const [isDeleting, setIsDeleting] = useState(false);
   const [isEditMode, setIsEditMode] = useState(false);
@@ -95,6 +86,20 @@ export default function ApplicationViewModal({ open, onClose, application, onEdi
   const [isSaving, setIsSaving] = useState(false);
   const [resumeFile, setResumeFile] = useState(null);
   const [coverLetterFile, setCoverLetterFile] = useState(null);
+  const [statusHistory, setStatusHistory] = useState([]);
+
+  // Demo applications have no recorded history
+  React.useEffect(() => {
+    if (!open || !application?.id || isDemoMode) {
+      setStatusHistory([]);
+      return;
+    }
+    let cancelled = false;
+    fetchStatusHistory(application.id)
+      .then((entries) => { if (!cancelled) setStatusHistory(entries); })
+      .catch(() => { if (!cancelled) setStatusHistory([]); });
+    return () => { cancelled = true; };
+  }, [open, application?.id, application?.status, isDemoMode]);
 
   // Initialize or update editedData when application changes
   React.useEffect(() => {
@@ -693,15 +698,35 @@ export default function ApplicationViewModal({ open, onClose, application, onEdi
             </Paper>
           </Box>
 
-          {/* History Section - Placeholder for future implementation */}
+          {/* History Section */}
           <Box sx={{ width: '100%' }}>
             <Paper elevation={0} sx={{ p: 2, backgroundColor: 'background.default' }}>
               <Typography variant="subtitle1" sx={{ mb: 1, fontWeight: 'bold' }}>
                 History
               </Typography>
-              <Typography color="text.secondary" variant="body2">
-                History tracking will be implemented in a future update
-              </Typography>
+              {statusHistory.length === 0 ? (
+                <Typography color="text.secondary" variant="body2">
+                  No status changes recorded
+                </Typography>
+              ) : (
+                <Box sx={{ display: 'flex', flexDirection: 'column', gap: 1 }}>
+                  {statusHistory.map((entry) => (
+                    <Box key={entry.id} sx={{ display: 'flex', alignItems: 'center', gap: 1 }}>
+                      <AccessTimeIcon color="action" fontSize="small" />
+                      <Typography variant="body2" color="text.secondary" sx={{ minWidth: 140 }}>
+                        {format(new Date(entry.timestamp), 'MMM d, yyyy HH:mm')}
+                      </Typography>
+                      {entry.from_status && (
+                        <>
+                          <Chip label={entry.from_status} color={statusColors[entry.from_status] || 'default'} size="small" variant="outlined" />
+                          <Typography variant="body2">→</Typography>
+                        </>
+                      )}
+                      <Chip label={entry.status} color={statusColors[entry.status] || 'default'} size="small" />
+                    </Box>
+                  ))}
+                </Box>
+              )}
             </Paper>
           </Box>
         </Box>
@@ -2,11 +2,64 @@ import axios from 'axios';
 
 const API_BASE = 'http://localhost:8005';
 
+// URL for an uploaded resume/cover letter. Stored names are content-addressed and served
+// with immutable caching and range support, so previews reuse the browser cache.
+export const uploadUrl = (file, { download = false } = {}) => {
+  if (file.startsWith('http')) return file;
+  const name = file.split('/').pop();  // older rows stored "uploads/<name>"
+  return `${API_BASE}/uploads/${encodeURIComponent(name)}${download ? '?download=true' : ''}`;
+};
+
+// Server-side export of every application matching the list filters (streamed, so it
+// covers the whole table rather than the rows loaded in the grid).
+export const exportUrl = (format = 'csv', filters = {}) => {
+  const params = new URLSearchParams(
+    Object.entries(filters).filter(([, value]) => value !== undefined && value !== null && value !== '')
+  );
+  const query = params.toString();
+  return `${API_BASE}/applications/export.${format}${query ? `?${query}` : ''}`;
+};
+
 export const fetchApplications = async () => {
   const res = await axios.get(`${API_BASE}/applications/`);
   return res.data;
 };
 
+// One page for a server-side DataGrid: { rows, total } (GET /applications/grid)
+export const fetchGridPage = async ({ filterModel, sortModel, page = 0, pageSize = 100 } = {}) => {
+  const res = await axios.get(`${API_BASE}/applications/grid`, {
+    params: {
+      filter_model: JSON.stringify(filterModel || { items: [] }),
+      sort_model: JSON.stringify(sortModel || []),
+      page,
+      page_size: pageSize,
+    },
+  });
+  return res.data;
+};
+
+// Total and counts by status / follow-up / missing date for the list filters (GET /applications/facets)
+export const fetchFacets = async (filters = {}) => {
+  const res = await axios.get(`${API_BASE}/applications/facets`, { params: filters });
+  return res.data;
+};
+
+export const fetchStatusHistory = async (appId) => {
+  const res = await axios.get(`${API_BASE}/applications/${appId}/history`);
+  return res.data;
+};
+
+export const fetchFunnel = async () => {
+  const res = await axios.get(`${API_BASE}/analytics/funnel`);
+  return res.data;
+};
+
+export const fetchResponseTimes = async (isDemoMode = false) => {
+  const endpoint = isDemoMode ? `${API_BASE}/demo/analytics/response-times` : `${API_BASE}/analytics/response-times`;
+  const res = await axios.get(endpoint);
+  return res.data;
+};
+
 export const createApplication = async (data, isDemoMode = false) => {
   try {
     // If data is FormData, set the correct headers for file upload
@@ -112,6 +165,16 @@ export const fetchDemoApplications = async () => {
   }
 };
 
+export const fetchStatuses = async () => {
+  const res = await axios.get(`${API_BASE}/statuses`);
+  return res.data;
+};
+
+export const fetchSuggestions = async (field, prefix, limit = 10) => {
+  const res = await axios.get(`${API_BASE}/autocomplete`, { params: { field, prefix, limit } });
+  return res.data;
+};
+
 export const fetchVisualizations = async (isDemoMode = false) => {
   const endpoint = isDemoMode 
     ? `${API_BASE}/demo/visualizations/` 
@@ -1,14 +1,24 @@
 import React from 'react';
-import { Typography, Box } from '@mui/material';
+import { Typography, Box, Button, Stack } from '@mui/material';
+import DownloadIcon from '@mui/icons-material/Download';
+import { exportUrl } from '../api';
 
 const ExportCSV = () => (
   <Box p={3}>
     <Typography variant="h5" gutterBottom>
       Export Applications as CSV
     </Typography>
-    <Typography>
-      (CSV export functionality coming soon)
+    <Typography gutterBottom>
+      Downloads every application in the tracker. The file uses the same columns as the spreadsheet import.
     </Typography>
+    <Stack direction="row" spacing={2}>
+      <Button variant="contained" startIcon={<DownloadIcon />} href={exportUrl('csv')}>
+        Download CSV
+      </Button>
+      <Button variant="outlined" startIcon={<DownloadIcon />} href={exportUrl('xlsx')}>
+        Download Excel
+      </Button>
+    </Stack>
   </Box>
 );
 
@@ -0,0 +1,37 @@
+import { useEffect, useState } from 'react';
+import { fetchStatuses } from './api';
+
+// Used until GET /statuses answers (and if it fails)
+const FALLBACK_STATUSES = [
+  'Not Yet Applied',
+  'Applied',
+  'Interviewing',
+  'Offer',
+  'Accepted',
+  'Declined Offer',
+  'Rejected',
+  'No Longer Listed',
+  'Applied / No Longer Listed',
+  'Decided not to apply',
+];
+
+let statusesPromise = null;  // one request per page load, shared by every component
+
+// Status names from the server-side status dictionary, in display order.
+const useStatuses = () => {
+  const [statuses, setStatuses] = useState(FALLBACK_STATUSES);
+  useEffect(() => {
+    let active = true;
+    statusesPromise = statusesPromise || fetchStatuses().catch(() => {
+      statusesPromise = null;
+      return null;
+    });
+    statusesPromise.then((entries) => {
+      if (active && entries) setStatuses(entries.map((entry) => entry.name));
+    });
+    return () => { active = false; };
+  }, []);
+  return statuses;
+};
+
+export default useStatuses;
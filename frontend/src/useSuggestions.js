@@ -0,0 +1,21 @@
+import { useEffect, useState } from 'react';
+import { fetchSuggestions } from './api';
+
+// Existing values of `field` starting with `prefix` (GET /autocomplete), most used first.
+const useSuggestions = (field, prefix) => {
+  const [suggestions, setSuggestions] = useState([]);
+  useEffect(() => {
+    if (!prefix) {
+      setSuggestions([]);
+      return undefined;
+    }
+    let active = true;
+    fetchSuggestions(field, prefix)
+      .then((entries) => { if (active) setSuggestions(entries.map((entry) => entry.value)); })
+      .catch(() => { if (active) setSuggestions([]); });
+    return () => { active = false; };
+  }, [field, prefix]);
+  return suggestions;
+};
+
+export default useSuggestions;